@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+# Micro-benchmark of the emission of graders and templates.
+# A specification with thousands of I/O lines and calls is generated, then
+# the graders of all languages are emitted both with Emitter and by
+# appending to a string, as the language classes used to do.
+#
+# Usage: python3 benchmarks/emitter_benchmark.py [number_of_arrays] [repetitions]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gradergen.languages.C
+import gradergen.languages.pascal
+import gradergen.languages.python
+import gradergen.languages.java
+from gradergen.SpecParser import SpecParser
+from gradergen.grader_generator import parse_task_spec, get_language_class, CLASSES_LIST
+from gradergen.languages.emitter import Emitter
+
+LANGUAGE_MODULES = [
+    gradergen.languages.C,
+    gradergen.languages.pascal,
+    gradergen.languages.python,
+    gradergen.languages.java,
+]
+
+# The code is kept in a single string, extended at every write.
+class StringEmitter(object):
+    def __init__(self):
+        self.code = ""
+
+    def write(self, code):
+        self.code += code
+
+    def write_line(self, line = "", tabulation = 0):
+        self.code += "\t"*tabulation + line + "\n"
+
+    def getvalue(self):
+        return self.code
+
+def generate_spec(N):
+    lines = ["***variables***", "int N"]
+    lines += ["int A{0}[N][N]".format(i) for i in range(N)]
+    lines += ["int R{0}".format(i) for i in range(N)]
+    lines.append("***prototypes***")
+    lines += ["int f{0}(int N, int &A{0}[][])".format(i) for i in range(N)]
+    lines.append("***input***")
+    lines.append("N")
+    lines += ["A{0}[][]".format(i) for i in range(N)]
+    lines.append("***calls***")
+    lines += ["R{0} = f{0}(N, A{0})".format(i) for i in range(N)]
+    lines.append("***output***")
+    lines += ["A{0}[][]".format(i) for i in range(N)]
+    lines += ["R{0}".format(i) for i in range(N)]
+    return lines
+
+def measure(data_manager, lang, emitter_class, repetitions):
+    # Every module defining language classes imports Emitter by itself.
+    for module in LANGUAGE_MODULES:
+        module.Emitter = emitter_class
+    LangClass, fast_io = get_language_class(lang)
+    best = float("inf")
+    for _ in range(repetitions):
+        data = {
+            **data_manager.get_data(),
+            "task_name": "benchmark", "input_file": "", "output_file": "",
+            "fast_io_runtime": "unlocked", "real_precision": 6,
+            "array_allocation": "rows", "profile": False, "base_dir": "",
+        }
+        language = LangClass(fast_io, data)
+        start = time.perf_counter()
+        language.write_grader()
+        language.write_template()
+        size = len(language.grader.getvalue()) + len(language.template.getvalue())
+        best = min(best, time.perf_counter() - start)
+    return best, size
+
+def main():
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    data_manager = parse_task_spec(generate_spec(N), False, SpecParser())
+    print("{0} arrays, {0} calls, best of {1} runs".format(N, repetitions))
+    for lang in sorted(CLASSES_LIST):
+        legacy, size = measure(data_manager, lang, StringEmitter, repetitions)
+        current, size = measure(data_manager, lang, Emitter, repetitions)
+        print("    {0:<12} {1:>6} KB  string: {2:.3f}s  Emitter: {3:.3f}s ({4:.2f}x)"
+                  .format(lang, size // 1024, legacy, current, legacy / current))
+
+if __name__ == "__main__":
+    main()
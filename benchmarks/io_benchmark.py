@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+
+# Throughput of the input and output phases of the graders.
+# For each case (a type, the dimension of the arrays, more arrays on the same
+# line, ...) a task with an input file of about the given size is built, then
+# the graders of all languages are generated, compiled with their templates
+# (which do nothing) and run on it.
+# The binary graders read the same input, converted to binary.
+# The input phase is timed running a grader whose output section is empty,
+# the output phase as the difference with a grader writing back everything it
+# has read.
+# The languages whose compiler is not installed are skipped. The results are
+# printed as a table and, if --json is given, saved in a JSON file.
+# With --baseline the graders are also generated by another git revision of
+# gradergen (e.g. HEAD~1) and run on the same inputs, to compare the runtimes.
+#
+# Usage: python3 benchmarks/io_benchmark.py [--size MB] [--repetitions R]
+#            [--lang LANG ...] [--case CASE ...] [--fast_io_runtime RUNTIME]
+#            [--baseline REVISION] [--json results.json] [--work-dir DIR]
+
+import argparse
+import io
+import json
+import math
+import os
+import random
+import shutil
+import string
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from gradergen.SpecParser import SpecParser
+from gradergen.binary_input import text_to_binary
+from gradergen.grader_generator import parse_task_spec, LANGUAGES_LIST, BINARY_LANGUAGES_LIST, EXTENSIONS_LIST, FAST_IO_RUNTIMES
+
+TASK_NAME = "nome_sorgente_contestant"
+TASK_YAML = "name: {0}\ninfile: input.txt\noutfile: output.txt\n".format(TASK_NAME)
+
+COMPILERS = {
+    "c": "gcc",
+    "cpp": "g++",
+    "pas": "fpc",
+    "py": "python3",
+    "java": "javac",
+}
+
+# Functions generating count random values of each type, as written in the
+# input file, and the average length of a value (separator included).
+TYPES = ["int", "longint", "char", "real"]
+LENGTHS = {"int": 11.5, "longint": 20, "char": 2, "real": 15}
+
+def random_values(rng, type, count):
+    if type == "int":
+        return [str(rng.randint(-10**9, 10**9)) for i in range(count)]
+    if type == "longint":
+        return [str(rng.randint(-10**18, 10**18)) for i in range(count)]
+    if type == "char":
+        return rng.choices(string.ascii_letters, k = count)
+    return ["{0:.6f}".format(rng.uniform(-10**6, 10**6)) for i in range(count)]
+
+# Each case returns the lines of the variables section, the lines of the
+# input (and output) section and the content of the input file. The size is
+# the approximate size of the input file, in bytes.
+
+def single_type_case(type):
+    def case(rng, size):
+        N = max(1, int(size / LENGTHS[type]))
+        variables = ["int N", "{0} A[N]".format(type)]
+        content = "{0}\n{1}\n".format(N, " ".join(random_values(rng, type, N)))
+        return variables, ["N"], ["A[]"], content
+    return case
+
+def scalars_case(rng, size):
+    # The values are all read at the beginning, so they cannot be many.
+    count = 250
+    variables, lines, content = [], [], ""
+    for type in TYPES:
+        names = ["{0}{1}".format(type[0], i) for i in range(count)]
+        variables += ["{0} {1}".format(type, name) for name in names]
+        lines.append(" ".join(names))
+        content += " ".join(random_values(rng, type, count)) + "\n"
+    return variables, [], lines, content
+
+def multidimensional_case(dim):
+    def case(rng, size):
+        N = max(1, int((size / LENGTHS["int"]) ** (1.0 / dim)))
+        variables = ["int N", "int A" + "[N]" * dim]
+        rows = [" ".join(random_values(rng, "int", N)) for i in range(N ** (dim - 1))]
+        content = "{0}\n{1}\n".format(N, "\n".join(rows))
+        return variables, ["N"], ["A" + "[]" * dim], content
+    return case
+
+def multiple_arrays_case(rng, size):
+    N = max(1, int(size / sum(LENGTHS.values())))
+    names = ["A_" + type for type in TYPES]
+    variables = ["int N"] + ["{0} {1}[N]".format(type, name) for type, name in zip(TYPES, names)]
+    columns = [random_values(rng, type, N) for type in TYPES]
+    content = "{0}\n{1}\n".format(N, "\n".join(" ".join(row) for row in zip(*columns)))
+    return variables, ["N"], [" ".join(name + "[]" for name in names)], content
+
+def string_case(rng, size):
+    N = max(1, int(math.sqrt(size)))
+    variables = ["int N", "char S[N][N]"]
+    rows = ["".join(rng.choices(string.ascii_letters, k = N)) for i in range(N)]
+    content = "{0}\n{1}\n".format(N, "\n".join(rows))
+    return variables, ["N"], ["S[][] {string}"], content
+
+CASES = {
+    "int": single_type_case("int"),
+    "longint": single_type_case("longint"),
+    "char": single_type_case("char"),
+    "real": single_type_case("real"),
+    "scalars": scalars_case,
+    "int_2D": multidimensional_case(2),
+    "int_3D": multidimensional_case(3),
+    "multiple_arrays": multiple_arrays_case,
+    "char_string": string_case,
+}
+
+def write_file(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+
+def generate_spec(variables, sizes, arrays, write_output):
+    lines = ["***variables***"] + variables
+    lines += ["***prototypes***", "***input***"] + sizes + arrays
+    lines += ["***calls***", "***output***"]
+    if write_output:
+        lines += arrays
+    return "\n".join(lines) + "\n"
+
+# Extracts the given git revision of the repository in directory, returns
+# the languages it supports.
+def extract_revision(revision, directory):
+    archive = subprocess.run(["git", "archive", "--format=tar", revision], cwd = ROOT,
+                             check = True, stdout = subprocess.PIPE).stdout
+    with tarfile.open(fileobj = io.BytesIO(archive)) as tar:
+        tar.extractall(directory)
+    languages = subprocess.run(
+        [sys.executable, "-c", "import gradergen.grader_generator as g; "
+         "print(*g.LANGUAGES_LIST + getattr(g, 'BINARY_LANGUAGES_LIST', []))"],
+        cwd = directory, env = dict(os.environ, PYTHONPATH = directory),
+        check = True, stdout = subprocess.PIPE, universal_newlines = True).stdout
+    return languages.split()
+
+# Generates the graders of the given languages in directory with the gradergen
+# found in root, compiles them and returns the dictionary language: command
+# running the grader.
+def build_graders(directory, languages, args, root = ROOT):
+    if not languages:
+        return {}
+    command = [sys.executable, "-c", "from gradergen.grader_generator import main; main()"]
+    for lang in languages:
+        extension = EXTENSIONS_LIST[lang]
+        command += ["--lang", lang, "grader_{0}.{1}".format(lang, extension),
+                    "template_{0}.{1}".format(lang, extension)]
+    command += ["--fast_io_runtime", args.fast_io_runtime]
+    environment = dict(os.environ, PYTHONPATH = root)
+    subprocess.run(command, cwd = directory, env = environment, check = True,
+                   stdout = subprocess.DEVNULL)
+
+    executables = {}
+    for lang in languages:
+        extension = EXTENSIONS_LIST[lang]
+        grader = "grader_{0}.{1}".format(lang, extension)
+        template = "template_{0}.{1}".format(lang, extension)
+        executable = os.path.join(directory, lang)
+        if extension == "py":
+            # The grader imports the template as the module named as the task.
+            shutil.copy(os.path.join(directory, template),
+                        os.path.join(directory, TASK_NAME + ".py"))
+            executables[lang] = [sys.executable, grader]
+            continue
+        if extension == "java":
+            # The class of every grader is named grader, so each one is
+            # compiled with the template in a folder of its own.
+            shutil.copy(os.path.join(directory, template),
+                        os.path.join(directory, TASK_NAME + ".java"))
+            classes = os.path.join(directory, lang + "_classes")
+            subprocess.run(["javac", "-d", classes, grader, TASK_NAME + ".java"],
+                           cwd = directory, check = True,
+                           stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+            executables[lang] = ["java", "-cp", classes, "grader"]
+            continue
+        if extension == "pas":
+            # The grader uses the unit named as the task.
+            shutil.copy(os.path.join(directory, template),
+                        os.path.join(directory, TASK_NAME + ".pas"))
+            compile_command = ["fpc", "-O2", "-dEVAL", grader, "-o" + lang]
+        else:
+            compile_command = [COMPILERS[extension], "-O2", "-DEVAL", grader,
+                               template, "-o", lang]
+        subprocess.run(compile_command, cwd = directory, check = True,
+                       stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+        executables[lang] = [executable]
+    return executables
+
+# The minimum time over the repetitions.
+def measure(command, directory, repetitions):
+    best = float("inf")
+    for i in range(repetitions):
+        start = time.perf_counter()
+        subprocess.run(command, cwd = directory, check = True,
+                       stdin = subprocess.DEVNULL, stdout = subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def throughput(size, seconds):
+    return round(size / 2**20 / seconds, 2) if seconds > 0 else None
+
+# The graders reading the binary input are built in a folder of their own,
+# where the input file is converted to binary.
+def language_directory(directory, lang):
+    return os.path.join(directory, "binary") if lang in BINARY_LANGUAGES_LIST else directory
+
+def prepare_directory(directory, spec, content):
+    os.makedirs(directory)
+    write_file(os.path.join(directory, "task.yaml"), TASK_YAML)
+    write_file(os.path.join(directory, "task.spec"), spec)
+    write_file(os.path.join(directory, "input.txt"), content)
+
+def prepare_binary_directory(directory, spec, content):
+    prepare_directory(directory, spec, "")
+    data = parse_task_spec(spec.splitlines(), {}, SpecParser()).get_data()
+    with open(os.path.join(directory, "input.txt"), "wb") as binary_stream:
+        text_to_binary(data, io.StringIO(content), binary_stream)
+
+# The version is None for the current one, otherwise the revision whose
+# gradergen (extracted in root) generates the graders.
+def run_case(case_name, languages, work_dir, args, version = None, root = ROOT):
+    rng = random.Random(case_name)
+    variables, sizes, arrays, content = CASES[case_name](rng, args.size * 2**20)
+    if version is not None:
+        work_dir = os.path.join(work_dir, "baseline")
+
+    times = {}
+    for variant in ["input", "output"]:
+        directory = os.path.join(work_dir, case_name, variant)
+        spec = generate_spec(variables, sizes, arrays, variant == "output")
+        prepare_directory(directory, spec, content)
+        text_languages = [lang for lang in languages if lang not in BINARY_LANGUAGES_LIST]
+        binary_languages = [lang for lang in languages if lang in BINARY_LANGUAGES_LIST]
+        executables = build_graders(directory, text_languages, args, root)
+        if binary_languages:
+            prepare_binary_directory(language_directory(directory, binary_languages[0]), spec, content)
+            executables.update(build_graders(language_directory(directory, binary_languages[0]), binary_languages, args, root))
+        times[variant] = {
+            lang: measure(executables[lang], language_directory(directory, lang), args.repetitions)
+            for lang in languages
+        }
+
+    results = []
+    for lang in languages:
+        directory = language_directory(os.path.join(work_dir, case_name, "output"), lang)
+        input_size = os.path.getsize(os.path.join(directory, "input.txt"))
+        output_size = os.path.getsize(os.path.join(directory, "output.txt"))
+        # The output is written from the same data, so the output phase
+        # takes (at least in theory) the difference of the times.
+        output_seconds = max(0.0, times["output"][lang] - times["input"][lang])
+        results.append({
+            "case": case_name,
+            "language": lang,
+            "version": version,
+            "input_bytes": input_size,
+            "output_bytes": output_size,
+            "input_seconds": round(times["input"][lang], 6),
+            "output_seconds": round(output_seconds, 6),
+            "input_MBps": throughput(input_size, times["input"][lang]),
+            "output_MBps": throughput(output_size, output_seconds),
+        })
+    return results
+
+def print_results(results):
+    print("{0:<16} {1:<20} {2:>10} {3:>12} {4:>11} {5:>13}".format(
+        "case", "language", "input MB", "input MB/s", "output MB", "output MB/s"))
+    for result in results:
+        language = result["language"]
+        if result["version"] is not None:
+            language += "@" + result["version"]
+        print("{0:<16} {1:<20} {2:>10.2f} {3:>12} {4:>11.2f} {5:>13}".format(
+            result["case"], language,
+            result["input_bytes"] / 2**20, str(result["input_MBps"]),
+            result["output_bytes"] / 2**20, str(result["output_MBps"])))
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = "Benchmark of the input and output throughput of the graders.")
+    parser.add_argument("--size", type = float, default = 10,
+                        help = "approximate size of the input files, in MB")
+    parser.add_argument("--repetitions", type = int, default = 3,
+                        help = "number of runs of each grader, the fastest one is kept")
+    parser.add_argument("--lang", nargs = "+", choices = LANGUAGES_LIST + BINARY_LANGUAGES_LIST,
+                        default = LANGUAGES_LIST + BINARY_LANGUAGES_LIST, dest = "languages")
+    parser.add_argument("--case", nargs = "+", choices = sorted(CASES),
+                        default = list(CASES), dest = "cases")
+    parser.add_argument("--fast_io_runtime", choices = FAST_IO_RUNTIMES,
+                        default = "unlocked")
+    parser.add_argument("--baseline", metavar = "revision",
+                        help = "git revision whose graders are benchmarked too, "
+                               "to compare them with the current ones")
+    parser.add_argument("--json", help = "file where the results are saved")
+    parser.add_argument("--work-dir",
+                        help = "directory where the tasks are built (kept at the end)")
+    args = parser.parse_args()
+
+    languages = [lang for lang in args.languages
+                 if shutil.which(COMPILERS[EXTENSIONS_LIST[lang]]) is not None]
+    skipped = [lang for lang in args.languages if lang not in languages]
+    for lang in skipped:
+        print("Skipping {0}: {1} not found.".format(lang, COMPILERS[EXTENSIONS_LIST[lang]]),
+              file = sys.stderr)
+
+    work_dir = args.work_dir if args.work_dir is not None else tempfile.mkdtemp(prefix = "gradergen_io_")
+    try:
+        results = []
+        baseline_languages = []
+        if args.baseline is not None:
+            baseline_root = os.path.join(work_dir, "baseline_gradergen")
+            baseline_languages = [lang for lang in languages
+                                  if lang in extract_revision(args.baseline, baseline_root)]
+        for case_name in args.cases:
+            if languages:
+                results += run_case(case_name, languages, work_dir, args)
+            if baseline_languages:
+                results += run_case(case_name, baseline_languages, work_dir, args,
+                                    args.baseline, baseline_root)
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir)
+
+    print_results(results)
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump({
+                "size_MB": args.size,
+                "repetitions": args.repetitions,
+                "fast_io_runtime": args.fast_io_runtime,
+                "baseline": args.baseline,
+                "skipped_languages": skipped,
+                "results": results,
+            }, f, indent = 4)
+
+if __name__ == "__main__":
+    main()
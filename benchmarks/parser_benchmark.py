@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+# Micro-benchmark of the parsing of task.spec.
+# Large specifications are generated and parsed with SpecParser, with
+# RegexParser and with the first version of RegexParser (every rule matched
+# twice with re.match on the uncompiled pattern string, then matched again by
+# MatchTree). The first specification has many short lines, the second one a
+# few prototypes and calls with many parameters.
+#
+# Usage: python3 benchmarks/parser_benchmark.py [number_of_variables] [repetitions]
+
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from gradergen.RegexParser import RegexParser
+from gradergen.SpecParser import SpecParser
+from gradergen.grader_generator import parse_task_spec
+
+# RegexParser as it was before the grammar was precompiled.
+class LegacyRegexParser(RegexParser):
+    def FullMatch(self, regex_name, string):
+        return re.match(getattr(self, regex_name) + "$", string)
+
+    # The line was first checked with FullMatch by parse_task_spec and then
+    # matched again here.
+    def MatchTree(self, regex_name, string, checked = False):
+        if not checked and not self.FullMatch(regex_name, string):
+            return None
+        match = self.FullMatch(regex_name, string)
+        if not match:
+            return None
+
+        match_tree = {}
+        for group_name in match.groupdict():
+            if match.group(group_name) is None:
+                continue
+            if group_name.startswith("REPEATED"):
+                regex_name, separator, clean_group_name = self.ParseRepeatedGroupName(group_name)
+                rep_groups = []
+                string = match.group(group_name)
+                for sub_string in re.split(separator, string):
+                    sub_tree = self.MatchTree(regex_name, sub_string.strip(), True)
+                    if sub_tree:
+                        rep_groups.append(sub_tree)
+                match_tree[clean_group_name] = rep_groups
+            else:
+                match_tree[group_name] = match.group(group_name).strip()
+
+        if not match_tree:
+            return string
+        else:
+            return match_tree
+
+def generate_spec(N):
+    lines = ["***variables***"]
+    for i in range(N):
+        lines.append("int N{0}".format(i))
+        lines.append("longint A{0}[N{0}][2*N{0}+1]".format(i))
+    lines.append("***prototypes***")
+    for i in range(N):
+        lines.append("longint f{0}(int N{0}, longint &A{0}[][])".format(i))
+    lines.append("***input***")
+    for i in range(N):
+        lines.append("N{0}".format(i))
+        lines.append("A{0}[][]".format(i))
+    lines.append("***calls***")
+    for i in range(N):
+        lines.append("R{0} = f{0}(N{0}, A{0})".format(i))
+    lines.append("***output***")
+    for i in range(N):
+        lines.append("A{0}[][]".format(i))
+    # The return values have to be declared as variables.
+    lines[1:1] = ["longint R{0}".format(i) for i in range(N)]
+    return [line + "\n" for line in lines]
+
+# N functions with N parameters each.
+def generate_long_spec(N):
+    lines = ["***variables***"]
+    lines += ["int N{0}".format(i) for i in range(N)]
+    lines += ["longint A{0}[N0][N0]".format(i) for i in range(N)]
+    lines += ["longint R{0}".format(i) for i in range(N)]
+    params = ", ".join("int N{0}, longint &A{0}[][]".format(i) for i in range(N // 2))
+    args = ", ".join("N{0}, A{0}".format(i) for i in range(N // 2))
+    lines.append("***prototypes***")
+    lines += ["longint f{0}({1})".format(i, params) for i in range(N)]
+    lines.append("***input***")
+    lines.append(" ".join("N{0}".format(i) for i in range(N)))
+    lines.append(" ".join("A{0}[][]".format(i) for i in range(N // 2)))
+    lines.append("***calls***")
+    lines += ["R{0} = f{0}({1})".format(i, args) for i in range(N)]
+    lines.append("***output***")
+    lines.append(" ".join("R{0}".format(i) for i in range(N)))
+    return [line + "\n" for line in lines]
+
+# Only the syntax is checked, as done by the parsers.
+def parse_syntax(lines, parser):
+    section_lines = parser.split_sections(lines)
+    for section in section_lines:
+        for line_number, line in section_lines[section]:
+            parser.parse_line(section, line_number, line)
+
+# The objects of structures.py are built too.
+def parse_all(lines, parser):
+    parse_task_spec(lines, False, parser)
+
+def measure(function, parser, lines, repetitions):
+    best = float("inf")
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        function(lines, parser)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def compare(description, lines, repetitions):
+    print("{0}: {1} lines, {2} characters, best of {3} runs (syntax only / whole parsing)"
+              .format(description, len(lines), sum(map(len, lines)), repetitions))
+    parsers = [
+        ("first RegexParser", LegacyRegexParser()),
+        ("RegexParser", RegexParser()),
+        ("SpecParser", SpecParser()),
+    ]
+    for name, parser in parsers:
+        syntax = measure(parse_syntax, parser, lines, repetitions)
+        whole = measure(parse_all, parser, lines, repetitions)
+        if name == parsers[0][0]:
+            legacy_syntax, legacy_whole = syntax, whole
+        print("    {0:<18} {1:.3f}s ({2:.2f}x)  /  {3:.3f}s ({4:.2f}x)"
+                  .format(name, syntax, legacy_syntax / syntax, whole, legacy_whole / whole))
+
+def main():
+    N = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    compare("Short lines", generate_spec(N), repetitions)
+    compare("Long lines", generate_long_spec(N // 10), repetitions)
+
+if __name__ == "__main__":
+    main()
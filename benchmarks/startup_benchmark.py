@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+# Benchmark of the startup of the gradergen command line tool, as it is often
+# called many times from scripts.
+# Each command is run in a new process: showing the help, generating a single
+# language of a small task and finding that the task is already up to date.
+# With --compare the same commands are run also with another copy of
+# gradergen (for example a checkout of an older commit).
+#
+# Usage: python3 benchmarks/startup_benchmark.py [--runs R] [--compare path]
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+TASK_DIR = os.path.join(ROOT, "testing", "general1_test")
+
+GRADERGEN = [sys.executable, "-c", "from gradergen.grader_generator import main; main()"]
+
+COMMANDS = [
+    ("help", ["--help"]),
+    ("generate C", ["--force", "--lang", "C"]),
+    ("generate fast_pascal", ["--force", "--lang", "fast_pascal"]),
+    ("up to date", ["--lang", "C"]),
+]
+
+# The minimum and the average time over the runs.
+def measure(arguments, path, task_dir, runs):
+    environment = dict(os.environ, PYTHONPATH = path)
+    times = []
+    for i in range(runs):
+        start = time.perf_counter()
+        subprocess.run(GRADERGEN + arguments, cwd = task_dir, env = environment,
+                       check = True, stdout = subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return min(times), sum(times) / len(times)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = "Benchmark of the startup time of gradergen.")
+    parser.add_argument("--runs", type = int, default = 20,
+                        help = "number of runs of each command")
+    parser.add_argument("--compare", metavar = "path",
+                        help = "folder containing another copy of the gradergen package")
+    args = parser.parse_args()
+
+    paths = [("current", ROOT)]
+    if args.compare is not None:
+        paths.append(("compared", os.path.abspath(args.compare)))
+
+    task_dir = tempfile.mkdtemp(prefix = "gradergen_startup_")
+    try:
+        for file_name in ["task.spec", "task.yaml"]:
+            shutil.copy(os.path.join(TASK_DIR, file_name), task_dir)
+        for name, arguments in COMMANDS:
+            print(name)
+            for path_name, path in paths:
+                best, average = measure(arguments, path, task_dir, args.runs)
+                print("    {0:<10} min: {1:.3f}s  avg: {2:.3f}s".format(path_name, best, average))
+    finally:
+        shutil.rmtree(task_dir)
+
+if __name__ == "__main__":
+    main()
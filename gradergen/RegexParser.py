@@ -9,179 +9,273 @@ from gradergen.structures import PrimitiveType, Location
 class RegexParser:
     # Join the argument in a regex accepting an arbitrary number of spaces
     # between each piece.
-    def JoinRegex(self, *args):
-        res = self.maybe_spaces
+    @classmethod
+    def JoinRegex(cls, *args):
+        res = cls.maybe_spaces
         for arg in args:
-            res += arg + self.maybe_spaces
+            res += arg + cls.maybe_spaces
         return res
         
     # Creates a group with the given name containing the regex.
-    def GroupName(self, regex, name):
+    @classmethod
+    def GroupName(cls, regex, name):
         return "(?P<{0}>{1})".format(name, regex)
     
     # Remove all names from groups in the regex.
     # It is used internally to avoid name collision and to make MatchTree work 
     # properly.
-    def RemoveNames(self, regex):
-        return re.sub("\?P<" + self.name + ">", "", regex)
+    @classmethod
+    def RemoveNames(cls, regex):
+        return re.sub("\?P<" + cls.name + ">", "", regex)
     
     # Creates a regex that matches repetition of 'regex' separated by the
     # given separator. There must be at least an occurence of 'regex'.
-    def RepeatedSeparatedNonEmptyNoName(self, regex, separator):
-        return self.RemoveNames(self.JoinRegex("(" + self.JoinRegex(regex, separator) + ")*", regex))
+    @classmethod
+    def RepeatedSeparatedNonEmptyNoName(cls, regex, separator):
+        return cls.RemoveNames(cls.JoinRegex("(" + cls.JoinRegex(regex, separator) + ")*", regex))
     
     # Generate a standard name, used by MatchTree, for repeated groups.
     # It encodes in the name both the regex_name and the separator.
     # Given that group names have to be proper python identifiers, the separator
     # is transformed before being included in the group name.
-    def GenerateRepeatedGroupName(self, regex_name, separator, group_name = None):
+    @classmethod
+    def GenerateRepeatedGroupName(cls, regex_name, separator, group_name = None):
         encoded_separator = "_".join([str(ord(char)) for char in separator])
-        return "REPEATED" + self.repeated_divider.join([regex_name, encoded_separator, group_name])
+        return "REPEATED" + cls.repeated_divider.join([regex_name, encoded_separator, group_name])
     
     # Decode and parse information (regex and separator) from a group name
     # generated by GenerateRepeatedGroupName.
-    def ParseRepeatedGroupName(self, group_name):
-        regex_name, encoded_separator, group_name = group_name[8:].split(self.repeated_divider)
+    @classmethod
+    def ParseRepeatedGroupName(cls, group_name):
+        regex_name, encoded_separator, group_name = group_name[8:].split(cls.repeated_divider)
         separator = ''.join([chr(int(code)) for code in encoded_separator.split("_")])
         return regex_name, separator, group_name
     
     # Exactly as RepeatedSeparatedNonEmptyNoName but also gives a name to
     # the resulting regex using GenerateRepeatedGroupName.
-    def RepeatedSeparatedNonEmpty(self, regex_name, separator, group_name):
-        regex = getattr(self, regex_name)
-        return self.GroupName(
-            self.RepeatedSeparatedNonEmptyNoName(regex, separator), 
-            self.GenerateRepeatedGroupName(regex_name, separator, group_name)
+    @classmethod
+    def RepeatedSeparatedNonEmpty(cls, regex_name, separator, group_name):
+        regex = getattr(cls, regex_name)
+        return cls.GroupName(
+            cls.RepeatedSeparatedNonEmptyNoName(regex, separator), 
+            cls.GenerateRepeatedGroupName(regex_name, separator, group_name)
         )
     
     # As RepeatedSeparatedNonEmpty, but matching empty repetitions also.
-    def RepeatedSeparated(self, regex_name, separator, group_name):
-        regex = getattr(self, regex_name)
-        return self.GroupName(
-            "(" + self.maybe_spaces + "|" +
-            self.RepeatedSeparatedNonEmptyNoName(regex, separator)
+    @classmethod
+    def RepeatedSeparated(cls, regex_name, separator, group_name):
+        regex = getattr(cls, regex_name)
+        return cls.GroupName(
+            "(" + cls.maybe_spaces + "|" +
+            cls.RepeatedSeparatedNonEmptyNoName(regex, separator)
             +")",
-            self.GenerateRepeatedGroupName(regex_name, separator, group_name)
+            cls.GenerateRepeatedGroupName(regex_name, separator, group_name)
         )
     
     # Match the full string against the regex, differently from re.match that
     # matches any prefix of the string.
     def FullMatch(self, regex_name, string):
-        return re.match(getattr(self, regex_name)+"$", string)
+        return self.compiled[regex_name].match(string)
+    
+    # Decode the group name of a repeated group, once for each group name.
+    @classmethod
+    def ParseRepeatedGroup(cls, group_name):
+        if group_name not in cls.repeated_groups:
+            regex_name, separator, clean_group_name = cls.ParseRepeatedGroupName(group_name)
+            cls.repeated_groups[group_name] = (regex_name, re.compile(separator), clean_group_name)
+        return cls.repeated_groups[group_name]
     
     # Builds the matching tree (considering only named groups).
     # If needed calls itself recursively.
     # Repeated groups builded with RepeatedSeparated and RepeatedSeparatedNonEmpty
     # are handled ad-hoc. In the tree they corresponds to arrays of subtrees.
-    def MatchTree(self, regex_name, string):
-        match = self.FullMatch(regex_name, string)
-        if not match:
-            return None
+    # If the string has already been matched by FullMatch, the match can be
+    # passed so that the string is not matched again.
+    def MatchTree(self, regex_name, string, match = None):
+        if match is None:
+            match = self.FullMatch(regex_name, string)
+            if not match:
+                return None
         
         match_tree = {}
-        for group_name in match.groupdict():
+        for group_name, group in match.groupdict().items():
             # If the group is not matched. 
             # E.g. "ab(?P<group_name>c)?" matched against "ab".
-            if match.group(group_name) is None:
+            if group is None:
                 continue
             
             if group_name.startswith("REPEATED"):
-                regex_name, separator, clean_group_name = self.ParseRepeatedGroupName(group_name)
+                sub_regex_name, separator, clean_group_name = self.ParseRepeatedGroup(group_name)
                 
+                # Python regexes keep only the last repetition of a group,
+                # so the single repetitions have to be matched again.
                 rep_groups = []
-                string = match.group(group_name)
-                for sub_string in re.split(separator, string):
-                    sub_tree = self.MatchTree(regex_name, sub_string.strip())
+                string = group
+                for sub_string in separator.split(string):
+                    sub_tree = self.MatchTree(sub_regex_name, sub_string.strip())
                     if sub_tree:
                         rep_groups.append(sub_tree)
                 match_tree[clean_group_name] = rep_groups
             else:
-                match_tree[group_name] = match.group(group_name).strip()
+                match_tree[group_name] = group.strip()
         
         if not match_tree:
             return string
         else:
             return match_tree
     
-    def __init__(self):
+    # The rules that can match the lines of each section, in order.
+    section_rules = {
+        "variables": ["variable", "array"],
+        "prototypes": ["prototype"],
+        "input": ["IO_variables", "IO_arrays"],
+        "calls": ["call"],
+        "output": ["IO_variables", "IO_arrays"],
+    }
+    
+    # Parses a line of the given section, returns the name of the regex
+    # matching it and the match_tree.
+    def parse_line(self, section, line_number, line):
+        for rule in self.section_rules[section]:
+            match_tree = self.MatchTree(rule, line)
+            if match_tree is not None:
+                return rule, match_tree
+        raise SyntaxError("The line {1}, in the {0} section, could not be parsed: {2}"
+                              .format(section, line_number, line))
+    
+    # Splits the lines of task.spec in sections, returns a dictionary
+    # containing, for each section, the list of pairs (line_number, line).
+    def split_sections(self, lines):
+        sections = {"variables": [], "prototypes": [], "calls": [], "input": [], "output": []}
+        section_lines = {}
+        act_section = None
+        for line_number in range(len(lines)):
+            line = lines[line_number]
+            line = line.strip()
+            line = re.sub(" +", " ", line) # remove multiple spaces
+
+            if line.startswith("#") or len(line) == 0:
+                continue
+
+            is_section_title = False
+            for section in sections:
+                if line == "***" + section + "***":
+                    if sections[section]:
+                        raise SyntaxError("The specification file (task.spec) "
+                                          "contains twice the same section.")
+                    is_section_title = True
+                    sections[section] = True
+                    act_section = section
+                    section_lines[section] = []
+                    break
+
+            if not is_section_title:
+                if not act_section:
+                    raise SyntaxError("The specification file (task.spec) has to "
+                                      "start with a section header.")
+                section_lines[act_section].append((line_number, line))
+        return section_lines
+    
+    # The grammar is built and compiled only once, when the module is loaded,
+    # and it is shared by all the instances.
+    @classmethod
+    def BuildGrammar(cls):
         # String used to separate the name from the separator in the
         # method GenerateRepeatedGroupName.
-        self.repeated_divider = "_GRADERGEN_IS_COOL_"
+        cls.repeated_divider = "_GRADERGEN_IS_COOL_"
         
         # This is the list of type specifiers (int, char,...).
-        self.type_specifiers = [enum_element.value for enum_element in PrimitiveType]
+        cls.type_specifiers = [enum_element.value for enum_element in PrimitiveType]
         
         # All regexes needed to correctly parse task.spec are here defined.
-        self.maybe_spaces = " *"
-        self.type_ = "(" + "|".join(self.type_specifiers) + ")"
-        self.type_non_void = "(" + "|".join(self.type_specifiers[1:]) + ")"
-        self.name = "([a-zA-Z_][a-zA-Z_0-9]*)"
-        self.array_no_sizes = self.GroupName(self.name, "name") + self.GroupName("(\[\])+", "dim")
-        
-        self.call = self.JoinRegex(
-            "(" + self.JoinRegex(self.GroupName(self.name, "return_var"), "=") + ")?", 
-            self.GroupName(self.name, "name"), 
-            "\(", self.RepeatedSeparated("name", ",", "params"), "\)"
-        )
+        cls.maybe_spaces = " *"
+        cls.type_ = "(" + "|".join(cls.type_specifiers) + ")"
+        cls.type_non_void = "(" + "|".join(cls.type_specifiers[1:]) + ")"
+        cls.name = "([a-zA-Z_][a-zA-Z_0-9]*)"
+        cls.array_no_sizes = cls.GroupName(cls.name, "name") + cls.GroupName("(\[\])+", "dim")
         
-        self.IO_variables = self.RepeatedSeparatedNonEmpty("name", " ", "variables")
+        cls.call = cls.JoinRegex(
+            "(" + cls.JoinRegex(cls.GroupName(cls.name, "return_var"), "=") + ")?", 
+            cls.GroupName(cls.name, "name"), 
+            "\(", cls.RepeatedSeparated("name", ",", "params"), "\)"
+        )
         
-        self.IO_arrays = self.RepeatedSeparatedNonEmpty("array_no_sizes", " ", "arrays")
+        cls.IO_variables = cls.RepeatedSeparatedNonEmpty("name", " ", "variables")
         
-        self.variable = self.JoinRegex(
-            self.GroupName(self.type_non_void, "type"), 
-            " ", 
-            self.GroupName(self.name, "name")
+        cls.IO_arrays = cls.JoinRegex(
+            cls.RepeatedSeparatedNonEmpty("array_no_sizes", " ", "arrays"),
+            "(\{" + cls.GroupName("string", "format") + "\})?"
         )
         
-        # begin working on self.expression
+        # begin working on cls.expression
         sign = "(\+|\-)"
-        signed_number = self.JoinRegex(sign, "[0-9]+")
-        number = self.JoinRegex("(" + sign + ")?", "[0-9]+")
+        signed_number = cls.JoinRegex(sign, "[0-9]+")
+        number = cls.JoinRegex("(" + sign + ")?", "[0-9]+")
+        
+        # Optional bounds of the values, [min..max]
+        bounds = "(" + cls.JoinRegex(
+            "\[", cls.GroupName(number, "min"), "\.\.", cls.GroupName(number, "max"), "\]"
+        ) + ")?"
+        
+        cls.variable = cls.JoinRegex(
+            cls.GroupName(cls.type_non_void, "type"), 
+            " ", 
+            cls.GroupName(cls.name, "name"),
+            bounds
+        )
         
         linear_expression_formats = [
-            self.JoinRegex(
-                "(" + self.JoinRegex(self.GroupName(number, "coef"), "\*") + ")?",
-                self.GroupName(self.name, "variable")
+            cls.JoinRegex(
+                "(" + cls.JoinRegex(cls.GroupName(number, "coef"), "\*") + ")?",
+                cls.GroupName(cls.name, "variable")
             )
         ]
         linear_expression = "(" + "|".join(linear_expression_formats)+ ")"
         
         expression_formats = [
-            self.GroupName(number, "const1"), # Group names must be different
-            self.JoinRegex(
+            cls.GroupName(number, "const1"), # Group names must be different
+            cls.JoinRegex(
                 linear_expression, 
-                self.GroupName(signed_number, "const2")+"?"
+                cls.GroupName(signed_number, "const2")+"?"
             )
         ]
-        self.expression = "(" + "|".join(expression_formats)+ ")"
-        # end working on self.expression
+        cls.expression = "(" + "|".join(expression_formats)+ ")"
+        # end working on cls.expression
         
-        self.array = self.JoinRegex(
-            self.GroupName(self.type_non_void, "type"), 
+        cls.array = cls.JoinRegex(
+            cls.GroupName(cls.type_non_void, "type"), 
             " ", 
-            self.GroupName(self.name, "name"), 
+            cls.GroupName(cls.name, "name"), 
             "\[",
-            self.RepeatedSeparatedNonEmpty("expression", self.JoinRegex("\]", "\["), "sizes"),
-            "\]"
+            cls.RepeatedSeparatedNonEmpty("expression", cls.JoinRegex("\]", "\["), "sizes"),
+            "\]",
+            bounds
         )
         
-        self.proto_param = self.JoinRegex(
-            self.GroupName(self.type_non_void, "type"), 
-            self.GroupName("( | &|& )", "by_ref"), 
-            self.GroupName(self.name, "name"), 
-            self.GroupName("(\[\])*", "dim"),
+        cls.proto_param = cls.JoinRegex(
+            cls.GroupName(cls.type_non_void, "type"), 
+            cls.GroupName("( | &|& )", "by_ref"), 
+            cls.GroupName(cls.name, "name"), 
+            cls.GroupName("(\[\])*", "dim"),
         )
         
-        self.prototype = self.JoinRegex(
-            self.GroupName(self.type_, "return_type"),
-            self.GroupName(self.name, "name"), 
-            "\(", self.RepeatedSeparated("proto_param", ",", "params"), "\)",
-            "(\{" + self.GroupName(
+        cls.prototype = cls.JoinRegex(
+            cls.GroupName(cls.type_, "return_type"),
+            cls.GroupName(cls.name, "name"), 
+            "\(", cls.RepeatedSeparated("proto_param", ",", "params"), "\)",
+            "(\{" + cls.GroupName(
                 "(" + Location.SOLUTION.value + "|" + Location.GRADER.value + ")", 
                 "location"
             ) + "\})?"
         )
+        
+        # Each rule is compiled with the final "$", as used by FullMatch.
+        cls.compiled = {}
+        for regex_name in ["type_", "type_non_void", "name", "array_no_sizes",
+                           "call", "IO_variables", "IO_arrays", "variable",
+                           "expression", "array", "proto_param", "prototype"]:
+            cls.compiled[regex_name] = re.compile(getattr(cls, regex_name) + "$")
+        cls.repeated_groups = {}
     
     # Testing for the regexes
     def test(self):
@@ -207,8 +301,8 @@ class RegexParser:
             },
             
             "variable": {
-                "valid": [],
-                "invalid": []
+                "valid": ["int N", "int N [1..200000]", "longint  X[-5 .. +5]"],
+                "invalid": ["int N [1..]", "int N [..5]", "int N [1.5]"]
             },
             
             "expression": {
@@ -217,10 +311,15 @@ class RegexParser:
             },
             
             "array": {
-                "valid": ["  int    foo[N]", "   longint bar[N_  ]", "real foo [123][  2*N + 1][A - 123]"],
+                "valid": ["  int    foo[N]", "   longint bar[N_  ]", "real foo [123][  2*N + 1][A - 123]", "int foo[N][M] [0..9]"],
                 "invalid": ["foo[N]", "int [N]", "int foo", "int foo[?]", "int foo[foo[N]]", "int foo(N)", "int foo[-bar+15]"]
             },
             
+            "IO_arrays": {
+                "valid": ["A[]", "foo[][] bar[][]", "mat[][] {string}", "mat[][]{string}"],
+                "invalid": ["A", "A[] B", "mat[][] {strings}", "mat[][] {string"]
+            },
+            
             "prototype": {
                 "valid": ["  f () ", " real longint123_name_123(int &a[][][], longint& b, char &    _c32132 , longint d[]) {grader}"],
                 "invalid": ["()", "int f(", "int f(int, &int)", "int f() {}", "int f() {grader"]
@@ -238,4 +337,5 @@ class RegexParser:
         pprint.PrettyPrinter(indent=4, width=150).pprint(self.MatchTree("prototype", tests["prototype"]["valid"][1]))
         print("\n\n\n")
         pprint.PrettyPrinter(indent=4, width=150).pprint(self.MatchTree("array", tests["array"]["valid"][2]))
-        
+
+RegexParser.BuildGrammar()
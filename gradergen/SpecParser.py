@@ -0,0 +1,294 @@
+import re
+import string
+from gradergen.structures import PrimitiveType, Location
+
+# Lexer and recursive-descent parser for task.spec.
+# Each line is split into tokens by a single compiled regex and then parsed
+# by the functions below, looking at one token at a time. The result is the
+# same match_tree produced by RegexParser.MatchTree, so the objects in
+# structures.py are built in the same way from both parsers.
+# Syntax errors report the column (starting from 1) of the wrong token.
+
+SECTIONS = ["variables", "prototypes", "input", "calls", "output"]
+
+# Type specifiers allowed for variables and parameters (all but void).
+TYPES = [enum_element.value for enum_element in PrimitiveType if enum_element != PrimitiveType.VOID]
+LOCATIONS = [enum_element.value for enum_element in Location]
+
+NAME = "name"
+NUMBER = "number"
+END = "end of line"
+
+# A token is a name, a number or a single symbol among SYMBOLS, its kind is
+# given by its first character. Spaces are skipped, anything else is an error.
+TOKEN_REGEX = re.compile(r"[a-zA-Z_][a-zA-Z_0-9]*|[0-9]+|[^ \t]")
+SYMBOLS = "()[]{},&=*+-:."
+TOKEN_KINDS = {char: NAME for char in string.ascii_letters + "_"}
+TOKEN_KINDS.update({char: NUMBER for char in string.digits})
+TOKEN_KINDS.update({char: char for char in SYMBOLS})
+
+class Tokens:
+    def __init__(self, line):
+        self.line = line
+        self.values = TOKEN_REGEX.findall(line)
+        self.kinds = [TOKEN_KINDS.get(value[0]) for value in self.values]
+        self.values.append("")
+        self.kinds.append(END)
+        self.pos = 0
+        if None in self.kinds:
+            self.pos = self.kinds.index(None)
+            raise SyntaxError("Unexpected character '{0}' at column {1}."
+                                  .format(self.values[self.pos], self.column()))
+
+    # The column of the current token, computed only when it is needed.
+    def column(self):
+        if self.kinds[self.pos] == END:
+            return len(self.line) + 1
+        for index, match in enumerate(TOKEN_REGEX.finditer(self.line)):
+            if index == self.pos:
+                return match.start() + 1
+
+    # Kind of the token after offset more tokens.
+    def peek(self, offset = 0):
+        return self.kinds[min(self.pos + offset, len(self.kinds) - 1)]
+
+    # Whether the next token is a name among the given ones.
+    def peek_name(self, names):
+        return self.kinds[self.pos] == NAME and self.values[self.pos] in names
+
+    # Consumes and returns the value of the next token.
+    def next(self):
+        value = self.values[self.pos]
+        if self.kinds[self.pos] != END:
+            self.pos += 1
+        return value
+
+    # Consumes the next token if it is of the given kind.
+    def accept(self, kind):
+        if self.kinds[self.pos] == kind:
+            self.pos += 1
+            return True
+        return False
+
+    # Consumes and returns the value of the next token, which must be of the
+    # given kind.
+    def expect(self, kind, description = None):
+        if self.kinds[self.pos] != kind:
+            if description is None:
+                description = "a " + kind if kind in [NAME, NUMBER] else "'" + kind + "'"
+            self.error(description)
+        self.pos += 1
+        return self.values[self.pos - 1]
+
+    def error(self, expected):
+        if self.kinds[self.pos] == END:
+            found = "the end of the line"
+        else:
+            found = "'{0}'".format(self.values[self.pos])
+        raise SyntaxError("Expected {0} at column {1}, found {2}."
+                              .format(expected, self.column(), found))
+
+class SpecParser:
+    # Splits the lines of task.spec in sections, returns a dictionary
+    # containing, for each section, the list of pairs (line_number, line).
+    def split_sections(self, lines):
+        section_lines = {}
+        act_section = None
+        for line_number in range(len(lines)):
+            line = lines[line_number].strip()
+
+            if line.startswith("#") or len(line) == 0:
+                continue
+
+            if line.startswith("***") and line.endswith("***") and line[3:-3] in SECTIONS:
+                act_section = line[3:-3]
+                if act_section in section_lines:
+                    raise SyntaxError("The specification file (task.spec) "
+                                      "contains twice the same section.")
+                section_lines[act_section] = []
+                continue
+
+            if act_section is None:
+                raise SyntaxError("The specification file (task.spec) has to "
+                                  "start with a section header.")
+            section_lines[act_section].append((line_number, line))
+
+        for section in SECTIONS:
+            if section not in section_lines:
+                raise SyntaxError("The specification file (task.spec) does "
+                                  "not contain the section {0}.".format(section))
+        return section_lines
+
+    # Parses a line of the given section, returns the name of the RegexParser
+    # regex that would match it and the match_tree.
+    def parse_line(self, section, line_number, line):
+        tokens = Tokens(line)
+        if section == "variables":
+            rule, match_tree = self.parse_declaration(tokens)
+        elif section == "prototypes":
+            rule, match_tree = "prototype", self.parse_prototype(tokens)
+        elif section == "calls":
+            rule, match_tree = "call", self.parse_call(tokens)
+        elif tokens.peek(1) == "[":
+            rule, match_tree = "IO_arrays", self.parse_IO_arrays(tokens)
+        else:
+            rule, match_tree = "IO_variables", self.parse_IO_variables(tokens)
+        tokens.expect(END, "the end of the line")
+        return rule, match_tree
+
+    def parse_type(self, tokens):
+        if not tokens.peek_name(TYPES):
+            tokens.error("a type ({0})".format(", ".join(TYPES)))
+        return tokens.next()
+
+    # variable: type name [[number..number]]
+    # array: type name [expression]...[expression] [[number..number]]
+    def parse_declaration(self, tokens):
+        match_tree = {
+            "type": self.parse_type(tokens),
+            "name": tokens.expect(NAME),
+        }
+        if tokens.peek() != "[":
+            return "variable", match_tree
+        if self.is_bounds(tokens):
+            self.parse_bounds(tokens, match_tree)
+            return "variable", match_tree
+
+        match_tree["sizes"] = []
+        while tokens.accept("["):
+            match_tree["sizes"].append(self.parse_expression(tokens))
+            tokens.expect("]")
+            if tokens.peek() == "[" and self.is_bounds(tokens):
+                self.parse_bounds(tokens, match_tree)
+                break
+        return "array", match_tree
+
+    # Whether the next tokens are [number.., the bounds and not a size.
+    def is_bounds(self, tokens):
+        offset = 2 if tokens.peek(1) in ["+", "-"] else 1
+        return tokens.peek(offset) == NUMBER and tokens.peek(offset + 1) == "."
+
+    # bounds: [number..number]
+    def parse_bounds(self, tokens, match_tree):
+        tokens.expect("[")
+        match_tree["min"] = self.parse_number(tokens)
+        tokens.expect(".", "'..'")
+        tokens.expect(".", "'..'")
+        match_tree["max"] = self.parse_number(tokens)
+        tokens.expect("]")
+
+    # A signed integer, the sign is optional only if signed is False.
+    def parse_number(self, tokens, signed = False):
+        sign = ""
+        if tokens.peek() in ["+", "-"]:
+            sign = tokens.next()
+        elif signed:
+            tokens.error("'+' or '-'")
+        return sign + tokens.expect(NUMBER)
+
+    # expression: number | [number *] variable [(+|-) number]
+    def parse_expression(self, tokens):
+        match_tree = {}
+        if tokens.peek() != NAME:
+            number = self.parse_number(tokens)
+            if not tokens.accept("*"):
+                return {"const1": number}
+            match_tree["coef"] = number
+        match_tree["variable"] = tokens.expect(NAME, "a number or a variable")
+        if tokens.peek() in ["+", "-"]:
+            match_tree["const2"] = self.parse_number(tokens, True)
+        return match_tree
+
+    # prototype: [type] name ( [parameter, ..., parameter] ) [{location}]
+    def parse_prototype(self, tokens):
+        match_tree = {"return_type": ""}
+        if tokens.peek(1) != "(":
+            match_tree["return_type"] = self.parse_type(tokens)
+        match_tree["name"] = tokens.expect(NAME)
+        tokens.expect("(")
+        match_tree["params"] = []
+        if not tokens.accept(")"):
+            match_tree["params"].append(self.parse_parameter(tokens))
+            while tokens.accept(","):
+                match_tree["params"].append(self.parse_parameter(tokens))
+            tokens.expect(")", "',' or ')'")
+        if tokens.accept("{"):
+            if not tokens.peek_name(LOCATIONS):
+                tokens.error("a location ({0})".format(", ".join(LOCATIONS)))
+            match_tree["location"] = tokens.next()
+            tokens.expect("}")
+        return match_tree
+
+    # parameter: type [&] name [][]...[]
+    def parse_parameter(self, tokens):
+        match_tree = {"type": self.parse_type(tokens)}
+        match_tree["by_ref"] = "&" if tokens.accept("&") else ""
+        match_tree["name"] = tokens.expect(NAME)
+        match_tree["dim"] = ""
+        while tokens.accept("["):
+            tokens.expect("]")
+            match_tree["dim"] += "[]"
+        return match_tree
+
+    # call: [repeat expression:]... [parameter =] name ( [parameter, ..., parameter] )
+    # The word repeat is a keyword only if it is not the name of the function.
+    def parse_call(self, tokens):
+        match_tree = {}
+        while tokens.peek_name(["repeat"]) and tokens.peek(1) not in ["(", "="]:
+            tokens.next()
+            match_tree.setdefault("loops", []).append(self.parse_expression(tokens))
+            tokens.expect(":")
+        if tokens.peek(1) in ["=", "["]:
+            match_tree["return_var"] = self.parse_call_parameter(tokens)
+            tokens.expect("=")
+        match_tree["name"] = tokens.expect(NAME)
+        tokens.expect("(", "'(' or '='" if "return_var" not in match_tree else "'('")
+        match_tree["params"] = []
+        if not tokens.accept(")"):
+            match_tree["params"].append(self.parse_call_parameter(tokens))
+            while tokens.accept(","):
+                match_tree["params"].append(self.parse_call_parameter(tokens))
+            tokens.expect(")", "',' or ')'")
+        return match_tree
+
+    # parameter: variable | array[index]...[index]
+    # A variable is just its name, an indexed array is a dictionary.
+    def parse_call_parameter(self, tokens):
+        name = tokens.expect(NAME)
+        if tokens.peek() != "[":
+            return name
+        match_tree = {"name": name, "indexes": []}
+        while tokens.accept("["):
+            match_tree["indexes"].append(tokens.expect(NAME, "the index of a loop"))
+            tokens.expect("]")
+        return match_tree
+
+    # IO_variables: variable ... variable
+    def parse_IO_variables(self, tokens):
+        match_tree = {"variables": [tokens.expect(NAME)]}
+        while tokens.peek() == NAME:
+            match_tree["variables"].append(tokens.next())
+        if tokens.peek() == "[":
+            tokens.error("a variable (variables and arrays cannot be on the same line)")
+        return match_tree
+
+    # IO_arrays: array[]...[] ... array[]...[] [{string}]
+    def parse_IO_arrays(self, tokens):
+        match_tree = {"arrays": []}
+        while tokens.peek() == NAME:
+            array = {"name": tokens.next(), "dim": ""}
+            tokens.expect("[", "'[' (variables and arrays cannot be on the same line)")
+            tokens.expect("]")
+            array["dim"] = "[]"
+            while tokens.accept("["):
+                tokens.expect("]")
+                array["dim"] += "[]"
+            match_tree["arrays"].append(array)
+        if not match_tree["arrays"]:
+            tokens.error("an array")
+        if tokens.accept("{"):
+            if not tokens.peek_name(["string"]):
+                tokens.error("'string'")
+            match_tree["format"] = tokens.next()
+            tokens.expect("}")
+        return match_tree
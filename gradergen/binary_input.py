@@ -0,0 +1,347 @@
+import array
+import re
+import sys
+import shutil
+import tempfile
+from gradergen.structures import PrimitiveType, IOVariables, IOArrays, is_single_char
+
+# Conversion of the input of a task between text and the binary format read
+# by the binary graders (see doc/binary_input.md).
+# The values are written in the order of the input section: the variables of
+# a line one after the other, the arrays of a line one after the other (each
+# one contiguous, in row-major order, even if they are interleaved in the
+# text). Each value, and each array, is aligned to a multiple of the size of
+# its type counting from the beginning of the file, padding with zeros.
+# The files are streamed, a chunk at a time, so that the memory used does not
+# depend on their size. The arrays of a line are interleaved in the text but
+# not in the binary input, so all but one are kept in temporary files.
+
+# Format of the array module and size (in bytes) of each type.
+ARRAY_FORMATS = {
+    PrimitiveType.INT: ("i", 4),
+    PrimitiveType.LONGINT: ("q", 8),
+    PrimitiveType.CHAR: ("B", 1),
+    PrimitiveType.REAL: ("d", 8),
+}
+
+# Number of values (or of rows of strings) converted at a time.
+CHUNK_SIZE = 1 << 16
+
+TOKEN_REGEX = re.compile(r"\S+")
+WHITESPACES = " \t\n\v\f\r"
+
+# Reads the text input a chunk at a time, as the graders do: numbers are
+# tokens separated by whitespaces, chars are read one at a time skipping the
+# whitespaces and the rows of strings are read as they are.
+class TextReader:
+    def __init__(self, stream, chunk_size = 1 << 16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+
+    # Appends the next chunk to the buffer, returns False if the input is over.
+    def fill(self):
+        chunk = self.stream.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return len(chunk) > 0
+
+    def skip_whitespaces(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACES:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return
+
+    def read_token(self):
+        match = TOKEN_REGEX.search(self.buffer, self.pos)
+        # A token at the end of the buffer might continue in the next chunk
+        while match is None or match.end() == len(self.buffer):
+            if not self.fill():
+                break
+            match = TOKEN_REGEX.search(self.buffer, self.pos)
+        if match is None:
+            raise EOFError("The text input is too short.")
+        self.pos = match.end()
+        return match.group()
+
+    def read_chars(self, count):
+        while len(self.buffer) - self.pos < count:
+            if not self.fill():
+                raise EOFError("The text input is too short.")
+        chars = self.buffer[self.pos:self.pos + count]
+        self.pos += count
+        return chars
+
+    def read_char(self):
+        self.skip_whitespaces()
+        return self.read_chars(1)
+
+    def read_value(self, type):
+        if type == PrimitiveType.CHAR:
+            return ord(self.read_char())
+        token = self.read_token()
+        try:
+            return float(token) if type == PrimitiveType.REAL else int(token)
+        except ValueError:
+            raise ValueError("'{0}' is not a valid {1}.".format(token, type.value))
+
+    # Reads count tokens, splitting the whole buffer at once.
+    def read_tokens(self, count):
+        tokens = []
+        while len(tokens) < count:
+            needed = count - len(tokens)
+            parts = self.buffer[self.pos:].split(None, needed)
+            if len(parts) > needed:
+                # The remaining part starts from the first token not needed
+                tokens += parts[:needed]
+                self.pos = len(self.buffer) - len(parts[needed])
+                break
+            # The last token might continue in the next chunk
+            if parts and self.buffer[-1] not in WHITESPACES:
+                tokens += parts[:-1]
+                self.pos = len(self.buffer) - len(parts[-1])
+            else:
+                tokens += parts
+                self.pos = len(self.buffer)
+            if not self.fill():
+                tokens += self.buffer[self.pos:].split()
+                self.pos = len(self.buffer)
+                if len(tokens) < count:
+                    raise EOFError("The text input is too short.")
+        return tokens
+
+    # Reads count values of the given type as an array.
+    def read_values(self, type, count):
+        if type == PrimitiveType.CHAR:
+            return array.array("B", (self.read_value(type) for i in range(count)))
+        return self.convert_tokens(type, self.read_tokens(count))
+
+    # Converts tokens to an array of numbers of the given type.
+    def convert_tokens(self, type, tokens):
+        convert = float if type == PrimitiveType.REAL else int
+        try:
+            return array.array(ARRAY_FORMATS[type][0], map(convert, tokens))
+        except ValueError:
+            for token in tokens:
+                try:
+                    convert(token)
+                except ValueError:
+                    raise ValueError("'{0}' is not a valid {1}.".format(token, type.value))
+            raise
+
+    # Reads count rows of strings of the given length, as bytes.
+    def read_rows(self, count, length):
+        rows = []
+        for i in range(count):
+            self.skip_whitespaces()
+            rows.append(self.read_chars(length))
+        return "".join(rows).encode("latin-1")
+
+# Writes the values in binary, keeping track of the offset to align them.
+class BinaryWriter:
+    def __init__(self, stream):
+        self.stream = stream
+        self.offset = 0
+
+    def align(self, type):
+        padding = -self.offset % ARRAY_FORMATS[type][1]
+        if padding > 0:
+            self.stream.write(bytes(padding))
+            self.offset += padding
+
+    # Only the first chunk of an array can need padding, as the size of the
+    # chunks is a multiple of the size of the type.
+    def write_values(self, type, values):
+        self.align(type)
+        values = array.array(ARRAY_FORMATS[type][0], values)
+        if sys.byteorder == "big":
+            values.byteswap()
+        self.stream.write(values.tobytes())
+        self.offset += len(values) * ARRAY_FORMATS[type][1]
+
+# Reads the values in binary, keeping track of the offset to skip the padding.
+class BinaryReader:
+    def __init__(self, stream):
+        self.stream = stream
+        self.offset = 0
+
+    def read_bytes(self, count):
+        data = self.stream.read(count)
+        if len(data) < count:
+            raise EOFError("The binary input is too short.")
+        self.offset += count
+        return data
+
+    def align(self, type):
+        self.read_bytes(-self.offset % ARRAY_FORMATS[type][1])
+
+    def read_values(self, type, count):
+        self.align(type)
+        values = array.array(ARRAY_FORMATS[type][0])
+        values.frombytes(self.read_bytes(count * ARRAY_FORMATS[type][1]))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+# Writes the values in text: the variables of a line on a single line, the
+# arrays with a line for each row (the last index) or, if they are more than
+# one, a line for each element.
+class TextWriter:
+    def __init__(self, stream):
+        self.stream = stream
+
+    # The function converting a value of the given type to a string.
+    def formatter(self, type):
+        if type == PrimitiveType.CHAR:
+            return chr
+        # repr gives the shortest string read back as the same double
+        return repr if type == PrimitiveType.REAL else str
+
+    def write_line(self, type_values):
+        self.stream.write(" ".join(self.formatter(type)(value) for type, value in type_values) + "\n")
+
+    # Writes a line for each element of the columns.
+    def write_columns(self, types, columns):
+        strings = [map(self.formatter(type), column) for type, column in zip(types, columns)]
+        self.stream.write("".join(" ".join(line) + "\n" for line in zip(*strings)))
+
+# The value of an expression (the size of an array), given the values of the
+# variables already read.
+def evaluate(expression, values):
+    if expression.var is None:
+        return expression.const
+    return expression.coef * values[expression.var.name] + expression.const
+
+def product(numbers):
+    result = 1
+    for number in numbers:
+        result *= number
+    return result
+
+# Yields the sizes of the chunks in which count values are converted.
+def chunks(count, chunk_size = CHUNK_SIZE):
+    for start in range(0, count, chunk_size):
+        yield min(chunk_size, count - start)
+
+# Converts the text input (read from text_stream) of a task to binary
+# (written in binary_stream). data is the parsed task.spec, as returned by
+# DataManager.get_data.
+def text_to_binary(data, text_stream, binary_stream):
+    reader = TextReader(text_stream)
+    writer = BinaryWriter(binary_stream)
+    # Values of the variables read, used to compute the sizes of the arrays.
+    values = {}
+
+    for input_line in data["input"]:
+        if type(input_line) == IOVariables:
+            for var in input_line.variables:
+                values[var.name] = reader.read_value(var.type)
+                writer.write_values(var.type, [values[var.name]])
+            continue
+
+        sizes = [evaluate(size, values) for size in input_line.sizes]
+        count = product(sizes)
+        if input_line.as_string:
+            writer.align(PrimitiveType.CHAR)
+            for rows in chunks(product(sizes[:-1]), max(1, CHUNK_SIZE // max(1, sizes[-1]))):
+                writer.write_values(PrimitiveType.CHAR, reader.read_rows(rows, sizes[-1]))
+            continue
+
+        # The first array is written directly, the others (interleaved with
+        # it in the text) are kept in temporary files until it is complete.
+        first, others = input_line.arrays[0], input_line.arrays[1:]
+        temporary_files = [tempfile.TemporaryFile() for arr in others]
+        others_writers = [BinaryWriter(f) for f in temporary_files]
+        writer.align(first.type)
+        for chunk in chunks(count):
+            if not others:
+                writer.write_values(first.type, reader.read_values(first.type, chunk))
+                continue
+            if all(arr.type != PrimitiveType.CHAR for arr in input_line.arrays):
+                tokens = reader.read_tokens(chunk * len(input_line.arrays))
+                columns = [
+                    reader.convert_tokens(arr.type, tokens[index::len(input_line.arrays)])
+                    for index, arr in enumerate(input_line.arrays)
+                ]
+            else:
+                columns = [[] for arr in input_line.arrays]
+                for i in range(chunk):
+                    for arr, column in zip(input_line.arrays, columns):
+                        column.append(reader.read_value(arr.type))
+            writer.write_values(first.type, columns[0])
+            for arr, other_writer, column in zip(others, others_writers, columns[1:]):
+                other_writer.write_values(arr.type, column)
+        for arr, temporary_file in zip(others, temporary_files):
+            temporary_file.seek(0)
+            writer.align(arr.type)
+            shutil.copyfileobj(temporary_file, binary_stream)
+            writer.offset += count * ARRAY_FORMATS[arr.type][1]
+            temporary_file.close()
+
+# Converts the binary input (read from binary_stream) of a task to text
+# (written in text_stream). data is the parsed task.spec, as returned by
+# DataManager.get_data.
+def binary_to_text(data, binary_stream, text_stream):
+    reader = BinaryReader(binary_stream)
+    writer = TextWriter(text_stream)
+    # Values of the variables read, used to compute the sizes of the arrays.
+    values = {}
+
+    for input_line in data["input"]:
+        if type(input_line) == IOVariables:
+            for var in input_line.variables:
+                values[var.name] = reader.read_values(var.type, 1)[0]
+            writer.write_line((var.type, values[var.name]) for var in input_line.variables)
+            continue
+
+        sizes = [evaluate(size, values) for size in input_line.sizes]
+        count = product(sizes)
+        # A single char array is written as strings, even without {string}
+        if is_single_char(input_line):
+            reader.align(PrimitiveType.CHAR)
+            for rows in chunks(product(sizes[:-1]), max(1, CHUNK_SIZE // max(1, sizes[-1]))):
+                content = reader.read_bytes(rows * sizes[-1]).decode("latin-1")
+                for row in range(rows):
+                    text_stream.write(content[row * sizes[-1]:(row + 1) * sizes[-1]] + "\n")
+            continue
+
+        if len(input_line.arrays) == 1:
+            arr = input_line.arrays[0]
+            row_length = sizes[-1]
+            position = 0 # Index of the next value inside its row
+            for chunk in chunks(count):
+                strings = list(map(writer.formatter(arr.type), reader.read_values(arr.type, chunk)))
+                start = 0
+                while start < len(strings):
+                    end = min(len(strings), start + row_length - position)
+                    text_stream.write(" ".join(strings[start:end]))
+                    position += end - start
+                    start = end
+                    if position == row_length:
+                        text_stream.write("\n")
+                        position = 0
+                    else:
+                        text_stream.write(" ")
+            continue
+
+        # All the arrays but the last one are copied in temporary files, so
+        # that they can be read together.
+        temporary_files = []
+        for arr in input_line.arrays[:-1]:
+            temporary_files.append(tempfile.TemporaryFile())
+            reader.align(arr.type)
+            for chunk in chunks(count):
+                temporary_files[-1].write(reader.read_bytes(chunk * ARRAY_FORMATS[arr.type][1]))
+            temporary_files[-1].seek(0)
+        readers = [BinaryReader(f) for f in temporary_files] + [reader]
+        reader.align(input_line.arrays[-1].type)
+        for chunk in chunks(count):
+            columns = [
+                array_reader.read_values(arr.type, chunk)
+                for arr, array_reader in zip(input_line.arrays, readers)
+            ]
+            writer.write_columns([arr.type for arr in input_line.arrays], columns)
+        for temporary_file in temporary_files:
+            temporary_file.close()
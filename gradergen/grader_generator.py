@@ -2,26 +2,38 @@
 
 import sys
 import os
-import re # regexp, used to check variables and functions names
 import argparse # to parse command line arguments
-import copy # to avoid making too many / too few "array allocations" in the grader
-import yaml # parse task.yaml
-
-from gradergen.RegexParser import RegexParser
-from gradergen.structures import Variable, Array, Parameter, Prototype, Call, IOVariables, IOArrays, Expression
-from gradergen.languages.C import LanguageC
-from gradergen.languages.CPP import LanguageCPP
-from gradergen.languages.pascal import LanguagePascal
-
-LANGUAGES_LIST = ["C", "fast_C", "CPP", "fast_CPP", "pascal", "fast_pascal"]
+import traceback
+import functools
+import hashlib # to know whether the generated files are up to date
+import json
+import importlib
+
+import gradergen
+from gradergen.SpecParser import SpecParser
+from gradergen.languages import RUNTIME_FILES, read_runtime_file
+from gradergen.structures import Variable, Array, Parameter, Prototype, Call, IOVariables, IOArrays, Expression, LoopIndex, base_variable
+
+LANGUAGES_LIST = ["C", "fast_C", "CPP", "fast_CPP", "pascal", "fast_pascal", "python", "fast_python", "java", "fast_java"]
+# Graders reading the input in binary, they are not generated by --all as
+# they need the input files to be converted.
+BINARY_LANGUAGES_LIST = ["binary_C", "binary_CPP"]
+# The language classes are imported only when a language is generated, see
+# get_language_class.
 CLASSES_LIST = \
 {
-    "C": (LanguageC, 0),
-    "fast_C": (LanguageC, 1),
-    "CPP": (LanguageCPP, 0),
-    "fast_CPP": (LanguageCPP, 1),
-    "pascal": (LanguagePascal, 0),
-    "fast_pascal": (LanguagePascal, 1),
+    "C": ("gradergen.languages.C", "LanguageC", 0),
+    "fast_C": ("gradergen.languages.C", "LanguageC", 1),
+    "CPP": ("gradergen.languages.CPP", "LanguageCPP", 0),
+    "fast_CPP": ("gradergen.languages.CPP", "LanguageCPP", 1),
+    "pascal": ("gradergen.languages.pascal", "LanguagePascal", 0),
+    "fast_pascal": ("gradergen.languages.pascal", "LanguagePascal", 1),
+    "python": ("gradergen.languages.python", "LanguagePython", 0),
+    "fast_python": ("gradergen.languages.python", "LanguagePython", 1),
+    "java": ("gradergen.languages.java", "LanguageJava", 0),
+    "fast_java": ("gradergen.languages.java", "LanguageJava", 1),
+    "binary_C": ("gradergen.languages.C", "LanguageC", 2),
+    "binary_CPP": ("gradergen.languages.CPP", "LanguageCPP", 2),
 }
 EXTENSIONS_LIST = \
 {
@@ -31,9 +43,18 @@ EXTENSIONS_LIST = \
     "fast_CPP": "cpp",
     "pascal": "pas",
     "fast_pascal": "pas",
+    "python": "py",
+    "fast_python": "py",
+    "java": "java",
+    "fast_java": "java",
+    "binary_C": "c",
+    "binary_CPP": "cpp",
 }
+FAST_IO_RUNTIMES = ["unlocked", "buffered"]
+ARRAY_ALLOCATIONS = ["rows", "contiguous"]
 DESCRIPTION_FILE = "task.spec"
 TASK_YAML = "task.yaml"
+MANIFEST_FILE = ".gradergen_manifest.json"
 
 class DataManager:
     def __init__(self):
@@ -45,6 +66,9 @@ class DataManager:
         self.calls = []
         self.output = []
         self.used_names = set()
+        # Names of the variables and arrays whose value is known at the
+        # current point of the grader (read from input or set by a call).
+        self.known = set()
 
     def add_new_name(self, name):
         if name in self.used_names:
@@ -75,185 +99,92 @@ class DataManager:
                                 .format(name))
         return self.prototypes[name]
     
-    def make_copy(self):
-        return copy.deepcopy({
-            "variables": list(self.variables.values()),
-            "prototypes": list(self.prototypes.values()),
-            "input": self.input_,
-            "calls": self.calls,
-            "output": self.output,        
-        })
-
-# Parsing grader description file
-def parse_specification_file(lines):
-    sections = {"variables": [], "prototypes": [], "calls": [], "input": [], "output": []}
-    section_lines = {}
-    act_section = None
-    for line_number in range(len(lines)):
-        line = lines[line_number]
-        line = line.strip()
-        line = re.sub(" +", " ", line) # remove multiple spaces
-
-        if line.startswith("#") or len(line) == 0:
-            continue
-
-        is_section_title = False
-        for section in sections:
-            if line == "***" + section + "***":
-                if sections[section]:
-                    raise SyntaxError("The specification file (task.spec) "
-                                      "contains twice the same section.")
-                is_section_title = True
-                sections[section] = True
-                act_section = section
-                section_lines[section] = []
-                break
-
-        if not is_section_title:
-            if not act_section:
-                raise SyntaxError("The specification file (task.spec) has to "
-                                  "start with a section header.")
-            section_lines[act_section].append((line_number, line))
-    return section_lines
-
-def raise_parsing_error(section, line_number, line):
-    raise SyntaxError("The line {1}, in the {0} section, could not be parsed: {2}"
-                          .format(section, line_number, line))
-
-def main():
-    global languages_serializer
-    global DESCRIPTION_FILE
-    global variables
-    global prototypes
-
-    parser = argparse.ArgumentParser(description = "Automatically generate graders and templates in various languages")
-    parser.add_argument(\
-        "--task_spec",
-        metavar = "task_spec", action = "store", nargs = "?",
-        help = "the file describing the grader"
-    )
-    parser.add_argument(\
-        "--task_yaml",
-        metavar = "task_yaml", action = "store", nargs = "?",
-        help = "the yaml file describing the task"
-    )
-    parser.add_argument(\
-        "--include_dir",
-        metavar = "include_dir", action = "store", nargs="?",
-        help = "the folder containing include_callable and include_grader"
-    )
-    parser.add_argument(\
-        "--debug",
-        action = "store_true", default = False,
-        help = "whether to show the backtrace when an exception is raised"
-    )
-
-    group = parser.add_mutually_exclusive_group(required=True)
-    group.add_argument(\
-        "-l", "--lang",
-        nargs = "+",
-        metavar = ("lang", "filename"),
-        dest = "languages",
-        action = "append",
-        help = "programming language, grader and template"
-    )
-    group.add_argument(\
-        "-a", "--all",
-        action = "store_true",
-        default = False,
-        help = "create graders and templates in all supported languages (with standard names)"
-    )
-    group.add_argument(\
-        "--oii",
-        action = "store_true",
-        default = False,
-        help = "create graders and templates in all supported languages following "
-               "oii's standard (sol/ and att/)"
-    )
-    group.add_argument(\
-        "--stage",
-        nargs = "?",
-        metavar = "IO_type",
-        const = "normal",
-        default = False,
-        help = "create graders and templates in C++ following stages' standard "
-               "(sol/ and att/), IO_type (can be 'normal' or 'fast') decides "
-               "whether graders in sol/ must have fastIO or not"
-    )
+    # The elements of an array are known together with the whole array, the
+    # indexes of the loops are always known.
+    def set_known(self, var):
+        self.known.add(base_variable(var).name)
 
-    args = parser.parse_args()
-
-    # Hiding backtrace if --debug is not set
-    if not args.debug:
-        def NoBacktraceExpectionHandler(exception_type, exception, traceback):
-            print("{0}: {1}".format(exception_type.__name__, exception),
-                  file=sys.stderr)
-        sys.excepthook = NoBacktraceExpectionHandler
+    def is_known(self, var):
+        return type(var) == LoopIndex or base_variable(var).name in self.known
     
-    if args.task_spec is None:
-        # Search for a DESCRIPTION_FILE
-        directory = os.getcwd()
-        while True:
-            description = os.path.join(directory, DESCRIPTION_FILE)
-
-            if os.path.isfile(description):
-                args.task_spec = description
-                break
-
-            if os.path.dirname(directory) == directory:
-                break
-            else:
-                directory = os.path.dirname(directory)
-
-    if args.task_spec is None:
-        raise FileNotFoundError("The {0} file cannot be found."
-                                    .format(DESCRIPTION_FILE))
-
-    if args.task_yaml is None:
-        # Search for a TASK_YAML
-        directory = os.getcwd()
-        while True:
-            task_yaml = os.path.join(directory, TASK_YAML)
-
-            if os.path.isfile(task_yaml):
-                args.task_yaml = task_yaml
-                break
-
-            if os.path.dirname(directory) == directory:
-                break
-            else:
-                directory = os.path.dirname(directory)
+    # The parsed objects are immutable, so the same ones are shared by all
+    # the language classes.
+    def get_data(self):
+        return {
+            "variables": tuple(self.variables.values()),
+            "prototypes": tuple(self.prototypes.values()),
+            "input": tuple(self.input_),
+            "calls": tuple(self.calls),
+            "output": tuple(self.output),
+        }
 
-    if args.task_yaml is None:
-        raise FileNotFoundError("The {0} file cannot be found."
-                                    .format(TASK_YAML))
+# Searches the file in the current directory and in all its ancestors.
+def search_file(file_name):
+    directory = os.getcwd()
+    while True:
+        path = os.path.join(directory, file_name)
 
+        if os.path.isfile(path):
+            return path
 
-    # Parsing task.yaml
-    task_yaml = yaml.safe_load(open(task_yaml, "rt", encoding="utf-8"))
+        if os.path.dirname(directory) == directory:
+            return None
+        else:
+            directory = os.path.dirname(directory)
+
+# Returns all the folders, inside root, containing both the task.spec and the
+# task.yaml files (sorted, so that the order does not depend on the
+# filesystem).
+def find_tasks(root):
+    tasks = []
+    for directory, subdirectories, files in os.walk(root):
+        subdirectories.sort()
+        if DESCRIPTION_FILE in files and TASK_YAML in files:
+            tasks.append(directory)
+    return sorted(tasks)
+
+def parse_task_yaml(task_yaml_path):
+    import yaml # imported here as it is slow to import and rarely needed
+    with open(task_yaml_path, "rt", encoding="utf-8") as f:
+        task_yaml = yaml.safe_load(f)
     try:
-        task_name = task_yaml["name"]
-        input_file = task_yaml["infile"]
-        output_file = task_yaml["outfile"]
+        return {
+            "task_name": task_yaml["name"],
+            "input_file": task_yaml["infile"],
+            "output_file": task_yaml["outfile"],
+            # In MiB, as CMS wants it
+            "memory_limit": task_yaml.get("memory_limit"),
+        }
     except KeyError:
         raise KeyError("The task.yaml file must contain name, infile and outfile.")
 
-    # End of parsing task.yaml
-
-    # --all, --stage, --oii
+# Warns (to stderr) if the arrays, at the maximum sizes given by the bounds in
+# task.spec, do not fit in the memory limit of task.yaml. The arrays without
+# bounds are not counted.
+def check_memory_limit(variables, memory_limit):
+    if memory_limit is None:
+        return
+    total = sum(var.maximum_bytes() or 0 for var in variables if type(var) == Array)
+    if total > memory_limit * 2**20:
+        print("Warning: the arrays may need {0:.1f} MiB, more than the memory "
+              "limit of {1} MiB.".format(total / 2**20, memory_limit), file=sys.stderr)
+
+# Returns the list of (lang, grader_name, template_name) chosen with the
+# command line arguments.
+# --all, --stage, --oii
+def choose_languages(args, task_name):
+    languages = args.languages or []
     if args.all:
-        args.languages = [[lang] for lang in LANGUAGES_LIST]
-
+        languages = [[lang] for lang in LANGUAGES_LIST]
 
     if args.stage:
-        args.include_dir = "gradergen"
         if args.stage == "fast":
-            args.languages = [
+            languages = [
                 ["CPP", "att/grader.cpp", "att/"+task_name+".cpp"],
                 ["fast_CPP", "sol/grader.cpp", "sol/template_cpp.cpp"]
             ]
         elif args.stage == "normal":
-            args.languages = [
+            languages = [
                 ["CPP", "att/grader.cpp", "att/"+task_name+".cpp"],
                 ["CPP", "sol/grader.cpp", "sol/template_cpp.cpp"]
             ]
@@ -262,8 +193,7 @@ def main():
                              "`fast` or empty.")
     
     if args.oii:
-        args.include_dir = "gradergen"
-        args.languages = [
+        languages = [
             ["CPP", "att/grader.cpp", "att/"+task_name+".cpp"],
             ["fast_CPP", "sol/grader.cpp", "sol/template_cpp.cpp"],
             ["C", "att/grader.c", "att/"+task_name+".c"],
@@ -272,20 +202,17 @@ def main():
             ["fast_pascal", "sol/grader.pas", "sol/template_pascal.pas"],
         ]
 
-    if args.stage or args.oii:
-        if not os.path.isdir("att/"):
-            raise IOError("Please create the folder att/.")
-    
     chosen_languages = []
-    for lang_options in args.languages:
+    for lang_options in languages:
+        lang_options = list(lang_options)
         lang = lang_options[0]
-        if lang not in LANGUAGES_LIST:
+        if lang not in LANGUAGES_LIST + BINARY_LANGUAGES_LIST:
             raise NotImplementedError("One of the specified languages is not "
                                       "currently supported.")
 
         # grader.extension is the standard name for graders
         if len(lang_options) <= 1:
-            grader_name = "{0}grader.{1}".format("fast_" if ("fast" in lang) else "", EXTENSIONS_LIST[lang])
+            grader_name = "{0}grader.{1}".format(lang[:lang.find("_")+1], EXTENSIONS_LIST[lang])
             lang_options.append(grader_name)
 
         # template_lang.extension is the standard name for templates
@@ -298,136 +225,569 @@ def main():
                              "names of grader and template.")
 
         chosen_languages.append((lang, lang_options[1], lang_options[2]))
-    
-    # Searching for include_grader and include_callable
-    include_dir = os.path.dirname(args.task_spec)
-    if args.include_dir is not None:
-        include_dir = args.include_dir
 
-    include_grader = {}
-    for lang, grader_name, template_name in chosen_languages:
-        ext = EXTENSIONS_LIST[lang]
-        try:
-            with open(os.path.join(include_dir, "include_grader." + ext)) as f:
-                include_grader[lang] = f.read()
-        except IOError:
-            pass
-        
-        
-    if include_grader and len(include_grader) != len(chosen_languages):
-        raise FileNotFoundError("The include_grader file has to exist for "
-                                "all or for none of the chosen languages.")
-    
-    include_callable = {}
+    # Otherwise the content of the file would depend on the order in which
+    # the languages are generated.
+    written_names = [name for lang, grader_name, template_name in chosen_languages for name in (grader_name, template_name)]
+    if len(set(written_names)) != len(written_names):
+        raise ValueError("Two graders or templates cannot have the same name.")
+    return chosen_languages
+
+# Searching for include_grader (or include_callable, depending on file_name)
+# in all the chosen languages.
+def read_include_files(include_dir, file_name, chosen_languages):
+    include_files = {}
     for lang, grader_name, template_name in chosen_languages:
         ext = EXTENSIONS_LIST[lang]
         try:
-            with open(os.path.join(include_dir, "include_callable." + ext)) as f:
-                include_callable[lang] = f.read()
+            with open(os.path.join(include_dir, file_name + "." + ext)) as f:
+                include_files[lang] = f.read()
         except IOError:
             pass
-    
-    if include_callable and len(include_callable) != len(chosen_languages):
-        raise FileNotFoundError("The include_callable file has to exist for "
-                                "all or for none of the chosen languages.")
-    
 
-    # Parsing specication file (task.spec)
-    with open(args.task_spec, "r") as task_spec:
-        lines = task_spec.read().splitlines()
-        section_lines = parse_specification_file(lines)
-        
-    # Here all the data is parsed from task.spec using regex_parser and inserted
-    # in data_manager. All compilation-like checks are done by the constructor
-    # of each object so as to not have to check anything here.
-    regex_parser = RegexParser()
+    if include_files and len(include_files) != len(chosen_languages):
+        raise FileNotFoundError("The {0} file has to exist for all or for "
+                                "none of the chosen languages.".format(file_name))
+    return include_files
+
+# Here all the data is parsed from task.spec using spec_parser (SpecParser or
+# RegexParser, which check only the syntax of each line) and inserted in
+# data_manager.
+# All compilation-like checks are done by the constructor of each object so
+# as to not have to check anything here.
+def parse_task_spec(lines, include_grader, spec_parser):
+    section_lines = spec_parser.split_sections(lines)
     data_manager = DataManager()    
 
     try:
         # Parsing variables
         for line_number, line in section_lines["variables"]:
-            if regex_parser.FullMatch("variable", line):
-                match_tree = regex_parser.MatchTree("variable", line)
+            rule, match_tree = spec_parser.parse_line("variables", line_number, line)
+            if rule == "variable":
                 new_variable = Variable(match_tree)
                 data_manager.add_variable(new_variable)
-            elif regex_parser.FullMatch("array", line):
-                match_tree = regex_parser.MatchTree("array", line)
+            else:
                 new_array = Array(match_tree, data_manager)
                 data_manager.add_variable(new_array)
-            else:
-                raise_parsing_error("variables", line_number, line)
 
         # Parsing prototypes
         for line_number, line in section_lines["prototypes"]:
-            if regex_parser.FullMatch("prototype", line):
-                match_tree = regex_parser.MatchTree("prototype", line)
-                new_proto = Prototype(match_tree, include_grader)
-                data_manager.add_prototype(new_proto)
-            else:
-                raise_parsing_error("prototypes", line_number, line)
+            rule, match_tree = spec_parser.parse_line("prototypes", line_number, line)
+            new_proto = Prototype(match_tree, include_grader)
+            data_manager.add_prototype(new_proto)
 
         # Parsing input
         for line_number, line in section_lines["input"]:
-            if regex_parser.FullMatch("IO_variables", line):
-                match_tree = regex_parser.MatchTree("IO_variables", line)
+            rule, match_tree = spec_parser.parse_line("input", line_number, line)
+            if rule == "IO_variables":
                 new_input = IOVariables(match_tree, data_manager, "input")
                 data_manager.input_.append(new_input)
                 for var in new_input.variables:
-                    var.known = True
-            elif regex_parser.FullMatch("IO_arrays", line):
-                match_tree = regex_parser.MatchTree("IO_arrays", line)
+                    data_manager.set_known(var)
+            else:
                 new_input = IOArrays(match_tree, data_manager, "input")
                 data_manager.input_.append(new_input)
                 for arr in new_input.arrays:
-                    arr.known = True
-            else:
-                raise_parsing_error("input", line_number, line)
+                    data_manager.set_known(arr)
 
         # Parsing calls
         for line_number, line in section_lines["calls"]:
-            if regex_parser.FullMatch("call", line):
-                match_tree = regex_parser.MatchTree("call", line)
-                new_call = Call(match_tree, data_manager)
-                data_manager.calls.append(new_call)
-                for param, by_ref in new_call.parameters:
-                    if by_ref:
-                        param.known = True
-                if new_call.return_var is not None:
-                    new_call.return_var.known = True
-            else:
-                raise_parsing_error("calls", line_number, line)
+            rule, match_tree = spec_parser.parse_line("calls", line_number, line)
+            new_call = Call(match_tree, data_manager)
+            data_manager.calls.append(new_call)
+            for param, by_ref in new_call.parameters:
+                if by_ref:
+                    data_manager.set_known(param)
+            if new_call.return_var is not None:
+                data_manager.set_known(new_call.return_var)
 
         # Parsing output
         for line_number, line in section_lines["output"]:
-            if regex_parser.FullMatch("IO_variables", line):
-                match_tree = regex_parser.MatchTree("IO_variables", line)
+            rule, match_tree = spec_parser.parse_line("output", line_number, line)
+            if rule == "IO_variables":
                 new_output = IOVariables(match_tree, data_manager, "output")
                 data_manager.output.append(new_output)
-            elif regex_parser.FullMatch("IO_arrays", line):
-                match_tree = regex_parser.MatchTree("IO_arrays", line)
+            else:
                 new_output = IOArrays(match_tree, data_manager, "output")
                 data_manager.output.append(new_output)
-            else:
-                raise_parsing_error("output", line_number, line)
     except Exception as e:
         error_message = \
             "{2}\nError at line {0}: {1}".format(line_number, line, str(e))
         raise type(e)(error_message).with_traceback(sys.exc_info()[2])
-    # End of parsing specification file
 
+    return data_manager
+
+# Hash of everything the generated files depend on: the version of gradergen,
+# the runtime files of the chosen languages, the options, task.spec, task.yaml
+# and the include files. The names of the generated files are taken relative
+# to the folder of the manifest, where they are looked for.
+def compute_task_digest(task_spec_path, task_yaml_path, include_dir, chosen_languages, args):
+    manifest_dir = os.path.dirname(task_spec_path)
+    relative_languages = [
+        (lang, os.path.relpath(grader_name, manifest_dir), os.path.relpath(template_name, manifest_dir))
+        for lang, grader_name, template_name in chosen_languages
+    ]
+    sources = [
+        ("version", gradergen.__version__.encode()),
+        ("options", json.dumps([
+            relative_languages, args.fast_io_runtime, args.real_precision,
+            args.array_allocation, args.profile, args.validator, args.checker,
+            args.absolute_tolerance, args.relative_tolerance,
+        ]).encode()),
+    ]
+    # The runtime files are chosen by their extension, the validator is in C
+    # and the checker in C++.
+    extensions = set(EXTENSIONS_LIST[lang] for lang, grader_name, template_name in chosen_languages)
+    if args.validator is not None:
+        extensions.add("c")
+    if args.checker is not None:
+        extensions.add("cpp")
+    for file_name in RUNTIME_FILES:
+        if file_name.rsplit(".", 1)[1] in extensions:
+            sources.append((file_name, read_runtime_file(file_name).encode()))
+
+    paths = [task_spec_path, task_yaml_path]
     for lang, grader_name, template_name in chosen_languages:
-        print(grader_name, template_name)
+        for file_name in ["include_grader", "include_callable"]:
+            paths.append(os.path.join(include_dir, file_name + "." + EXTENSIONS_LIST[lang]))
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                sources.append((path, f.read()))
+        except IOError:
+            sources.append((path, None))
+
+    digest = hashlib.sha256()
+    for name, content in sources:
+        digest.update(name.encode() + b"\0")
+        if content is None:
+            digest.update(b"missing\0")
+        else:
+            digest.update(str(len(content)).encode() + b"\0" + content)
+    return digest.hexdigest()
 
+def read_manifest(manifest_path):
+    try:
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return None
+
+# A single SpecParser is used by each process.
+@functools.lru_cache(maxsize=None)
+def get_spec_parser():
+    return SpecParser()
+
+# Returns the pair (language class, fast_io) of the given language.
+def get_language_class(lang):
+    module_name, class_name, fast_io = CLASSES_LIST[lang]
+    return getattr(importlib.import_module(module_name), class_name), fast_io
+
+def generate_language(lang, grader_name, template_name, data):
+    LangClass, fast_io = get_language_class(lang)
+    LangClass(fast_io, data).write_files(grader_name, template_name)
+
+# Generates graders and templates of a single task. All the relative paths
+# (of graders, templates, include_dir and of the att/ folder) are relative to
+# base_dir.
+# If executor is given, the languages are generated in parallel by it.
+# Nothing is generated if the manifest (in the folder of task.spec) shows that
+# the files have already been generated from the same sources, unless --force
+# is used.
+# Returns the list of pairs (grader, template), followed by the validator and
+# the checker if they are generated, and whether they were already up to date.
+def generate_task(task_spec_path, task_yaml_path, include_dir, args, base_dir = "", executor = None):
+    # Parsing task.yaml
+    task_info = parse_task_yaml(task_yaml_path)
+
+    chosen_languages = [
+        (lang, os.path.join(base_dir, grader_name), os.path.join(base_dir, template_name))
+        for lang, grader_name, template_name in choose_languages(args, task_info["task_name"])
+    ]
+
+    if args.stage or args.oii:
+        include_dir = "gradergen"
+        if not os.path.isdir(os.path.join(base_dir, "att/")):
+            raise IOError("Please create the folder att/.")
+    
+    # Searching for include_grader and include_callable
+    if include_dir is None:
+        include_dir = os.path.dirname(task_spec_path)
+    else:
+        include_dir = os.path.join(base_dir, include_dir)
+
+    written_files = [(grader_name, template_name) for lang, grader_name, template_name in chosen_languages]
+    if args.validator is not None:
+        validator_name = os.path.join(base_dir, args.validator)
+        written_files.append((validator_name,))
+    if args.checker is not None:
+        checker_name = os.path.join(base_dir, args.checker)
+        written_files.append((checker_name,))
+    manifest_path = os.path.join(os.path.dirname(task_spec_path), MANIFEST_FILE)
+    digest = compute_task_digest(task_spec_path, task_yaml_path, include_dir, chosen_languages, args)
+    manifest = read_manifest(manifest_path)
+    if not args.force and manifest is not None and manifest.get("digest") == digest \
+            and all(os.path.isfile(name) for pair in written_files for name in pair):
+        return written_files, True
+
+    include_grader = read_include_files(include_dir, "include_grader", chosen_languages)
+    include_callable = read_include_files(include_dir, "include_callable", chosen_languages)
+
+    # Parsing specication file (task.spec)
+    with open(task_spec_path, "r") as task_spec:
+        lines = task_spec.read().splitlines()
+    # When only the validator or the checker are generated the prototypes do
+    # not matter, so their location is not checked.
+    data_manager = parse_task_spec(lines, include_grader if chosen_languages else True, get_spec_parser())
+
+    parsed_data = data_manager.get_data()
+    check_memory_limit(parsed_data["variables"], task_info["memory_limit"])
+    futures = []
+    for lang, grader_name, template_name in chosen_languages:
         data = {
-            **data_manager.make_copy(),
-            "task_name": task_name,
-            "input_file": input_file,
-            "output_file": output_file,
+            **parsed_data,
+            **task_info,
+            "fast_io_runtime": args.fast_io_runtime,
+            "real_precision": args.real_precision,
+            "array_allocation": args.array_allocation,
+            "profile": args.profile,
+            "base_dir": base_dir,
         }
         if lang in include_grader:
             data["include_grader"] = include_grader[lang]
         if lang in include_callable:
             data["include_callable"] = include_callable[lang]
 
-        LangClass, fast_io = CLASSES_LIST[lang]
-        LangClass(fast_io, data).write_files(grader_name, template_name)
+        if executor is None:
+            generate_language(lang, grader_name, template_name, data)
+        else:
+            futures.append(executor.submit(generate_language, lang, grader_name, template_name, data))
+
+    if args.validator is not None:
+        from gradergen.languages.validator import ValidatorC
+        ValidatorC({
+            **parsed_data,
+            "fast_io_runtime": args.fast_io_runtime,
+        }).write_files(validator_name)
+
+    if args.checker is not None:
+        from gradergen.languages.checker import CheckerCPP
+        CheckerCPP({
+            **parsed_data,
+            "absolute_tolerance": args.absolute_tolerance,
+            "relative_tolerance": args.relative_tolerance,
+        }).write_files(checker_name)
+
+    # The first error (in the order of the languages) is the one raised,
+    # whatever the order in which they are generated.
+    for future in futures:
+        future.result()
+
+    with open(manifest_path, "w") as f:
+        json.dump({"digest": digest, "files": written_files}, f, indent=4)
+
+    return written_files, False
+
+# Generates a task inside a worker process, the error (if any) is returned
+# already formatted, as the exception might not survive the trip back.
+# Returns the pair (error, up_to_date).
+def generate_task_job(task_dir, args):
+    try:
+        written_files, up_to_date = generate_task(
+            os.path.join(task_dir, DESCRIPTION_FILE),
+            os.path.join(task_dir, TASK_YAML),
+            args.include_dir, args, task_dir)
+    except Exception as e:
+        if args.debug:
+            return traceback.format_exc(), False
+        return "{0}: {1}".format(type(e).__name__, e), False
+    return None, up_to_date
+
+# Generates graders and templates of all the tasks found inside root, reporting
+# the outcome of each of them. Returns the number of tasks that failed.
+# The report is in the order of find_tasks, whatever the number of jobs.
+def generate_all_tasks(root, args):
+    tasks = find_tasks(root)
+
+    if args.jobs > 1:
+        import concurrent.futures # to generate the tasks in parallel
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs)
+        results = [executor.submit(generate_task_job, task_dir, args) for task_dir in tasks]
+        results = map(concurrent.futures.Future.result, results)
+    else:
+        executor = None
+        results = (generate_task_job(task_dir, args) for task_dir in tasks)
+
+    failed = 0
+    skipped = 0
+    for task_dir, (error, up_to_date) in zip(tasks, results):
+        if error is not None:
+            failed += 1
+            print("{0}: FAILED".format(task_dir))
+            print("    " + error.rstrip("\n").replace("\n", "\n    "))
+        elif up_to_date:
+            skipped += 1
+            print("{0}: UP TO DATE".format(task_dir))
+        else:
+            print("{0}: OK".format(task_dir))
+
+    if executor is not None:
+        executor.shutdown()
+
+    print("{0} tasks found, {1} generated, {2} up to date, {3} failed."
+              .format(len(tasks), len(tasks) - failed - skipped, skipped, failed))
+    return failed
+
+def hide_backtrace():
+    def NoBacktraceExpectionHandler(exception_type, exception, traceback):
+        print("{0}: {1}".format(exception_type.__name__, exception),
+              file=sys.stderr)
+    sys.excepthook = NoBacktraceExpectionHandler
+
+# gradergen convert: converts an input file between text and the binary format
+# read by the binary graders, following the input section of task.spec.
+# The file is streamed, so it can be larger than the memory.
+def convert_main(argv):
+    parser = argparse.ArgumentParser(
+        prog = "gradergen convert",
+        description = "Convert an input file between text and the binary "
+                      "format read by the binary graders"
+    )
+    parser.add_argument(\
+        "--task_spec",
+        metavar = "task_spec", action = "store", nargs = "?",
+        help = "the file describing the grader"
+    )
+    parser.add_argument(\
+        "--to",
+        choices = ["binary", "text"], default = "binary",
+        help = "the format of the converted file (default: binary)"
+    )
+    parser.add_argument(\
+        "--debug",
+        action = "store_true", default = False,
+        help = "whether to show the backtrace when an exception is raised"
+    )
+    parser.add_argument("input", help = "the file to convert, - for stdin")
+    parser.add_argument("output", help = "the converted file, - for stdout")
+    args = parser.parse_args(argv)
+
+    if not args.debug:
+        hide_backtrace()
+
+    if args.task_spec is None:
+        args.task_spec = search_file(DESCRIPTION_FILE)
+
+    if args.task_spec is None:
+        raise FileNotFoundError("The {0} file cannot be found."
+                                    .format(DESCRIPTION_FILE))
+
+    with open(args.task_spec, "r") as task_spec:
+        lines = task_spec.read().splitlines()
+    # The prototypes do not matter, so their location is not checked
+    data = parse_task_spec(lines, True, get_spec_parser()).get_data()
+
+    from gradergen.binary_input import text_to_binary, binary_to_text
+    # Text is read and written as latin-1, so that any byte is kept as it is
+    text_in, text_out = ("r", "latin-1"), ("w", "latin-1")
+    binary_in, binary_out = ("rb", None), ("wb", None)
+    input_mode, output_mode = (text_in, binary_out) if args.to == "binary" else (binary_in, text_out)
+    with open_stream(args.input, *input_mode) as input_stream, \
+            open_stream(args.output, *output_mode) as output_stream:
+        if args.to == "binary":
+            text_to_binary(data, input_stream, output_stream)
+        else:
+            binary_to_text(data, input_stream, output_stream)
+
+# Opens a file, or stdin/stdout if the path is -, which is not closed.
+def open_stream(path, mode, encoding):
+    if path == "-":
+        stream = sys.stdin if "r" in mode else sys.stdout
+        return open(stream.fileno(), mode, encoding = encoding, closefd = False)
+    return open(path, mode, encoding = encoding)
+
+def main():
+    # gradergen convert [options] input output
+    if len(sys.argv) > 1 and sys.argv[1] == "convert":
+        convert_main(sys.argv[2:])
+        return
+
+    parser = argparse.ArgumentParser(description = "Automatically generate graders and templates in various languages")
+    parser.add_argument(\
+        "--task_spec",
+        metavar = "task_spec", action = "store", nargs = "?",
+        help = "the file describing the grader"
+    )
+    parser.add_argument(\
+        "--task_yaml",
+        metavar = "task_yaml", action = "store", nargs = "?",
+        help = "the yaml file describing the task"
+    )
+    parser.add_argument(\
+        "--include_dir",
+        metavar = "include_dir", action = "store", nargs="?",
+        help = "the folder containing include_callable and include_grader"
+    )
+    parser.add_argument(\
+        "-r", "--recursive",
+        metavar = "root",
+        help = "generate graders and templates for all the tasks (folders "
+               "containing both task.spec and task.yaml) inside root; paths "
+               "are relative to each task folder"
+    )
+    parser.add_argument(\
+        "-j", "--jobs",
+        metavar = "N", type = int, default = 1,
+        help = "number of processes generating tasks (with --recursive) or "
+               "languages in parallel (default: 1)"
+    )
+    parser.add_argument(\
+        "--fast_io_runtime",
+        choices = FAST_IO_RUNTIMES, default = "unlocked",
+        help = "how fast C/C++ graders access the input and the output: "
+               "'unlocked' reads and writes one char at a time through stdio, "
+               "'buffered' reads the input in large blocks (mapping it in "
+               "memory when it is a regular file) and buffers the output"
+    )
+    parser.add_argument(\
+        "--array_allocation",
+        choices = ARRAY_ALLOCATIONS, default = "rows",
+        help = "how C/C++ graders allocate multidimensional arrays: 'rows' "
+               "allocates each row separately, 'contiguous' allocates all the "
+               "data in a single block (plus a table of pointers for each "
+               "dimension)"
+    )
+    parser.add_argument(\
+        "--real_precision",
+        metavar = "digits", type = int, default = 6,
+        help = "number of decimal digits used when writing real numbers "
+               "(default: 6)"
+    )
+    parser.add_argument(\
+        "--profile",
+        action = "store_true", default = False,
+        help = "add to the graders timers of reading the input, of the calls "
+               "and of writing the output, printed to stderr when the grader "
+               "is compiled with GRADERGEN_PROFILE defined"
+    )
+    parser.add_argument(\
+        "--validator",
+        metavar = "filename", nargs = "?", const = "validator.c",
+        help = "generate also a C program checking that an input file follows "
+               "exactly the input section (default name: validator.c)"
+    )
+    parser.add_argument(\
+        "--checker",
+        metavar = "filename", nargs = "?", const = "checker.cpp",
+        help = "generate also a C++ checker comparing the output of a "
+               "contestant with the correct one, value by value as described "
+               "by the output section (default name: checker.cpp)"
+    )
+    parser.add_argument(\
+        "--absolute_tolerance",
+        metavar = "tolerance", type = float, default = 1e-6,
+        help = "absolute error allowed by the checker on real numbers "
+               "(default: 1e-6)"
+    )
+    parser.add_argument(\
+        "--relative_tolerance",
+        metavar = "tolerance", type = float, default = 1e-6,
+        help = "relative error allowed by the checker on real numbers "
+               "(default: 1e-6)"
+    )
+    parser.add_argument(\
+        "-f", "--force",
+        action = "store_true", default = False,
+        help = "generate graders and templates even if nothing changed since "
+               "the last time they were generated"
+    )
+    parser.add_argument(\
+        "--debug",
+        action = "store_true", default = False,
+        help = "whether to show the backtrace when an exception is raised"
+    )
+
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument(\
+        "-l", "--lang",
+        nargs = "+",
+        metavar = ("lang", "filename"),
+        dest = "languages",
+        action = "append",
+        help = "programming language, grader and template"
+    )
+    group.add_argument(\
+        "-a", "--all",
+        action = "store_true",
+        default = False,
+        help = "create graders and templates in all supported languages (with standard names)"
+    )
+    group.add_argument(\
+        "--oii",
+        action = "store_true",
+        default = False,
+        help = "create graders and templates in all supported languages following "
+               "oii's standard (sol/ and att/)"
+    )
+    group.add_argument(\
+        "--stage",
+        nargs = "?",
+        metavar = "IO_type",
+        const = "normal",
+        default = False,
+        help = "create graders and templates in C++ following stages' standard "
+               "(sol/ and att/), IO_type (can be 'normal' or 'fast') decides "
+               "whether graders in sol/ must have fastIO or not"
+    )
+
+    args = parser.parse_args()
+
+    # Hiding backtrace if --debug is not set
+    if not args.debug:
+        hide_backtrace()
+    
+    if not (args.languages or args.all or args.oii or args.stage or args.validator or args.checker):
+        parser.error("one of the arguments -l/--lang -a/--all --oii --stage "
+                     "--validator --checker is required")
+
+    if args.real_precision < 0:
+        raise ValueError("The argument of --real_precision must be non-negative.")
+
+    if args.absolute_tolerance < 0 or args.relative_tolerance < 0:
+        raise ValueError("The tolerances of the checker must be non-negative.")
+
+    if args.jobs < 1:
+        raise ValueError("The argument of --jobs must be positive.")
+
+    if args.recursive is not None:
+        if args.task_spec is not None or args.task_yaml is not None:
+            raise ValueError("--task_spec and --task_yaml cannot be used "
+                             "together with --recursive.")
+        if generate_all_tasks(args.recursive, args) > 0:
+            sys.exit(1)
+        return
+
+    if args.task_spec is None:
+        args.task_spec = search_file(DESCRIPTION_FILE)
+
+    if args.task_spec is None:
+        raise FileNotFoundError("The {0} file cannot be found."
+                                    .format(DESCRIPTION_FILE))
+
+    if args.task_yaml is None:
+        args.task_yaml = search_file(TASK_YAML)
+
+    if args.task_yaml is None:
+        raise FileNotFoundError("The {0} file cannot be found."
+                                    .format(TASK_YAML))
+
+    if args.jobs > 1:
+        import concurrent.futures # to generate the languages in parallel
+        with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            written_files, up_to_date = generate_task(args.task_spec, args.task_yaml, args.include_dir, args, executor=executor)
+    else:
+        written_files, up_to_date = generate_task(args.task_spec, args.task_yaml, args.include_dir, args)
+    if up_to_date:
+        print("Nothing to do, graders and templates are up to date (use --force to regenerate them).")
+    for files in written_files:
+        print(*files)
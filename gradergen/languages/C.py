@@ -1,20 +1,29 @@
-import pkg_resources
 from os import unlink
 from gradergen import structures
-from gradergen.structures import PrimitiveType, Location, Variable, Array, Parameter, Prototype, Call, IOVariables, IOArrays, Expression
+from gradergen.structures import PrimitiveType, Location, Variable, Array, Parameter, Prototype, Call, IOVariables, IOArrays, Expression, checked_bounds
+from gradergen.languages import read_runtime_file
+from gradergen.languages.emitter import Emitter
 
 
 class LanguageC(object):
     def __init__(self, fast_io, data):
         self.data = data
 
-        self.grader = ""
-        self.template = ""
+        self.grader = Emitter()
+        self.template = Emitter()
         if fast_io == 1:
             self.fast_io = True
         else:
             self.fast_io = False
 
+        # fast_io == 2 means that the input is binary (see doc/binary_input.md)
+        # and the output is written with fast I/O.
+        if fast_io == 2:
+            self.fast_io = True
+            self.binary_input = True
+        else:
+            self.binary_input = False
+
     extension = "c"
 
     types_names = {
@@ -33,6 +42,10 @@ class LanguageC(object):
         PrimitiveType.REAL: '123.456'
     }
 
+    # Arrays whose sizes are bounded by the bounds of the variables are
+    # static, at their maximum size, only up to this many bytes in total.
+    static_bounded_limit = 1 << 26
+
     stdio_types = {
         PrimitiveType.INT: 'd', 
         PrimitiveType.LONGINT: 'lld', 
@@ -59,8 +72,62 @@ int main() {
 
     fclose(fr);
     fclose(fw);
+"""
+    footers_fast_io = """\
+
+    fast_write_flush();
+    fclose(fr);
+    fclose(fw);
+"""
+    main_end = """\
     return 0;
 }
+"""
+
+    # Timers of the phases of the grader and of each call, they are printed
+    # to stderr and compiled only if GRADERGEN_PROFILE is defined.
+    profile_headers = """\
+
+#ifdef GRADERGEN_PROFILE
+#include <time.h>
+
+static double gradergen_clock() {
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return now.tv_sec + now.tv_nsec * 1e-9;
+}
+
+#define GRADERGEN_START(timer) double timer = gradergen_clock()
+#define GRADERGEN_STOP(timer, phase) fprintf(stderr, "%s: %.6f s\\n", phase, gradergen_clock() - timer)
+#else
+#define GRADERGEN_START(timer)
+#define GRADERGEN_STOP(timer, phase)
+#endif
+"""
+
+    # Reads a row of a string array of the input at once, emitted only when
+    # it is needed (the fast input has fast_read_string). The row must not
+    # contain whitespaces and must be followed by one, or by the end of the
+    # input, otherwise it is shorter or longer than len.
+    read_string_headers = """\
+
+static int gradergen_is_space(int c) {
+    return c == ' ' || (0x09 <= c && c <= 0x0d);
+}
+
+static void gradergen_read_string(char* row, size_t len) {
+    if (len == 0) return;
+    fscanf(fr, " ");
+    size_t done = fread(row, 1, len, fr);
+    int next = fgetc(fr);
+    for (size_t i = 0; i < done; i++) {
+        if (gradergen_is_space((unsigned char)row[i])) done = i;
+    }
+    if (done != len || (next != EOF && !gradergen_is_space(next))) {
+        fprintf(stderr, "A string of the input is not made of %zu chars.\\n", len);
+        exit(1);
+    }
+}
 """
 
     byref_symbol = "* "
@@ -93,19 +160,76 @@ int main() {
     def at(self, type, dim):
         return self.types_names[type] + "*"*dim
 
+    # printf format used to write a value of the given type
+    def output_format(self, type):
+        if type == PrimitiveType.REAL:
+            return "%.{0}lf".format(self.data["real_precision"])
+        return "%" + self.stdio_types[type]
+
     # write line
     def write_line(self, line = "", tabulation = 0):
-        self.grader += "\t"*tabulation + line + "\n"
+        self.grader.write_line(line, tabulation)
+
+    # start and stop a timer (see profile_headers)
+    def start_timer(self, timer):
+        self.write_line("GRADERGEN_START(gradergen_{0});".format(timer), 1)
+
+    def stop_timer(self, timer, phase):
+        self.write_line("GRADERGEN_STOP(gradergen_{0}, \"{1}\");".format(timer, phase), 1)
 
     # write comment
     def write_comment(self, short_description, tabulation = 0):
         if len(self.comments[short_description]) > 0:
-            self.grader += "\n" + ("\t"*tabulation) + "// " + self.comments[short_description] +"\n"
+            self.grader.write("\n" + ("\t"*tabulation) + "// " + self.comments[short_description] +"\n")
 
     def declare_variable(self, var):
         self.write_line("static {0} {1};".format(self.types_names[var.type], var.name))
 
+    # An array whose sizes are all constant has static storage: the data is a
+    # single block and so is each level of pointers below the first one (see
+    # link_static_array). The array itself is the first level, which decays
+    # to the type of the parameters. The arrays of a binary input point inside
+    # it, so they are not static.
+    # So is an array whose sizes are bounded (see Array.maximum_sizes), with
+    # its maximum sizes, if it is among the bounded_arrays: its first level is
+    # gradergen_A_level0 and the array is a pointer to it, or to a block
+    # allocated as usual when a size exceeds its bound (the bounds are checked
+    # by asserts, which -DNDEBUG removes).
+    # Returns the sizes of the static array, None if it is not static.
+    def static_sizes(self, arr):
+        sizes = arr.maximum_sizes()
+        if sizes is None or min(sizes) <= 0 or arr.name in self.binary_arrays:
+            return None
+        if any(size.var is not None for size in arr.sizes) and arr.name not in self.bounded_arrays:
+            return None
+        return sizes
+
+    # The names of the arrays with bounded sizes that are static: they are
+    # taken in the order of declaration while they fit, all together, in
+    # static_bounded_limit bytes.
+    def choose_bounded_arrays(self):
+        self.bounded_arrays = set()
+        available = self.static_bounded_limit
+        for arr in self.data["variables"]:
+            if type(arr) != Array or arr.name in self.binary_arrays or all(size.var is None for size in arr.sizes):
+                continue
+            sizes = arr.maximum_sizes()
+            if sizes is not None and min(sizes) > 0 and arr.maximum_bytes() <= available:
+                self.bounded_arrays.add(arr.name)
+                available -= arr.maximum_bytes()
+
     def declare_array(self, arr):
+        sizes = self.static_sizes(arr)
+        if sizes is not None:
+            bounded = arr.name in self.bounded_arrays
+            count = 1
+            for i, size in enumerate(sizes):
+                count *= size
+                if i > 0 or bounded:
+                    self.write_line("static {0} gradergen_{1}_level{2}[{3}];".format(self.at(arr.type, arr.dim-i-1), arr.name, i, count))
+            if not bounded:
+                self.write_line("static {0} {1}[{2}];".format(self.at(arr.type, arr.dim-1), arr.name, sizes[0]))
+                return
         self.write_line("static {0} {1};".format(self.at(arr.type, arr.dim), arr.name) )
 
     def declare_prototype(self, fun):
@@ -114,6 +238,25 @@ int main() {
         self.write_line("{0} {1}({2});".format(self.types_names[fun.type], fun.name, printed_parameters))
 
     def allocate_array(self, arr):
+        if self.static_sizes(arr) is not None:
+            if arr.name not in self.bounded_arrays:
+                self.link_static_array(arr, 1)
+                return
+            fits = " && ".join("{0} <= {1}".format(size.to_string(), maximum) for size, maximum in zip(arr.sizes, self.static_sizes(arr)) if size.var is not None)
+            self.write_line("if ({0}) {{".format(fits), 1)
+            self.write_line("{0} = gradergen_{0}_level0;".format(arr.name), 2)
+            self.link_static_array(arr, 2)
+            self.write_line("} else {", 1)
+            self.allocate_contiguous_array(arr, tabulation = 2)
+            self.write_line("}", 1)
+            return
+        # When only the first size is not constant the rows have a fixed size,
+        # so they are allocated together.
+        constant_rows = all(size.var is None for size in arr.sizes[1:])
+        if (self.data["array_allocation"] == "contiguous" or constant_rows) and arr.dim > 1:
+            self.allocate_contiguous_array(arr)
+            return
+
         for i in range(arr.dim):
             if i != 0:
                 self.write_line("for (int {0} = 0; {0} < {1}; {0}++) {{".format("i" + str(i-1), arr.sizes[i-1].to_string()), i)
@@ -124,6 +267,63 @@ int main() {
         for i in range(arr.dim - 1):
             self.write_line("}", arr.dim - i - 1)
 
+    # The whole data is allocated in a single block, and so is each level of
+    # pointers. The levels are built from the bottom: the pointers of a level
+    # point, at fixed distance, inside the level below.
+    # If data_source is given, the data is not allocated but taken from it,
+    # being a function returning a pointer given the alignment and the size.
+    def allocate_contiguous_array(self, arr, data_source = None, tabulation = 1):
+        self.write_line("{", tabulation)
+        below = None
+        for i in reversed(range(arr.dim)):
+            count = " * ".join("({0})".format(size.to_string()) for size in arr.sizes[:i+1])
+            count = "(size_t)" + count
+            level = arr.name if i == 0 else "level" + str(i)
+            declaration = "" if i == 0 else self.at(arr.type, arr.dim-i) + " "
+            if data_source is not None and i == arr.dim - 1:
+                self.write_line("{0}{1} = ({2}*){3}(sizeof({2}), {4} * sizeof({2}));".format(declaration, level, self.at(arr.type, 0), data_source, count), tabulation+1)
+            else:
+                self.write_line("{0}{1} = ({2}*)malloc({3} * sizeof({2}));".format(declaration, level, self.at(arr.type, arr.dim-i-1), count), tabulation+1)
+            if below is not None:
+                self.write_line("for (size_t i0 = 0; i0 < {0}; i0++) {1}[i0] = {2} + i0 * ({3});".format(count, level, below, arr.sizes[i+1].to_string()), tabulation+1)
+            below = level
+        self.write_line("}", tabulation)
+
+    # The pointers of each level of a static array point, at fixed distance,
+    # inside the level below.
+    def link_static_array(self, arr, tabulation):
+        sizes = self.static_sizes(arr)
+        count = 1
+        for i in range(arr.dim - 1):
+            count *= sizes[i]
+            level = arr.name if i == 0 else "gradergen_{0}_level{1}".format(arr.name, i)
+            self.write_line("for (size_t i0 = 0; i0 < {0}; i0++) {1}[i0] = gradergen_{2}_level{3} + i0 * {4};".format(count, level, arr.name, i+1, sizes[i+1]), tabulation)
+
+    # The bounds given in task.spec are checked with assert, so that the
+    # checks are compiled out with -DNDEBUG.
+    def check_bounds(self, var, value, tabulation):
+        bound_min, bound_max = checked_bounds(var)
+        suffix = "LL" if var.type == PrimitiveType.LONGINT else ""
+        conditions = []
+        if bound_min is not None:
+            conditions.append("{0}{1} <= {2}".format(bound_min, suffix, value))
+        if bound_max is not None:
+            conditions.append("{0} <= {1}{2}".format(value, bound_max, suffix))
+        if conditions:
+            self.write_line("assert({0});".format(" && ".join(conditions)), tabulation)
+
+    # In the binary input the data of an array is contiguous, so it is not
+    # copied: the array points inside the input (only the levels of pointers
+    # of a multidimensional array are allocated).
+    def read_binary_array(self, arr):
+        self.allocate_contiguous_array(arr, "binary_read")
+        if checked_bounds(arr) != (None, None):
+            for i in range(arr.dim):
+                self.write_line("for (int {0} = 0; {0} < {1}; {0}++) {{".format("i" + str(i), arr.sizes[i].to_string()), i+1)
+            self.check_bounds(arr, arr.name + "".join("[i" + str(x) + "]" for x in range(arr.dim)), arr.dim+1)
+            for i in range(arr.dim):
+                self.write_line("}", arr.dim - i)
+
     def read_arrays(self, all_arrs):
         all_dim = all_arrs[0].dim
         all_sizes = all_arrs[0].sizes
@@ -139,12 +339,31 @@ int main() {
             pointers = ", ".join("&" + arr.name + indexes for arr in all_arrs)
             # The space after the format_string is used to ignore all whitespaces
             self.write_line("fscanf(fr, \" {0}\", {1});".format(format_string, pointers), all_dim+1)
+        for arr in all_arrs:
+            self.check_bounds(arr, arr.name + indexes, all_dim+1)
 
         for i in range(all_dim):
             self.write_line("}", all_dim - i)
 
-    def read_variables(self, all_vars):
+    def read_string_array(self, arr):
+        dim = arr.dim
+        for i in range(dim - 1):
+            self.write_line("for (int {0} = 0; {0} < {1}; {0}++) {{".format("i" + str(i), arr.sizes[i].to_string()), i+1)
+
+        row = arr.name + "".join("[i" + str(x) + "]" for x in range(dim - 1))
         if self.fast_io:
+            self.write_line("fast_read_string({0}, {1});".format(row, arr.sizes[-1].to_string()), dim)
+        else:
+            self.write_line("gradergen_read_string({0}, {1});".format(row, arr.sizes[-1].to_string()), dim)
+
+        for i in range(dim - 1):
+            self.write_line("}", dim - i - 1)
+
+    def read_variables(self, all_vars):
+        if self.binary_input:
+            for var in all_vars:
+                self.write_line("{0} = binary_read_{1}();".format(var.name, var.type.value), 1)
+        elif self.fast_io:
             for var in all_vars:
                 self.write_line("{0} = fast_read_{1}();".format(var.name, var.type.value), 1)
         else:
@@ -152,15 +371,25 @@ int main() {
             pointers = ", ".join("&" + var.name for var in all_vars)
             # The space after the format_string is used to ignore all whitespaces
             self.write_line("fscanf(fr, \" {0}\", {1});".format(format_string, pointers), 1)
+        for var in all_vars:
+            self.check_bounds(var, var.name, 1)
 
     def call_function(self, fun):
-        parameter_names = [(self.byref_call if (by_ref and type(var) is not Array) else "") + var.name for (var, by_ref) in fun.parameters]
+        parameter_names = [(self.byref_call if (by_ref and structures.dimension(var) == 0) else "") + var.name for (var, by_ref) in fun.parameters]
         parameters = ', '.join(parameter_names)
 
+        # A repeated call is nested in a loop for each repetition
+        depth = len(fun.loops)
+        for i in range(depth):
+            self.write_line("for (int {0} = 0; {0} < {1}; {0}++) {{".format("i" + str(i), fun.loops[i].to_string()), i+1)
+
         if fun.return_var is None:
-            self.write_line("{0}({1});".format(fun.name, parameters), 1)
+            self.write_line("{0}({1});".format(fun.name, parameters), depth+1)
         else:
-            self.write_line("{2} = {0}({1});".format(fun.name, parameters, fun.return_var.name), 1)
+            self.write_line("{2} = {0}({1});".format(fun.name, parameters, fun.return_var.name), depth+1)
+
+        for i in range(depth):
+            self.write_line("}", depth - i)
 
     def write_single_array(self, arr):
         dim = arr.dim
@@ -176,7 +405,7 @@ int main() {
             self.write_line("}", dim)
             self.write_line("fast_write_char('\\n');", dim)
         else:
-            format_string = "%" + self.stdio_types[arr.type]
+            format_string = self.output_format(arr.type)
             antipointers = arr.name + indexes
             if arr.type != PrimitiveType.CHAR:
                 self.write_line("fprintf(fw, \"{0} \", {1});".format(format_string, antipointers), dim+1)
@@ -188,6 +417,22 @@ int main() {
         for i in range(1, dim):
             self.write_line("}", dim - i)
         
+    def write_string_array(self, arr):
+        dim = arr.dim
+        for i in range(dim - 1):
+            self.write_line("for (int {0} = 0; {0} < {1}; {0}++) {{".format("i" + str(i), arr.sizes[i].to_string()), i+1)
+
+        row = arr.name + "".join("[i" + str(x) + "]" for x in range(dim - 1))
+        if self.fast_io:
+            self.write_line("fast_write_string({0}, {1});".format(row, arr.sizes[-1].to_string()), dim)
+            self.write_line("fast_write_char('\\n');", dim)
+        else:
+            self.write_line("fwrite({0}, 1, {1}, fw);".format(row, arr.sizes[-1].to_string()), dim)
+            self.write_line("fprintf(fw, \"\\n\");", dim)
+
+        for i in range(dim - 1):
+            self.write_line("}", dim - i - 1)
+
     def write_many_arrays(self, all_arrs):
         all_dim = all_arrs[0].dim
         all_sizes = all_arrs[0].sizes
@@ -203,7 +448,7 @@ int main() {
                     self.write_line("fast_write_char(' ');", all_dim + 1)
             self.write_line("fast_write_char('\\n');", all_dim + 1)
         else:
-            format_string = " ".join("%" + self.stdio_types[arr.type] for arr in all_arrs)
+            format_string = " ".join(self.output_format(arr.type) for arr in all_arrs)
             antipointers = ", ".join(arr.name + indexes for arr in all_arrs)
             self.write_line("fprintf(fw, \"{0}\\n\", {1});".format(format_string, antipointers), all_dim+1)
 
@@ -218,36 +463,57 @@ int main() {
                     self.write_line("fast_write_char(' ');", 1)
             self.write_line("fast_write_char('\\n');", 1)
         else:
-            format_string = " ".join("%" + self.stdio_types[var.type] for var in all_vars)
+            format_string = " ".join(self.output_format(var.type) for var in all_vars)
             antipointers = ", ".join(var.name for var in all_vars)
             self.write_line("fprintf(fw, \"{0}\\n\", {1});".format(format_string, antipointers), 1)
 
     def insert_headers(self):
-        self.grader += self.headers
+        self.grader.write(self.headers)
+        if self.data["profile"]:
+            self.grader.write(self.profile_headers)
+        if not self.fast_io and not self.binary_input and any(type(line) == IOArrays and line.as_string for line in self.data["input"]):
+            self.grader.write(self.read_string_headers)
 
     def insert_main(self):
         if self.fast_io:
-            fast_io_file = open(pkg_resources.resource_filename("gradergen.languages", "fast_io." + self.extension), "r")
-            self.grader += "\n" + fast_io_file.read()
-            fast_io_file.close()
-
-        self.grader += self.main_function % {
-            "input": "fr = stdin;" if self.data["input_file"] == "" else "fr = fopen(\"" + self.data["input_file"] + "\", \"r\");",
+            # The I/O primitives (how chars are fetched and flushed) depend on
+            # the chosen runtime, the parsing functions are shared.
+            runtime_name = "fast_io_" + self.data["fast_io_runtime"] + "." + self.extension
+            self.grader.write("\n#define FAST_REAL_PRECISION {0}\n".format(self.data["real_precision"]))
+            for file_name in [runtime_name, "fast_io." + self.extension]:
+                self.grader.write("\n" + read_runtime_file(file_name))
+        if self.binary_input:
+            self.grader.write("\n" + read_runtime_file("binary_input." + self.extension))
+
+        self.grader.write(self.main_function % {
+            "input": "fr = stdin;" if self.data["input_file"] == "" else "fr = fopen(\"" + self.data["input_file"] + "\", \"" + ("rb" if self.binary_input else "r") + "\");",
             "output": "fw = stdout;" if self.data["output_file"] == "" else "fw = fopen(\"" + self.data["output_file"] + "\", \"w\");",
-        }
+        })
+        if self.binary_input:
+            self.write_line("binary_input_open();", 1)
 
     def insert_footers(self):
-        self.grader += self.footers
+        if self.fast_io:
+            self.grader.write(self.footers_fast_io)
+        else:
+            self.grader.write(self.footers)
 
     def write_files(self, grader_name, template_name):
         self.write_grader()
-        self.write(grader_name, self.grader)
+        self.write(grader_name, self.grader.getvalue())
 
         self.write_template()
-        self.write(template_name, self.template)
+        self.write(template_name, self.template.getvalue())
 
     def write_grader(self):
-        self.grader = ""
+        self.grader = Emitter()
+        # Names of the arrays already allocated.
+        self.allocated = set()
+        # Names of the arrays read from a binary input.
+        self.binary_arrays = set()
+        if self.binary_input:
+            self.binary_arrays = set(arr.name for input_line in self.data["input"] if type(input_line) == IOArrays for arr in input_line.arrays)
+        self.choose_bounded_arrays()
         self.insert_headers()
 
         self.write_comment("dec_var")
@@ -263,66 +529,105 @@ int main() {
 
         if "include_grader" in self.data:
             self.write_comment("include_grader")
-            self.grader += self.data["include_grader"]
+            self.grader.write(self.data["include_grader"])
             self.write_line()
 
         if "include_callable" in self.data:
             self.write_comment("include_callable")
-            self.grader += self.data["include_callable"]
+            self.grader.write(self.data["include_callable"])
 
         self.insert_main()
         self.write_comment("input", 1)
+        if self.data["profile"]:
+            self.start_timer("input")
         for input_line in self.data["input"]:
-            if type(input_line) == IOArrays:
+            if type(input_line) == IOArrays and self.binary_input:
+                for arr in input_line.arrays:
+                    self.read_binary_array(arr)
+                    self.allocated.add(arr.name)
+
+            elif type(input_line) == IOArrays:
                 for arr in input_line.arrays:
                     self.allocate_array(arr)
-                    arr.allocated = True
-                self.read_arrays(input_line.arrays)
+                    self.allocated.add(arr.name)
+                if input_line.as_string:
+                    self.read_string_array(input_line.arrays[0])
+                else:
+                    self.read_arrays(input_line.arrays)
 
             elif type(input_line) == IOVariables:
                 self.read_variables(input_line.variables)
 
+        if self.data["profile"]:
+            self.stop_timer("input", self.comments["input"])
+
         self.write_comment("call_fun", 1)
-        for fun in self.data["calls"]:
-            for (var, by_ref) in fun.parameters:
-                if type(var) == Array and not var.allocated:
-                    self.allocate_array(var)
-                    var.allocated = True
+        if self.data["profile"]:
+            self.start_timer("calls")
+        for call_number, fun in enumerate(self.data["calls"]):
+            for var in [var for (var, by_ref) in fun.parameters] + [fun.return_var]:
+                arr = structures.base_variable(var)
+                if type(arr) == Array and arr.name not in self.allocated:
+                    self.allocate_array(arr)
+                    self.allocated.add(arr.name)
 
+            if self.data["profile"]:
+                self.start_timer("call" + str(call_number))
             self.call_function(fun)
+            if self.data["profile"]:
+                self.stop_timer("call" + str(call_number), "Call {0} ({1})".format(call_number + 1, fun.name))
+        if self.data["profile"]:
+            self.stop_timer("calls", self.comments["call_fun"])
 
         self.write_comment("output", 1)
+        if self.data["profile"]:
+            self.start_timer("output")
         for output_line in self.data["output"]:
             if type(output_line) == IOArrays:
-                if len(output_line.arrays) > 1:
+                if output_line.as_string:
+                    self.write_string_array(output_line.arrays[0])
+                elif len(output_line.arrays) > 1:
                     self.write_many_arrays(output_line.arrays)
                 else:
                     self.write_single_array(output_line.arrays[0])
             elif type(output_line) == IOVariables:
                 self.write_variables(output_line.variables)
 
+        # The output is timed until it is flushed and the files are closed
         self.insert_footers()
+        if self.data["profile"]:
+            self.stop_timer("output", self.comments["output"])
+        self.grader.write(self.main_end)
 
     def write_template(self):
+        self.template = Emitter()
         for fun in self.data["prototypes"]:
             if fun.location == Location.GRADER: # Skipping prototypes defined in include_grader
                 continue
             printed_parameters = self.print_parameters(fun.parameters)
-            self.template += "{0} {1}({2}) {{\n".format(self.types_names[fun.type], fun.name, printed_parameters)
+            self.template.write("{0} {1}({2}) {{\n".format(self.types_names[fun.type], fun.name, printed_parameters))
 
             # Variables passed by ref are filled
             for param in fun.parameters:
                 if param.by_ref:
                     if param.dim == 0:
-                        self.template += "\t{0}{1} = {2};\n".format(self.byref_access, param.name, self.template_values[param.type])
+                        self.template.write("\t{0}{1} = {2};\n".format(self.byref_access, param.name, self.template_values[param.type]))
                     else:
-                        self.template += "\t{0}{1} = {2};\n".format(param.name, "[0]"*param.dim, self.template_values[param.type])
-            self.template += "\treturn {0};\n".format(self.template_values[fun.type])
+                        self.template.write("\t{0}{1} = {2};\n".format(param.name, "[0]"*param.dim, self.template_values[param.type]))
+            self.template.write("\treturn {0};\n".format(self.template_values[fun.type]))
 
-            self.template += "}\n\n"
+            self.template.write("}\n\n")
 
 
     def write(self, filename, source):
+        # An unchanged file is not rewritten, so that its mtime is kept
+        try:
+            with open(filename, "r") as f:
+                if f.read() == source:
+                    return
+        except (OSError, UnicodeDecodeError):
+            pass
+
         # Unlink is used to avoid following symlink
         try:
             unlink(filename)
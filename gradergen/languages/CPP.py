@@ -1,4 +1,3 @@
-import pkg_resources
 from os import unlink
 from gradergen import structures
 from gradergen.structures import PrimitiveType, Location, Variable, Array, Parameter, Prototype, Call, IOVariables, IOArrays, Expression
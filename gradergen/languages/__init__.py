@@ -0,0 +1,24 @@
+import functools
+
+# Files pasted by the language classes in the graders they generate.
+RUNTIME_FILES = [
+    "fast_io.c", "fast_io.cpp",
+    "fast_io_unlocked.c", "fast_io_unlocked.cpp",
+    "fast_io_buffered.c", "fast_io_buffered.cpp",
+    "binary_input.c", "binary_input.cpp",
+    "validator.c",
+    "checker.cpp",
+    "fast_input.pas", "fast_output.pas",
+    "fast_io.py",
+    "fast_io.java",
+]
+
+# Content of one of the RUNTIME_FILES, each file is read only once per
+# process. importlib.resources is imported only when it is needed, as it is
+# not needed at all to show the help or when the task is up to date.
+@functools.lru_cache(maxsize=None)
+def read_runtime_file(file_name):
+    import importlib.resources
+    if hasattr(importlib.resources, "files"):
+        return importlib.resources.files(__name__).joinpath(file_name).read_text()
+    return importlib.resources.read_text(__name__, file_name)
@@ -0,0 +1,83 @@
+// Begin binary input
+
+#include <stdint.h>
+#include <string.h>
+#if defined(__unix__) || defined(__APPLE__)
+#include <sys/mman.h>
+#include <sys/stat.h>
+#define BINARY_INPUT_MMAP
+#endif
+
+// The whole input, each value is aligned (from the beginning of the file) to
+// a multiple of its size.
+static char* binary_input;
+static size_t binary_input_size, binary_input_idx;
+
+// Maps the whole input file in memory, privately so that the arrays pointing
+// inside it can be modified. If that is not possible (pipe, terminal, ...)
+// the input is read in a buffer.
+static void binary_input_open() {
+	const uint16_t one = 1;
+	if (*(const unsigned char*)&one != 1) {
+		fprintf(stderr, "The binary input can be read only on little-endian machines.\n");
+		exit(1);
+	}
+#ifdef BINARY_INPUT_MMAP
+	struct stat st;
+	if (fstat(fileno(fr), &st) == 0 && S_ISREG(st.st_mode) && st.st_size > 0) {
+		void* map = mmap(NULL, st.st_size, PROT_READ | PROT_WRITE, MAP_PRIVATE, fileno(fr), 0);
+		if (map != MAP_FAILED) {
+			binary_input = (char*)map;
+			binary_input_size = st.st_size;
+			return;
+		}
+	}
+#endif
+	size_t capacity = 1 << 16;
+	size_t bytes_read;
+	binary_input = (char*)malloc(capacity);
+	while ((bytes_read = fread(binary_input + binary_input_size, 1, capacity - binary_input_size, fr)) > 0) {
+		binary_input_size += bytes_read;
+		if (binary_input_size == capacity) {
+			capacity *= 2;
+			binary_input = (char*)realloc(binary_input, capacity);
+		}
+	}
+}
+
+// Returns a pointer to the next len bytes of the input, aligned to a multiple
+// of align.
+static inline char* binary_read(size_t align, size_t len) {
+	binary_input_idx = (binary_input_idx + align - 1) / align * align;
+	if (binary_input_idx > binary_input_size || len > binary_input_size - binary_input_idx) {
+		fprintf(stderr, "The binary input is too short.\n");
+		exit(1);
+	}
+	char* res = binary_input + binary_input_idx;
+	binary_input_idx += len;
+	return res;
+}
+
+static inline int binary_read_int() {
+	int res;
+	memcpy(&res, binary_read(sizeof(res), sizeof(res)), sizeof(res));
+	return res;
+}
+
+static inline long long int binary_read_longint() {
+	long long int res;
+	memcpy(&res, binary_read(sizeof(res), sizeof(res)), sizeof(res));
+	return res;
+}
+
+static inline char binary_read_char() {
+	return *binary_read(1, 1);
+}
+
+static inline double binary_read_real() {
+	double res;
+	memcpy(&res, binary_read(sizeof(res), sizeof(res)), sizeof(res));
+	return res;
+}
+
+// End binary input
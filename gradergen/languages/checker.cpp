@@ -0,0 +1,205 @@
+// Begin checker library
+
+#include <cerrno>
+#include <cmath>
+#include <cstring>
+#include <initializer_list>
+
+// It relies on CHECKER_ABSOLUTE_TOLERANCE and CHECKER_RELATIVE_TOLERANCE
+// defined by the checker.
+// The outputs are compared token by token (the whitespaces only separate the
+// tokens), the chars of a row can be separated or not. Each file is read in
+// blocks, so the outputs are never loaded in memory. The outcome is written as
+// CMS expects from a checker: the score to stdout, the message to stderr.
+// All the functions are inline, so that those not used by a checker do not
+// give warnings.
+
+struct checker_stream {
+	FILE* file;
+	char buffer[1 << 16];
+	size_t pos, len;
+	long long line; // Line of the next char
+};
+
+static checker_stream checker_input, checker_correct, checker_contestant;
+
+// A token read, in a buffer that grows with it, so that long tokens are
+// compared whole.
+struct checker_token {
+	char* text;
+	size_t capacity;
+};
+
+// The last tokens read from the correct output and from the contestant's one.
+static checker_token checker_expected, checker_found;
+
+static inline void checker_open(checker_stream& s, const char* path) {
+	s.file = fopen(path, "rb");
+	if (s.file == NULL) {
+		perror(path);
+		exit(2);
+	}
+	s.pos = s.len = 0;
+	s.line = 1;
+}
+
+static inline int checker_next_char(checker_stream& s) {
+	if (s.pos == s.len) {
+		s.len = fread(s.buffer, 1, sizeof(s.buffer), s.file);
+		s.pos = 0;
+		if (s.len == 0) return EOF;
+	}
+	return (unsigned char)s.buffer[s.pos++];
+}
+
+static inline int checker_is_space(int c) {
+	return c == ' ' || (0x09 <= c && c <= 0x0d);
+}
+
+// The first char that is not a whitespace (EOF at the end of the file).
+static inline int checker_skip_spaces(checker_stream& s) {
+	int c = checker_next_char(s);
+	while (checker_is_space(c)) {
+		if (c == '\n') s.line++;
+		c = checker_next_char(s);
+	}
+	return c;
+}
+
+static inline void checker_token_set(checker_token& token, size_t len, int c) {
+	if (len + 1 >= token.capacity) {
+		token.capacity = token.capacity == 0 ? 256 : 2 * token.capacity;
+		token.text = (char*)realloc(token.text, token.capacity);
+		if (token.text == NULL) {
+			fprintf(stderr, "Out of memory\n");
+			exit(2);
+		}
+	}
+	token.text[len] = c;
+}
+
+// Reads the next token in token, returns the line where it begins. The token
+// is empty at the end of the file.
+static inline long long checker_read_token(checker_stream& s, checker_token& token) {
+	size_t len = 0;
+	int c = checker_skip_spaces(s);
+	long long line = s.line;
+	while (c != EOF && !checker_is_space(c)) {
+		checker_token_set(token, len++, c);
+		c = checker_next_char(s);
+	}
+	if (c == '\n') s.line++;
+	checker_token_set(token, len, '\0');
+	return line;
+}
+
+// Only the beginning of a long token is shown in the messages.
+static inline void checker_print_token(const checker_token& token) {
+	if (strlen(token.text) <= 100) fprintf(stderr, "%s", token.text);
+	else fprintf(stderr, "%.100s...", token.text);
+}
+
+// Zero points: the value name[indexes] (and [extra], if it is not negative)
+// at the given line of the contestant's output is wrong.
+static inline void checker_wrong(const char* name, std::initializer_list<long long> indexes, long long extra, long long line) {
+	printf("0.0\n");
+	fprintf(stderr, "Output isn't correct: line %lld, %s", line, name);
+	for (long long index : indexes) fprintf(stderr, "[%lld]", index);
+	if (extra >= 0) fprintf(stderr, "[%lld]", extra);
+	fprintf(stderr, ": expected ");
+	checker_print_token(checker_expected);
+	if (checker_found.text[0] == '\0') {
+		fprintf(stderr, ", found the end of the file\n");
+	} else {
+		fprintf(stderr, ", found ");
+		checker_print_token(checker_found);
+		fprintf(stderr, "\n");
+	}
+	exit(0);
+}
+
+static inline long long checker_read_tokens() {
+	checker_read_token(checker_correct, checker_expected);
+	return checker_read_token(checker_contestant, checker_found);
+}
+
+// The value of the correct output is returned, as it can be the size of an
+// array written later.
+static inline long long checker_check_integer(const char* name, std::initializer_list<long long> indexes) {
+	long long line = checker_read_tokens();
+	long long expected = strtoll(checker_expected.text, NULL, 10);
+	char* end;
+	errno = 0;
+	long long found = strtoll(checker_found.text, &end, 10);
+	if (checker_found.text[0] == '\0' || *end != '\0' || errno == ERANGE || found != expected) {
+		checker_wrong(name, indexes, -1, line);
+	}
+	return expected;
+}
+
+static inline void checker_check_real(const char* name, std::initializer_list<long long> indexes) {
+	long long line = checker_read_tokens();
+	// Most of the times the reals are written in the same way, so they are
+	// parsed only when they are different.
+	if (strcmp(checker_expected.text, checker_found.text) == 0 && checker_found.text[0] != '\0') return;
+	double expected = strtod(checker_expected.text, NULL);
+	char* end;
+	double found = strtod(checker_found.text, &end);
+	if (checker_found.text[0] == '\0' || *end != '\0') checker_wrong(name, indexes, -1, line);
+	double error = fabs(found - expected);
+	if (!(found == expected || error <= CHECKER_ABSOLUTE_TOLERANCE || error <= CHECKER_RELATIVE_TOLERANCE * fabs(expected))) {
+		checker_wrong(name, indexes, -1, line);
+	}
+}
+
+// The chars of a row of length len, name[indexes][extra] for each extra.
+static inline void checker_check_chars(const char* name, std::initializer_list<long long> indexes, long long len, bool row) {
+	for (long long i = 0; i < len; i++) {
+		int expected = checker_skip_spaces(checker_correct);
+		int found = checker_skip_spaces(checker_contestant);
+		if (found != expected) {
+			checker_token_set(checker_expected, 0, expected);
+			checker_token_set(checker_expected, 1, '\0');
+			checker_token_set(checker_found, 0, found == EOF ? '\0' : found);
+			checker_token_set(checker_found, 1, '\0');
+			checker_wrong(name, indexes, row ? i : -1, checker_contestant.line);
+		}
+	}
+}
+
+static inline void checker_check_char(const char* name, std::initializer_list<long long> indexes) {
+	checker_check_chars(name, indexes, 1, false);
+}
+
+static inline void checker_check_string(const char* name, std::initializer_list<long long> indexes, long long len) {
+	checker_check_chars(name, indexes, len, true);
+}
+
+// After the last value only whitespaces are allowed.
+static inline void checker_check_end() {
+	int c = checker_skip_spaces(checker_contestant);
+	if (c != EOF) {
+		printf("0.0\n");
+		fprintf(stderr, "Output isn't correct: line %lld, expected the end of the file\n", checker_contestant.line);
+		exit(0);
+	}
+	printf("1.0\n");
+	fprintf(stderr, "Output is correct\n");
+}
+
+// The input is only read as far as it is needed to know the sizes of the
+// arrays of the output, the other values are skipped.
+static inline long long checker_read_input_integer() {
+	checker_read_token(checker_input, checker_expected);
+	return strtoll(checker_expected.text, NULL, 10);
+}
+
+static inline void checker_skip_input_token() {
+	checker_read_token(checker_input, checker_expected);
+}
+
+static inline void checker_skip_input_chars(long long count) {
+	for (long long i = 0; i < count; i++) checker_skip_spaces(checker_input);
+}
+
+// End checker library
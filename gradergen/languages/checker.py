@@ -0,0 +1,174 @@
+from gradergen.structures import PrimitiveType, IOVariables, is_single_char
+from gradergen.languages import read_runtime_file
+from gradergen.languages.emitter import Emitter
+from gradergen.languages.CPP import LanguageCPP
+
+
+# A standalone C++ checker comparing the output of a contestant with the
+# correct one, following the output section of task.spec: the integers must
+# be equal, the reals equal up to the tolerances and the chars equal.
+# It is run as checker input correct_output contestant_output. The sizes of
+# the arrays are taken from the values written before them in the correct
+# output or, if they are not written, from the input.
+class CheckerCPP(LanguageCPP):
+    def __init__(self, data):
+        super().__init__(0, data)
+
+    headers = """\
+#include <cstdio>
+#include <cstdlib>
+"""
+
+    main_function = """\
+
+int main(int argc, char** argv) {
+	if (argc != 4) {
+		fprintf(stderr, "Usage: %s input correct_output contestant_output\\n", argv[0]);
+		return 2;
+	}
+	checker_open(checker_input, argv[1]);
+	checker_open(checker_correct, argv[2]);
+	checker_open(checker_contestant, argv[3]);
+"""
+
+    footers = """\
+
+	checker_check_end();
+"""
+
+    comments = {
+        "dec_var": "Declaring variables",
+        "input": "Reading input",
+        "output": "Checking output",
+    }
+
+    # The variables used as sizes of the arrays, for each one whether it is
+    # read from the input (otherwise it is written before in the output).
+    # The input is read up to the last line needed.
+    def find_sizes(self):
+        self.from_input = set()
+        written = set()
+        for output_line in self.data["output"]:
+            if type(output_line) == IOVariables:
+                written.update(var.name for var in output_line.variables)
+                continue
+            for size in output_line.sizes:
+                if size.var is not None and size.var.name not in written:
+                    self.from_input.add(size.var.name)
+
+        read = set()
+        self.input_lines = []
+        for input_line in self.data["input"]:
+            if self.from_input <= read:
+                break
+            self.input_lines.append(input_line)
+            if type(input_line) == IOVariables:
+                read.update(var.name for var in input_line.variables)
+            else:
+                # The arrays are skipped, but their sizes are needed
+                self.from_input.update(size.var.name for size in input_line.sizes if size.var is not None)
+
+        missing = self.from_input - read
+        if missing:
+            raise ValueError("The checker cannot know the size of the arrays "
+                             "of the output: {0} is neither read from the "
+                             "input nor written before the arrays."
+                                 .format(", ".join(sorted(missing))))
+        self.sizes = self.from_input | set(
+            size.var.name for output_line in self.data["output"] if type(output_line) != IOVariables
+            for size in output_line.sizes if size.var is not None
+        )
+
+    # Opens a loop for each of the given sizes, returns the depth reached.
+    def open_loops(self, sizes):
+        for i, size in enumerate(sizes):
+            self.write_line("for (long long {0} = 0; {0} < {1}; {0}++) {{".format("i" + str(i), size.to_string()), i+1)
+        return len(sizes)
+
+    def close_loops(self, depth):
+        for i in range(depth):
+            self.write_line("}", depth - i)
+
+    def skip_input(self, input_line):
+        if type(input_line) == IOVariables:
+            for var in input_line.variables:
+                if var.name in self.from_input:
+                    self.write_line("{0} = checker_read_input_integer();".format(var.name), 1)
+                elif var.type == PrimitiveType.CHAR:
+                    self.write_line("checker_skip_input_chars(1);", 1)
+                else:
+                    self.write_line("checker_skip_input_token();", 1)
+        elif is_single_char(input_line):
+            arr = input_line.arrays[0]
+            depth = self.open_loops(arr.sizes[:-1])
+            self.write_line("checker_skip_input_chars({0});".format(arr.sizes[-1].to_string()), depth+1)
+            self.close_loops(depth)
+        else:
+            depth = self.open_loops(input_line.sizes)
+            for arr in input_line.arrays:
+                if arr.type == PrimitiveType.CHAR:
+                    self.write_line("checker_skip_input_chars(1);", depth+1)
+                else:
+                    self.write_line("checker_skip_input_token();", depth+1)
+            self.close_loops(depth)
+
+    # The check of a value: name is the name of the variable or array,
+    # indexes the indexes of the element.
+    def check_value(self, type, name, indexes, tabulation):
+        arguments = "\"{0}\", {{{1}}}".format(name, ", ".join(indexes))
+        if type in [PrimitiveType.INT, PrimitiveType.LONGINT]:
+            check = "checker_check_integer({0});".format(arguments)
+            if not indexes and name in self.sizes:
+                check = name + " = " + check
+        else:
+            check = "checker_check_{0}({1});".format(type.value, arguments)
+        self.write_line(check, tabulation)
+
+    def check_output(self, output_line):
+        if type(output_line) == IOVariables:
+            for var in output_line.variables:
+                self.check_value(var.type, var.name, [], 1)
+        elif output_line.as_string or is_single_char(output_line):
+            arr = output_line.arrays[0]
+            depth = self.open_loops(arr.sizes[:-1])
+            indexes = ", ".join("i" + str(x) for x in range(depth))
+            self.write_line("checker_check_string(\"{0}\", {{{1}}}, {2});".format(arr.name, indexes, arr.sizes[-1].to_string()), depth+1)
+            self.close_loops(depth)
+        else:
+            depth = self.open_loops(output_line.sizes)
+            for arr in output_line.arrays:
+                self.check_value(arr.type, arr.name, ["i" + str(x) for x in range(depth)], depth+1)
+            self.close_loops(depth)
+
+    def insert_main(self):
+        self.grader.write("\n#ifndef CHECKER_ABSOLUTE_TOLERANCE\n#define CHECKER_ABSOLUTE_TOLERANCE {0!r}\n#endif\n".format(self.data["absolute_tolerance"]))
+        self.grader.write("#ifndef CHECKER_RELATIVE_TOLERANCE\n#define CHECKER_RELATIVE_TOLERANCE {0!r}\n#endif\n".format(self.data["relative_tolerance"]))
+        self.grader.write("\n" + read_runtime_file("checker." + self.extension))
+        self.grader.write(self.main_function)
+
+    def write_files(self, checker_name):
+        self.write_checker()
+        self.write(checker_name, self.grader.getvalue())
+
+    def write_checker(self):
+        self.grader = Emitter()
+        self.find_sizes()
+        self.grader.write(self.headers)
+
+        # Only the sizes of the arrays are needed, as integers.
+        self.write_comment("dec_var")
+        for name in sorted(self.sizes):
+            self.write_line("static long long {0};".format(name))
+
+        self.insert_main()
+        if self.input_lines:
+            self.write_comment("input", 1)
+        for input_line in self.input_lines:
+            self.skip_input(input_line)
+
+        self.write_comment("output", 1)
+        for output_line in self.data["output"]:
+            self.check_output(output_line)
+
+        self.grader.write(self.footers)
+        self.grader.write(self.main_end)
@@ -0,0 +1,24 @@
+# Source code being generated by a language class.
+# The code is kept as a list of chunks and joined only when it is needed, so
+# that emitting it takes linear time in its length (appending to a string
+# stored in an attribute copies the whole string every time).
+class Emitter(object):
+    def __init__(self):
+        self.chunks = []
+        # Indentation strings already built, by number of tabulations.
+        self.indentations = [""]
+
+    def write(self, code):
+        self.chunks.append(code)
+
+    def write_line(self, line = "", tabulation = 0):
+        while tabulation >= len(self.indentations):
+            self.indentations.append("\t" * len(self.indentations))
+        self.chunks.append(self.indentations[tabulation])
+        self.chunks.append(line)
+        self.chunks.append("\n")
+
+    def getvalue(self):
+        if len(self.chunks) > 1:
+            self.chunks = ["".join(self.chunks)]
+        return self.chunks[0] if self.chunks else ""
@@ -1,43 +1,81 @@
-const MAX_IN_BUF = 4096 * 4;
+(* The input is read in blocks of FAST_INPUT_BUFFER_SIZE bytes, which can be
+   changed compiling with -dFAST_INPUT_BUFFER_SIZE:=size. The access to the
+   buffer is inlined, at the end of the input #0 is returned. *)
+{$macro on}
+{$inline on}
+{$ifndef FAST_INPUT_BUFFER_SIZE}
+{$define FAST_INPUT_BUFFER_SIZE := 1 shl 16}
+{$endif}
 var
-    total_bytes_read, bytes_read : int64;
-    input_buffer : array[0..MAX_IN_BUF-1] of char;
-    idx_input_buffer : longint;
-    input_stream : TFileStream;
+    fast_input_buffer : array[0..FAST_INPUT_BUFFER_SIZE-1] of char;
+    fast_input_pos, fast_input_len : longint;
+    fast_input_handle : THandle;
 
-function fast_read_next_char(): Char;
+procedure fast_read_refill;
 begin
-    (* Take one char out of the buffer *)
-    fast_read_next_char := input_buffer[idx_input_buffer];
-    inc(idx_input_buffer);
-
-    if idx_input_buffer = MAX_IN_BUF then (* I'm at the end of the buffer, read another buffer *)
+    fast_input_len := FileRead(fast_input_handle, fast_input_buffer, FAST_INPUT_BUFFER_SIZE);
+    if fast_input_len <= 0 then (* The input is over *)
     begin
-        if total_bytes_read <= input_stream.Size then (* We haven't reached EOF *)
-        begin
-            bytes_read := input_stream.Read(input_buffer, sizeof(input_buffer));
-            inc(total_bytes_read, bytes_read);
-        end;
-
-        idx_input_buffer := 0;
+        fast_input_buffer[0] := #0;
+        fast_input_len := 1;
     end;
+    fast_input_pos := 0;
+end;
+
+function fast_read_next_char() : char; inline;
+begin
+    if fast_input_pos = fast_input_len then
+        fast_read_refill;
+    fast_read_next_char := fast_input_buffer[fast_input_pos];
+    inc(fast_input_pos);
 end;
 
 (* Returns first non whitespace character *)
 function fast_read_char() : char;
-var c: Char;
+var c : char;
 begin
     c := fast_read_next_char();
-    while (ord(c) = $0020) or (ord(c) = $0009) or
-          (ord(c) = $000a) or (ord(c) = $000b) or
-          (ord(c) = $000c) or (ord(c) = $000d) do
+    while c in [#9..#13, ' '] do
         c := fast_read_next_char();
 
     fast_read_char := c;
 end;
 
-function fast_read_int() : longint;
-var res : longint;
+(* Reads a string of exactly len chars, skipping the whitespaces before it.
+   The string must not contain whitespaces and must be followed by one (or by
+   the end of the input), otherwise the row is shorter or longer than len. *)
+procedure fast_read_string(var s : array of char; len : longint);
+var done, chunk, i : longint;
+    ok : boolean;
+begin
+    if len <= 0 then
+        exit;
+    s[0] := fast_read_char();
+    done := 1;
+    while done < len do
+    begin
+        if fast_input_pos = fast_input_len then
+            fast_read_refill;
+        chunk := fast_input_len - fast_input_pos;
+        if chunk > len - done then
+            chunk := len - done;
+        move(fast_input_buffer[fast_input_pos], s[done], chunk);
+        inc(done, chunk);
+        inc(fast_input_pos, chunk);
+    end;
+    ok := fast_read_next_char() in [#0, #9..#13, ' '];
+    for i := 0 to len-1 do
+        if s[i] in [#0, #9..#13, ' '] then
+            ok := false;
+    if not ok then
+    begin
+        writeln(stderr, 'A string of the input is not made of ', len, ' chars.');
+        halt(1);
+    end;
+end;
+
+function fast_read_longint() : int64;
+var res : int64;
     c : char;
     negative : boolean;
 begin
@@ -46,7 +84,7 @@ begin
 
     repeat
         c := fast_read_next_char();
-    until (c = '-') or (('0' <= c) and (c <= '9'));
+    until (c = '-') or (('0' <= c) and (c <= '9')) or (c = #0);
 
     if c = '-' then
     begin
@@ -54,62 +92,178 @@ begin
         c := fast_read_next_char();
     end;
 
-    repeat
-        res := res * 10 + ord(c) - ord('0');
+    while ('0' <= c) and (c <= '9') do
+    begin
+        res := res * 10 + (ord(c) - ord('0'));
         c := fast_read_next_char();
-    until not (('0' <= c) and (c <= '9'));
+    end;
 
     if negative then
-        fast_read_int := -res
+        fast_read_longint := -res
     else
-        fast_read_int := res;
+        fast_read_longint := res;
 end;
 
-function fast_read_longint() : int64;
-var res : int64;
+function fast_read_int() : longint;
+begin
+    fast_read_int := longint(fast_read_longint());
+end;
+
+const fast_powers_of_ten : array[0..22] of double = (
+    1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+    1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22
+);
+
+(* The chars of the last real read, handed to val when it is needed. The
+   string grows with the token, so that long reals are parsed whole. *)
+var fast_real_token : ansistring;
+
+procedure fast_real_append(var len : longint; c : char); inline;
+begin
+    if len = length(fast_real_token) then
+        SetLength(fast_real_token, 2 * len);
+    inc(len);
+    fast_real_token[len] := c;
+end;
+
+(* The number is parsed while it is read. When the mantissa fits in 53 bits
+   and the exponent is small, both are exact doubles and a single
+   multiplication or division gives the correctly rounded result. All other
+   tokens are converted with val. *)
+function fast_read_real() : double;
+var token_len : longint;
     c : char;
-    negative : boolean;
+    negative, exp_negative, exact : boolean;
+    mantissa : qword;
+    digits, exponent, exp_value : longint;
+    res : double;
+    code : word;
 begin
-    res := 0;
+    token_len := 0;
     negative := False;
+    exact := True;
+    mantissa := 0;
+    digits := 0;
+    exponent := 0;
 
-    repeat
+    c := fast_read_char();
+    if (c = '-') or (c = '+') then
+    begin
+        negative := c = '-';
+        fast_real_append(token_len, c);
         c := fast_read_next_char();
-    until (c = '-') or (('0' <= c) and (c <= '9'));
+    end;
 
-    if c = '-' then
+    while ('0' <= c) and (c <= '9') do
     begin
-        negative := True;
+        if digits < 19 then
+        begin
+            mantissa := mantissa * 10 + qword(ord(c) - ord('0'));
+            if mantissa > 0 then
+                inc(digits);
+        end
+        else
+        begin
+            inc(exponent);
+            if c <> '0' then
+                exact := False;
+        end;
+        fast_real_append(token_len, c);
         c := fast_read_next_char();
     end;
 
-    repeat
-        res := res * 10 + ord(c) - ord('0');
+    if c = '.' then
+    begin
+        fast_real_append(token_len, c);
         c := fast_read_next_char();
-    until not (('0' <= c) and (c <= '9'));
+        while ('0' <= c) and (c <= '9') do
+        begin
+            if digits < 19 then
+            begin
+                mantissa := mantissa * 10 + qword(ord(c) - ord('0'));
+                if mantissa > 0 then
+                    inc(digits);
+                dec(exponent);
+            end
+            else if c <> '0' then
+                exact := False;
+            fast_real_append(token_len, c);
+            c := fast_read_next_char();
+        end;
+    end;
 
-    if negative then
-        fast_read_longint := -res
-    else
-        fast_read_longint := res;
-end;
+    if (c = 'e') or (c = 'E') then
+    begin
+        exp_negative := False;
+        exp_value := 0;
+        fast_real_append(token_len, c);
+        c := fast_read_next_char();
+        if (c = '-') or (c = '+') then
+        begin
+            exp_negative := c = '-';
+            fast_real_append(token_len, c);
+            c := fast_read_next_char();
+        end;
+        while ('0' <= c) and (c <= '9') do
+        begin
+            if exp_value < 100000 then
+                exp_value := exp_value * 10 + (ord(c) - ord('0'));
+            fast_real_append(token_len, c);
+            c := fast_read_next_char();
+        end;
+        if exp_negative then
+            dec(exponent, exp_value)
+        else
+            inc(exponent, exp_value);
+    end;
 
-function fast_read_real() : double;
-begin
-    (* TODO *)
-    fast_read_real := 42.0;
+    if c in [#0, #9..#13, ' '] then
+    begin
+        if exact and (mantissa <= 9007199254740992) and (-22 <= exponent) and (exponent <= 22) then
+        begin
+            res := mantissa;
+            if exponent < 0 then
+                res := res / fast_powers_of_ten[-exponent]
+            else
+                res := res * fast_powers_of_ten[exponent];
+            if negative then
+                res := -res;
+            fast_read_real := res;
+            exit;
+        end;
+    end
+    else (* Not a plain decimal number, the rest of the token is needed *)
+    begin
+        while not (c in [#0, #9..#13, ' ']) do
+        begin
+            fast_real_append(token_len, c);
+            c := fast_read_next_char();
+        end;
+    end;
+
+    val(copy(fast_real_token, 1, token_len), res, code);
+    fast_read_real := res;
 end;
 
+(* An empty file name means stdin *)
 procedure init_fast_input(file_name : string);
 begin
-    input_stream := TFileStream.Create(file_name, fmOpenRead);
-    input_stream.Position := 0;
-    bytes_read := input_stream.Read(input_buffer, sizeof(input_buffer));
-    inc(total_bytes_read, bytes_read);
-    idx_input_buffer := 0;
+    if file_name = '' then
+        fast_input_handle := StdInputHandle
+    else
+        fast_input_handle := FileOpen(file_name, fmOpenRead);
+    if fast_input_handle = feInvalidHandle then
+    begin
+        writeln(stderr, 'Cannot open ', file_name);
+        halt(1);
+    end;
+    fast_input_pos := 0;
+    fast_input_len := 0;
+    SetLength(fast_real_token, 256);
 end;
 
 procedure close_fast_input;
 begin
-    input_stream.Free;
+    if fast_input_handle <> StdInputHandle then
+        FileClose(fast_input_handle);
 end;
@@ -1,26 +1,30 @@
 // Begin fast input library
 
+#include <string.h>
+
+// It relies on fast_read_next_char, fast_write_next_char and fast_write_flush
+// defined by the chosen I/O primitives.
+
 static inline char fast_read_char() {
-	char c = fgetc_unlocked(fr);
+	int c = fast_read_next_char();
 	// ignore whitespaces
 	while (	c == 0x20 || c == 0x09 || c == 0x0a 
-			|| c == 0x0b || c == 0x0c || c == 0x0d) c = fgetc_unlocked(fr);
+			|| c == 0x0b || c == 0x0c || c == 0x0d) c = fast_read_next_char();
 	return c;
 }
 
 static inline int fast_read_int() { // speed x5
 	short int minus = 0;
 	int res = 0;
-	char c = fgetc_unlocked(fr);
-	while (c != '-' && (c < '0' || '9' < c)) c = fgetc_unlocked(fr);
+	int c = fast_read_next_char();
+	while (c != '-' && (c < '0' || '9' < c) && c != EOF) c = fast_read_next_char();
 
-	if (c == '-') minus = 1, c = fgetc_unlocked(fr);
+	if (c == '-') minus = 1, c = fast_read_next_char();
 	
-	do{
+	while ('0' <= c && c <= '9') {
 		res = res * 10 + (c - '0');
-		c = fgetc_unlocked(fr);
+		c = fast_read_next_char();
 	}
-	while ('0' <= c && c <= '9');
 	
 	if (minus) return -res;
 	else return res;
@@ -29,71 +33,251 @@ static inline int fast_read_int() { // speed x5
 static inline long long int fast_read_longint() {
 	short int minus = 0;
 	long long int res = 0;
-	char c = fgetc_unlocked(fr);
-	while (c != '-' && (c < '0' || '9' < c)) c = fgetc_unlocked(fr);
+	int c = fast_read_next_char();
+	while (c != '-' && (c < '0' || '9' < c) && c != EOF) c = fast_read_next_char();
 
-	if (c == '-') minus = 1, c = fgetc_unlocked(fr);
+	if (c == '-') minus = 1, c = fast_read_next_char();
 	
-	do{
+	while ('0' <= c && c <= '9') {
 		res = res * 10ll + (long long int)(c - '0');
-		c = fgetc_unlocked(fr);
+		c = fast_read_next_char();
 	}
-	while ('0' <= c && c <= '9');
 	
 	if (minus) return -res;
 	else return res;
 }
 
-static inline double fast_read_real() { //TODO
-	double x;
-	fscanf(fr, "%lf", &x);
-	return x;
+static inline int fast_is_space(int c) {
+	return c == 0x20 || (0x09 <= c && c <= 0x0d);
+}
+
+// Reads a string of exactly len chars, skipping the whitespaces before it.
+// The string must not contain whitespaces and must be followed by one (or by
+// the end of the input), otherwise the row is shorter or longer than len.
+static inline void fast_read_string(char* s, size_t len) {
+	if (len == 0) return;
+	int c = fast_read_next_char();
+	while (fast_is_space(c)) c = fast_read_next_char();
+	s[0] = c;
+	size_t done = c == EOF ? 0 : 1 + fast_read_block(s + 1, len - 1);
+	int next = fast_read_next_char();
+	for (size_t i = 0; i < done; i++) {
+		if (fast_is_space((unsigned char)s[i])) done = i;
+	}
+	if (done != len || (next != EOF && !fast_is_space(next))) {
+		fprintf(stderr, "A string of the input is not made of %zu chars.\n", len);
+		exit(1);
+	}
+}
+
+static const double fast_powers_of_ten[] = {
+	1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+	1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22
+};
+
+// The chars of the last real read, handed to strtod when it is needed. The
+// buffer grows with the token, so that long reals are parsed whole.
+static char fast_real_local[256];
+static char* fast_real_token = fast_real_local;
+static size_t fast_real_capacity = sizeof(fast_real_local);
+
+static void fast_real_grow() {
+	char* token = (char*)malloc(2 * fast_real_capacity);
+	if (token == NULL) {
+		fprintf(stderr, "A real number of the input is too long.\n");
+		exit(1);
+	}
+	memcpy(token, fast_real_token, fast_real_capacity);
+	if (fast_real_token != fast_real_local) free(fast_real_token);
+	fast_real_token = token;
+	fast_real_capacity *= 2;
+}
+
+// Appends c, leaving room for the final '\0'.
+static inline void fast_real_append(size_t len, int c) {
+	if (len + 1 == fast_real_capacity) fast_real_grow();
+	fast_real_token[len] = c;
+}
+
+// The number is parsed while it is read. When the mantissa fits in 53 bits
+// and the exponent is small both are exact doubles, so a single
+// multiplication or division gives the correctly rounded result. All other
+// tokens (too many digits, huge exponents, inf, nan, ...) are handed to strtod.
+static inline double fast_read_real() {
+	size_t len = 0;
+	int minus = 0, digits = 0, exponent = 0, exact = 1;
+	unsigned long long mantissa = 0;
+	int c = fast_read_next_char();
+	while (	c == 0x20 || c == 0x09 || c == 0x0a
+			|| c == 0x0b || c == 0x0c || c == 0x0d) c = fast_read_next_char();
+
+	if (c == '-' || c == '+') {
+		minus = (c == '-');
+		fast_real_append(len++, c);
+		c = fast_read_next_char();
+	}
+	while ('0' <= c && c <= '9') {
+		if (digits < 19) {
+			mantissa = mantissa * 10 + (c - '0');
+			if (mantissa) digits++;
+		} else {
+			exponent++;
+			if (c != '0') exact = 0;
+		}
+		fast_real_append(len++, c);
+		c = fast_read_next_char();
+	}
+	if (c == '.') {
+		fast_real_append(len++, c);
+		c = fast_read_next_char();
+		while ('0' <= c && c <= '9') {
+			if (digits < 19) {
+				mantissa = mantissa * 10 + (c - '0');
+				if (mantissa) digits++;
+				exponent--;
+			} else if (c != '0') {
+				exact = 0;
+			}
+			fast_real_append(len++, c);
+			c = fast_read_next_char();
+		}
+	}
+	if (c == 'e' || c == 'E') {
+		int exp_minus = 0, exp_value = 0;
+		fast_real_append(len++, c);
+		c = fast_read_next_char();
+		if (c == '-' || c == '+') {
+			exp_minus = (c == '-');
+			fast_real_append(len++, c);
+			c = fast_read_next_char();
+		}
+		while ('0' <= c && c <= '9') {
+			if (exp_value < 100000) exp_value = exp_value * 10 + (c - '0');
+			fast_real_append(len++, c);
+			c = fast_read_next_char();
+		}
+		exponent += exp_minus ? -exp_value : exp_value;
+	}
+
+	if (	c == 0x20 || c == 0x09 || c == 0x0a || c == 0x0b
+			|| c == 0x0c || c == 0x0d || c == EOF) {
+		if (exact && mantissa <= (1ull << 53) && -22 <= exponent && exponent <= 22) {
+			double res = (double)mantissa;
+			if (exponent < 0) res /= fast_powers_of_ten[-exponent];
+			else res *= fast_powers_of_ten[exponent];
+			return minus ? -res : res;
+		}
+	} else { // Not a plain decimal number, the rest of the token is needed
+		while (c != EOF && c != 0x20 && (c < 0x09 || 0x0d < c)) {
+			fast_real_append(len++, c);
+			c = fast_read_next_char();
+		}
+	}
+	fast_real_token[len] = '\0';
+	return strtod(fast_real_token, NULL);
 }
 
 static inline void fast_write_char(char c) {
-	fputc_unlocked(c, fw);
+	fast_write_next_char(c);
+}
+
+static inline void fast_write_string(const char* s, size_t len) {
+	fast_write_block(s, len);
 }
 
 static inline void fast_write_int(int x) { // speed x2
-	static short int digits[16];
-	if (x == 0) {
-		fputc_unlocked('0', fw);
-		return;
-	}
+	static char digits[16];
+	unsigned int y = x;
 	if (x < 0) {
-		fputc_unlocked('-', fw);
-		x = -x;
+		fast_write_next_char('-');
+		y = -y;
 	}
-	short int i = -1;
-	while (x) {
-		i++;
-		digits[i] = x%10; 
-		x /= 10;
+	short int i = 0;
+	do {
+		digits[i++] = '0' + y%10;
+		y /= 10;
 	}
-	for (; i >= 0; i--) fputc_unlocked('0' + digits[i], fw);
+	while (y);
+	while (i) fast_write_next_char(digits[--i]);
 }
 
 static inline void fast_write_longint(long long int x) { // speed x2
-	static short int digits[32];
-	if (x == 0) {
-		fputc_unlocked('0', fw);
-		return;
-	}
+	static char digits[32];
+	unsigned long long int y = x;
 	if (x < 0) {
-		fputc_unlocked('-', fw);
-		x = -x;
+		fast_write_next_char('-');
+		y = -y;
 	}
-	short int i = -1;
-	while (x) {
-		i++;
-		digits[i] = x%(10ll); 
-		x /= 10ll;
+	short int i = 0;
+	do {
+		digits[i++] = '0' + y%10ull;
+		y /= 10ull;
 	}
-	for (; i >= 0; i--) fputc_unlocked('0' + digits[i], fw);
+	while (y);
+	while (i) fast_write_next_char(digits[--i]);
 }
 
-static inline void fast_write_real(double x) { //TODO
-	fprintf(fw, "%lf", x);
+#ifndef FAST_REAL_PRECISION
+#define FAST_REAL_PRECISION 6
+#endif
+
+// Writes x with FAST_REAL_PRECISION decimal digits, exactly as printf("%.*lf")
+// would do (the exact binary value is rounded half to even).
+// The digits are computed with 128 bit integers, if they are not available or
+// the number is too big (or it is inf, nan) printf is used.
+static inline void fast_write_real(double x) {
+#ifdef __SIZEOF_INT128__
+	if (FAST_REAL_PRECISION <= 18 && -9007199254740992.0 < x && x < 9007199254740992.0) {
+		unsigned long long bits, mantissa, int_part, frac_part, scale = 1, frac_digits = 0;
+		int shift, i;
+		memcpy(&bits, &x, sizeof(bits));
+		if (bits >> 63) fast_write_next_char('-');
+
+		// x = mantissa / 2^shift
+		mantissa = bits & ((1ull << 52) - 1);
+		shift = (int)((bits >> 52) & 0x7ff);
+		if (shift == 0) shift = 1074;
+		else mantissa |= 1ull << 52, shift = 1075 - shift;
+		if (shift <= 0) int_part = mantissa, frac_part = 0, shift = 0;
+		else if (shift < 64) int_part = mantissa >> shift, frac_part = mantissa & ((1ull << shift) - 1);
+		else int_part = 0, frac_part = mantissa;
+
+		for (i = 0; i < FAST_REAL_PRECISION; i++) scale *= 10;
+		// With shift > 127 the fractional part is smaller than 2^-75, so it
+		// is rounded to 0.
+		if (frac_part && shift <= 127) {
+			unsigned __int128 scaled = (unsigned __int128)frac_part * scale;
+			unsigned __int128 rem = scaled & ((((unsigned __int128)1) << shift) - 1);
+			unsigned __int128 half = ((unsigned __int128)1) << (shift - 1);
+			unsigned long long last_digit;
+			frac_digits = (unsigned long long)(scaled >> shift);
+			last_digit = FAST_REAL_PRECISION ? frac_digits : int_part;
+			if (rem > half || (rem == half && (last_digit & 1))) frac_digits++;
+			if (frac_digits == scale) int_part++, frac_digits = 0;
+		}
+
+		char digits[24];
+		i = 0;
+		do {
+			digits[i++] = '0' + int_part % 10;
+			int_part /= 10;
+		}
+		while (int_part);
+		while (i) fast_write_next_char(digits[--i]);
+		if (FAST_REAL_PRECISION) {
+			fast_write_next_char('.');
+			for (i = 0; i < FAST_REAL_PRECISION; i++) {
+				digits[i] = '0' + frac_digits % 10;
+				frac_digits /= 10;
+			}
+			while (i) fast_write_next_char(digits[--i]);
+		}
+		return;
+	}
+#endif
+	char buffer[512];
+	int len = snprintf(buffer, sizeof(buffer), "%.*lf", FAST_REAL_PRECISION, x);
+	for (int i = 0; i < len && i < (int)sizeof(buffer) - 1; i++) fast_write_next_char(buffer[i]);
 }
 
 // End fast input library
@@ -0,0 +1,322 @@
+	// Begin fast I/O library
+
+	// The input is read in blocks of bytes and the numbers are parsed by hand,
+	// the output is formatted in a buffer of chars which is written to fw when
+	// it is full. The bytes are the chars of the grader (latin-1).
+	// It relies on FAST_REAL_PRECISION and gradergen_real, defined by the
+	// grader, to format the reals.
+
+	static class FastReader {
+		final InputStream stream;
+		final byte[] buffer = new byte[1 << 16];
+		int pos = 0, len = 0;
+
+		FastReader(InputStream stream) {
+			this.stream = stream;
+		}
+
+		// Reads the next block, returns false at the end of the input.
+		boolean fill() throws IOException {
+			len = stream.read(buffer, 0, buffer.length);
+			pos = 0;
+			if (len <= 0) {
+				len = 0;
+				return false;
+			}
+			return true;
+		}
+
+		// The next byte of the input, -1 at its end. It is kept short, so
+		// that it is inlined.
+		int next_char() throws IOException {
+			if (pos == len && !fill()) return -1;
+			return buffer[pos++] & 0xff;
+		}
+
+		static boolean is_space(int c) {
+			return c == ' ' || (0x09 <= c && c <= 0x0d);
+		}
+
+		int read_int() throws IOException {
+			return (int)read_longint();
+		}
+
+		long read_longint() throws IOException {
+			boolean minus = false;
+			long res = 0;
+			int c = next_char();
+			while (c != '-' && (c < '0' || '9' < c) && c != -1) c = next_char();
+
+			if (c == '-') {
+				minus = true;
+				c = next_char();
+			}
+
+			while ('0' <= c && c <= '9') {
+				res = res * 10 + (c - '0');
+				c = next_char();
+			}
+
+			return minus ? -res : res;
+		}
+
+		char read_char() throws IOException {
+			int c = next_char();
+			while (is_space(c)) c = next_char();
+			if (c == -1) throw new EOFException("The input is over.");
+			return (char)c;
+		}
+
+		// A row of chars, which can be separated by whitespaces or not.
+		void read_chars(char[] row) throws IOException {
+			int done = 0;
+			while (done < row.length) {
+				if (pos == len && !fill()) throw new EOFException("The input is over.");
+				int c = buffer[pos++] & 0xff;
+				if (!is_space(c)) row[done++] = (char)c;
+			}
+		}
+
+		// A row of exactly row.length chars, without whitespaces, followed by
+		// a whitespace or by the end of the input.
+		void read_string(char[] row) throws IOException {
+			if (row.length == 0) return;
+			int c = next_char();
+			while (is_space(c)) c = next_char();
+			int done = 0;
+			while (done < row.length && c != -1 && !is_space(c)) {
+				row[done++] = (char)c;
+				c = next_char();
+			}
+			if (done != row.length || (c != -1 && !is_space(c))) {
+				throw new IOException("A string of the input is not made of " + row.length + " chars.");
+			}
+		}
+
+		static final double[] powers_of_ten = {
+			1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9, 1e10, 1e11,
+			1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22
+		};
+		// The chars of the last real read, the buffer grows with the token
+		// so that long reals are parsed whole.
+		char[] token = new char[256];
+
+		void append(int len, int c) {
+			if (len == token.length) token = java.util.Arrays.copyOf(token, 2 * len);
+			token[len] = (char)c;
+		}
+
+		// The number is parsed while it is read. When the mantissa fits in 53
+		// bits and the exponent is small both are exact doubles, so a single
+		// multiplication or division gives the correctly rounded result. All
+		// other tokens (too many digits, huge exponents, ...) are handed to
+		// Double.parseDouble.
+		double read_real() throws IOException {
+			int len = 0;
+			boolean minus = false, exact = true;
+			int digits = 0, exponent = 0;
+			long mantissa = 0;
+			int c = next_char();
+			while (is_space(c)) c = next_char();
+
+			if (c == '-' || c == '+') {
+				minus = c == '-';
+				append(len++, c);
+				c = next_char();
+			}
+			while ('0' <= c && c <= '9') {
+				if (digits < 18) {
+					mantissa = mantissa * 10 + (c - '0');
+					if (mantissa != 0) digits++;
+				} else {
+					exponent++;
+					if (c != '0') exact = false;
+				}
+				append(len++, c);
+				c = next_char();
+			}
+			if (c == '.') {
+				append(len++, c);
+				c = next_char();
+				while ('0' <= c && c <= '9') {
+					if (digits < 18) {
+						mantissa = mantissa * 10 + (c - '0');
+						if (mantissa != 0) digits++;
+						exponent--;
+					} else if (c != '0') {
+						exact = false;
+					}
+					append(len++, c);
+					c = next_char();
+				}
+			}
+			if (c == 'e' || c == 'E') {
+				boolean exp_minus = false;
+				int exp_value = 0;
+				append(len++, c);
+				c = next_char();
+				if (c == '-' || c == '+') {
+					exp_minus = c == '-';
+					append(len++, c);
+					c = next_char();
+				}
+				while ('0' <= c && c <= '9') {
+					if (exp_value < 100000) exp_value = exp_value * 10 + (c - '0');
+					append(len++, c);
+					c = next_char();
+				}
+				exponent += exp_minus ? -exp_value : exp_value;
+			}
+
+			if (is_space(c) || c == -1) {
+				if (exact && mantissa <= (1L << 53) && -22 <= exponent && exponent <= 22) {
+					double res = (double)mantissa;
+					if (exponent < 0) res /= powers_of_ten[-exponent];
+					else res *= powers_of_ten[exponent];
+					return minus ? -res : res;
+				}
+			} else { // Not a plain decimal number, the rest of the token is needed
+				while (c != -1 && !is_space(c)) {
+					append(len++, c);
+					c = next_char();
+				}
+			}
+			return Double.parseDouble(new String(token, 0, len));
+		}
+	}
+
+	static class FastWriter {
+		final PrintWriter stream;
+		final char[] buffer = new char[1 << 16];
+		final char[] digits = new char[20];
+		int len = 0;
+
+		FastWriter(PrintWriter stream) {
+			this.stream = stream;
+		}
+
+		void flush_buffer() {
+			stream.write(buffer, 0, len);
+			len = 0;
+		}
+
+		void write_char(char c) {
+			if (len == buffer.length) flush_buffer();
+			buffer[len++] = c;
+		}
+
+		void write_int(int x) {
+			write_longint(x);
+		}
+
+		// The digits are computed on the negative value, so that the minimum
+		// long is written too.
+		void write_longint(long x) {
+			if (buffer.length - len < 20) flush_buffer();
+			if (x < 0) buffer[len++] = '-';
+			else x = -x;
+			int i = 0;
+			do {
+				digits[i++] = (char)('0' - x % 10);
+				x /= 10;
+			}
+			while (x != 0);
+			while (i > 0) buffer[len++] = digits[--i];
+		}
+
+		void write_chars(char[] row) {
+			int done = 0;
+			while (done < row.length) {
+				if (len == buffer.length) flush_buffer();
+				int chunk = Math.min(buffer.length - len, row.length - done);
+				System.arraycopy(row, done, buffer, len, chunk);
+				done += chunk;
+				len += chunk;
+			}
+		}
+
+		// Writes x with FAST_REAL_PRECISION decimal digits, exactly as
+		// gradergen_real (and printf in C) would do: the exact binary value is
+		// rounded half to even. The digits are computed with 128 bit products,
+		// if the number is too big (or it is inf, nan) gradergen_real is used.
+		void write_real(double x) {
+			if (FAST_REAL_PRECISION > 18 || !(-9007199254740992.0 < x && x < 9007199254740992.0)) {
+				write_chars(gradergen_real(x).toCharArray());
+				return;
+			}
+			if (buffer.length - len < 40) flush_buffer();
+			long bits = Double.doubleToRawLongBits(x);
+			if (bits < 0) buffer[len++] = '-';
+
+			// x = mantissa / 2^shift
+			long mantissa = bits & ((1L << 52) - 1), int_part, frac_part, scale = 1, frac_digits = 0;
+			int shift = (int)((bits >>> 52) & 0x7ff);
+			if (shift == 0) shift = 1074;
+			else {
+				mantissa |= 1L << 52;
+				shift = 1075 - shift;
+			}
+			if (shift <= 0) {
+				int_part = mantissa;
+				frac_part = 0;
+			} else if (shift < 64) {
+				int_part = mantissa >>> shift;
+				frac_part = mantissa & ((1L << shift) - 1);
+			} else {
+				int_part = 0;
+				frac_part = mantissa;
+			}
+
+			for (int i = 0; i < FAST_REAL_PRECISION; i++) scale *= 10;
+			// With shift > 127 the fractional part is smaller than 2^-75, so it
+			// is rounded to 0.
+			if (frac_part != 0 && shift <= 127) {
+				// scaled = frac_part * scale, rem its lowest shift bits
+				long scaled_low = frac_part * scale, scaled_high = Math.multiplyHigh(frac_part, scale);
+				long rem_low, rem_high, half_low, half_high;
+				if (shift < 64) {
+					frac_digits = (scaled_low >>> shift) | (scaled_high << (64 - shift));
+					rem_low = scaled_low & ((1L << shift) - 1);
+					rem_high = 0;
+					half_low = 1L << (shift - 1);
+					half_high = 0;
+				} else {
+					frac_digits = scaled_high >>> (shift - 64);
+					rem_low = scaled_low;
+					rem_high = scaled_high & ((1L << (shift - 64)) - 1);
+					half_low = shift == 64 ? 1L << 63 : 0;
+					half_high = shift == 64 ? 0 : 1L << (shift - 65);
+				}
+				int compare = rem_high != half_high ? Long.compareUnsigned(rem_high, half_high) : Long.compareUnsigned(rem_low, half_low);
+				long last_digit = FAST_REAL_PRECISION > 0 ? frac_digits : int_part;
+				if (compare > 0 || (compare == 0 && (last_digit & 1) != 0)) frac_digits++;
+				if (frac_digits == scale) {
+					int_part++;
+					frac_digits = 0;
+				}
+			}
+
+			int i = 0;
+			do {
+				digits[i++] = (char)('0' + int_part % 10);
+				int_part /= 10;
+			}
+			while (int_part != 0);
+			while (i > 0) buffer[len++] = digits[--i];
+			if (FAST_REAL_PRECISION > 0) {
+				buffer[len++] = '.';
+				for (i = 0; i < FAST_REAL_PRECISION; i++) {
+					digits[i] = (char)('0' + frac_digits % 10);
+					frac_digits /= 10;
+				}
+				while (i > 0) buffer[len++] = digits[--i];
+			}
+		}
+
+		void flush() {
+			flush_buffer();
+			stream.flush();
+		}
+	}
+
+	// End fast I/O library
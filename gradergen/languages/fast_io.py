@@ -0,0 +1,119 @@
+# Begin fast I/O library
+
+# The whole input is read at once and split in tokens, the rows of the arrays
+# are converted with a single call each. Numeric arrays are stored in array
+# buffers, char arrays in lists of strings of length 1.
+# The output is collected in a list and written at once, when it is flushed.
+
+class FastReader:
+	array_codes = {"int": "i", "longint": "q", "real": "d"}
+	converters = {"int": int, "longint": int, "real": float}
+
+	def __init__(self, stream):
+		self.tokens = stream.read().split()
+		self.pos = 0
+		# Chars of tokens[pos] already read as single chars, as a row of chars
+		# can be written without spaces.
+		self.offset = 0
+
+	def read_int(self):
+		self.pos += 1
+		return int(self.tokens[self.pos - 1])
+
+	read_longint = read_int
+
+	def read_real(self):
+		self.pos += 1
+		return float(self.tokens[self.pos - 1])
+
+	def read_char(self):
+		return self.read_chars(1)[0]
+
+	# The next count chars, skipping the whitespaces.
+	def read_chars(self, count):
+		# Usually the chars are either a single token or count tokens of a
+		# single char.
+		if self.offset == 0 and count > 0:
+			if len(self.tokens[self.pos]) == count:
+				self.pos += 1
+				return list(self.tokens[self.pos - 1].decode("latin-1"))
+			joined = b"".join(self.tokens[self.pos:self.pos + count])
+			if len(joined) == count:
+				self.pos += count
+				return list(joined.decode("latin-1"))
+
+		chars = []
+		while len(chars) < count:
+			token = self.tokens[self.pos]
+			piece = token[self.offset:self.offset + count - len(chars)]
+			chars.extend(piece.decode("latin-1"))
+			self.offset += len(piece)
+			if self.offset == len(token):
+				self.pos += 1
+				self.offset = 0
+		return chars
+
+	# A row of exactly count chars, a single token.
+	def read_string(self, count):
+		if count == 0:
+			return []
+		if self.offset != 0 or self.pos == len(self.tokens) or len(self.tokens[self.pos]) != count:
+			raise ValueError("A string of the input is not made of %d chars." % count)
+		self.pos += 1
+		return list(self.tokens[self.pos - 1].decode("latin-1"))
+
+	# A row of count values of the given type.
+	def read_row(self, type, count):
+		if type == "char":
+			return self.read_chars(count)
+		tokens = self.tokens[self.pos:self.pos + count]
+		if len(tokens) < count:
+			raise EOFError("The input is over.")
+		self.pos += count
+		return array(self.array_codes[type], map(self.converters[type], tokens))
+
+	# The rows of arrays on the same line, the values of which alternate.
+	def read_columns(self, types, count):
+		width = len(types)
+		tokens = self.tokens[self.pos:self.pos + width * count]
+		if len(tokens) < width * count:
+			raise EOFError("The input is over.")
+		self.pos += width * count
+		columns = []
+		for i, type in enumerate(types):
+			if type == "char":
+				columns.append([token.decode("latin-1") for token in tokens[i::width]])
+			else:
+				columns.append(array(self.array_codes[type], map(self.converters[type], tokens[i::width])))
+		return columns
+
+class FastWriter:
+	def __init__(self, stream):
+		self.stream = stream
+		self.parts = []
+		real_format = "%." + str(FAST_REAL_PRECISION) + "f"
+		self.formatters = {"int": str, "longint": str, "char": str, "real": real_format.__mod__}
+
+	def write_values(self, types, values):
+		self.parts.append(" ".join(self.formatters[type](value) for type, value in zip(types, values)) + "\n")
+
+	# A row of a single array: the values are followed by a space, the chars
+	# are written as a string.
+	def write_row(self, type, row):
+		if type == "char":
+			self.parts.append("".join(row) + "\n")
+		elif len(row) > 0:
+			self.parts.append(" ".join(map(self.formatters[type], row)) + " \n")
+		else:
+			self.parts.append("\n")
+
+	# The rows of arrays on the same line, a line for each element.
+	def write_columns(self, types, columns):
+		strings = [map(self.formatters[type], column) for type, column in zip(types, columns)]
+		self.parts.append("".join(" ".join(line) + "\n" for line in zip(*strings)))
+
+	def flush(self):
+		self.stream.write("".join(self.parts))
+		self.parts = []
+
+# End fast I/O library
@@ -0,0 +1,90 @@
+// Begin fast I/O primitives (block buffered)
+
+#include <string.h>
+#if defined(__unix__) || defined(__APPLE__)
+#include <sys/mman.h>
+#include <sys/stat.h>
+#define FAST_IO_MMAP
+#endif
+
+#define FAST_INPUT_BUFFER_SIZE (1 << 16)
+#define FAST_OUTPUT_BUFFER_SIZE (1 << 16)
+
+static char fast_input_buffer[FAST_INPUT_BUFFER_SIZE];
+static const char *fast_input_ptr, *fast_input_end;
+static int fast_input_mapped; // 0: not tried yet, 1: fread in blocks, 2: whole file mapped
+
+static char fast_output_buffer[FAST_OUTPUT_BUFFER_SIZE];
+static size_t fast_output_idx;
+
+// Refills the input buffer, returns 0 when the input is over.
+// The first time it tries to map the whole input file in memory, if that is
+// not possible (pipe, terminal, ...) the input is read in blocks.
+static int fast_read_refill() {
+#ifdef FAST_IO_MMAP
+	if (fast_input_mapped == 0) {
+		struct stat st;
+		long offset = ftell(fr);
+		fast_input_mapped = 1;
+		if (offset >= 0 && fstat(fileno(fr), &st) == 0 && S_ISREG(st.st_mode) && st.st_size > offset) {
+			void* map = mmap(NULL, st.st_size, PROT_READ, MAP_PRIVATE, fileno(fr), 0);
+			if (map != MAP_FAILED) {
+				madvise(map, st.st_size, MADV_SEQUENTIAL);
+				fast_input_ptr = (const char*)map + offset;
+				fast_input_end = (const char*)map + st.st_size;
+				fast_input_mapped = 2;
+				return 1;
+			}
+		}
+	}
+	if (fast_input_mapped == 2) return 0;
+#endif
+	size_t bytes_read = fread(fast_input_buffer, 1, FAST_INPUT_BUFFER_SIZE, fr);
+	fast_input_ptr = fast_input_buffer;
+	fast_input_end = fast_input_buffer + bytes_read;
+	return bytes_read > 0;
+}
+
+static inline int fast_read_next_char() {
+	if (fast_input_ptr == fast_input_end && !fast_read_refill()) return EOF;
+	return (unsigned char)*fast_input_ptr++;
+}
+
+// Copies the next len chars of the input in s, returns the number of chars
+// copied, less than len at the end of the input.
+static inline size_t fast_read_block(char* s, size_t len) {
+	size_t done = 0;
+	while (done < len) {
+		if (fast_input_ptr == fast_input_end && !fast_read_refill()) break;
+		size_t chunk = fast_input_end - fast_input_ptr;
+		if (chunk > len - done) chunk = len - done;
+		memcpy(s + done, fast_input_ptr, chunk);
+		fast_input_ptr += chunk;
+		done += chunk;
+	}
+	return done;
+}
+
+static inline void fast_write_flush() {
+	fwrite(fast_output_buffer, 1, fast_output_idx, fw);
+	fast_output_idx = 0;
+}
+
+static inline void fast_write_next_char(char c) {
+	if (fast_output_idx == FAST_OUTPUT_BUFFER_SIZE) fast_write_flush();
+	fast_output_buffer[fast_output_idx++] = c;
+}
+
+static inline void fast_write_block(const char* s, size_t len) {
+	if (fast_output_idx + len > FAST_OUTPUT_BUFFER_SIZE) {
+		fast_write_flush();
+		if (len > FAST_OUTPUT_BUFFER_SIZE) {
+			fwrite(s, 1, len, fw);
+			return;
+		}
+	}
+	memcpy(fast_output_buffer + fast_output_idx, s, len);
+	fast_output_idx += len;
+}
+
+// End fast I/O primitives
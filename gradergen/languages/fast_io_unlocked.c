@@ -0,0 +1,24 @@
+// Begin fast I/O primitives (unlocked stdio)
+
+static inline int fast_read_next_char() {
+	return fgetc_unlocked(fr);
+}
+
+static inline void fast_write_next_char(char c) {
+	fputc_unlocked(c, fw);
+}
+
+// Returns the number of chars read, less than len at the end of the input.
+static inline size_t fast_read_block(char* s, size_t len) {
+	return fread(s, 1, len, fr);
+}
+
+static inline void fast_write_block(const char* s, size_t len) {
+	fwrite(s, 1, len, fw);
+}
+
+static inline void fast_write_flush() {
+	fflush(fw);
+}
+
+// End fast I/O primitives
@@ -1,82 +1,112 @@
-const MAX_OUT_BUF = 4096 * 4;
+(* The output is formatted in a buffer of FAST_OUTPUT_BUFFER_SIZE bytes (at
+   least 32), which can be changed compiling with
+   -dFAST_OUTPUT_BUFFER_SIZE:=size, and written when it is full. *)
+{$macro on}
+{$inline on}
+{$ifndef FAST_OUTPUT_BUFFER_SIZE}
+{$define FAST_OUTPUT_BUFFER_SIZE := 1 shl 16}
+{$endif}
 var
-    output_buffer : array[0..MAX_OUT_BUF-1] of char;
-    idx_output_buffer : longint;
-    output_stream : TFileStream;
+    fast_output_buffer : array[0..FAST_OUTPUT_BUFFER_SIZE-1] of char;
+    fast_output_len : longint;
+    fast_output_handle : THandle;
 
-procedure fast_write_char(x : char);
+procedure fast_write_flush;
 begin
-    (* Write one char onto the buffer *)
-    output_buffer[idx_output_buffer] := x;
-    inc(idx_output_buffer);
-
-    if idx_output_buffer = MAX_OUT_BUF then (* I'm at the end of the buffer, flush it *)
-    begin
-        output_stream.WriteBuffer(output_buffer, sizeof(output_buffer));
+    FileWrite(fast_output_handle, fast_output_buffer, fast_output_len);
+    fast_output_len := 0;
+end;
 
-        idx_output_buffer := 0;
-    end;
+procedure fast_write_char(x : char); inline;
+begin
+    if fast_output_len = FAST_OUTPUT_BUFFER_SIZE then
+        fast_write_flush;
+    fast_output_buffer[fast_output_len] := x;
+    inc(fast_output_len);
 end;
 
-procedure fast_write_int(x : longint);
+procedure fast_write_string(const s : array of char; len : longint);
+var done, chunk : longint;
 begin
-    if x < 0 then (* Write the sign, then the number *)
+    done := 0;
+    while done < len do
     begin
-        fast_write_char('-');
-        fast_write_int(-x);
-    end
-    else (* Write the number recursively *)
-    begin
-        if x >= 10 then
-            fast_write_int(x div 10);
-        fast_write_char(chr(ord('0') + x mod 10));
+        if fast_output_len = FAST_OUTPUT_BUFFER_SIZE then
+            fast_write_flush;
+        chunk := FAST_OUTPUT_BUFFER_SIZE - fast_output_len;
+        if chunk > len - done then
+            chunk := len - done;
+        move(s[done], fast_output_buffer[fast_output_len], chunk);
+        inc(done, chunk);
+        inc(fast_output_len, chunk);
     end;
 end;
 
+(* The digits are computed on the negative value, so that the minimum int64
+   is written too. *)
 procedure fast_write_longint(x : int64);
+var digits : array[0..19] of char;
+    i : longint;
 begin
-    if x < 0 then (* Write the sign, then the number *)
+    if FAST_OUTPUT_BUFFER_SIZE - fast_output_len < 20 then
+        fast_write_flush;
+    if x < 0 then
     begin
-        fast_write_char('-');
-        fast_write_longint(-x);
+        fast_output_buffer[fast_output_len] := '-';
+        inc(fast_output_len);
     end
-    else (* Write the number recursively *)
+    else
+        x := -x;
+
+    i := 0;
+    repeat
+        digits[i] := chr(ord('0') - longint(x mod 10));
+        x := x div 10;
+        inc(i);
+    until x = 0;
+
+    while i > 0 do
     begin
-        if x >= 10 then
-            fast_write_longint(x div 10);
-        fast_write_char(chr(ord('0') + x mod 10));
+        dec(i);
+        fast_output_buffer[fast_output_len] := digits[i];
+        inc(fast_output_len);
     end;
 end;
 
-procedure fast_write_real(x : double);
+procedure fast_write_int(x : longint);
 begin
-    (* TODO *)
-    fast_write_char('4');
-    fast_write_char('2');
-    fast_write_char('.');
-    fast_write_char('0');
+    fast_write_longint(x);
 end;
 
-procedure init_fast_output(file_name : string);
-var
-    open_flag: word;
+(* Written with FAST_REAL_PRECISION decimal digits, formatted as write(x:0:d)
+   does in the graders without fast output. *)
+procedure fast_write_real(x : double);
+var s : shortstring;
+    i : longint;
 begin
-    open_flag := fmCreate;
-    if FileExists(file_name) then
-        open_flag := fmOpenWrite;
-
-    output_stream := TFileStream.Create(file_name, open_flag);
-    output_stream.size := 0;
-    idx_output_buffer := 0;
+    str(x:0:FAST_REAL_PRECISION, s);
+    for i := 1 to length(s) do
+        fast_write_char(s[i]);
 end;
 
-procedure close_fast_output;
+(* An empty file name means stdout *)
+procedure init_fast_output(file_name : string);
 begin
-    if idx_output_buffer > 0 then (* Gotta flush them bytez *)
+    if file_name = '' then
+        fast_output_handle := StdOutputHandle
+    else
+        fast_output_handle := FileCreate(file_name);
+    if fast_output_handle = feInvalidHandle then
     begin
-        (* TODO: check if this is OK also when using unicode data *)
-        output_stream.Write(output_buffer, idx_output_buffer * sizeof(output_buffer[0]))
+        writeln(stderr, 'Cannot create ', file_name);
+        halt(1);
     end;
+    fast_output_len := 0;
+end;
 
-    output_stream.Free;
+procedure close_fast_output;
+begin
+    fast_write_flush;
+    if fast_output_handle <> StdOutputHandle then
+        FileClose(fast_output_handle);
 end;
@@ -0,0 +1,591 @@
+from os import unlink
+from gradergen import structures
+from gradergen.structures import PrimitiveType, Location, Variable, Array, IOVariables, IOArrays, LoopIndex, ArrayElement, is_single_char, checked_bounds
+from gradergen.languages import read_runtime_file
+from gradergen.languages.emitter import Emitter
+
+
+# The grader is a class named grader (whatever the name of its file), the
+# variables are its static fields and the functions of the contestant are
+# static methods of the class named as the task.
+class LanguageJava(object):
+    def __init__(self, fast_io, data):
+        self.data = data
+
+        self.grader = Emitter()
+        self.template = Emitter()
+        if fast_io == 1:
+            self.fast_io = True
+        else:
+            self.fast_io = False
+
+    extension = "java"
+
+    types_names = {
+        PrimitiveType.VOID: 'void',
+        PrimitiveType.INT: 'int',
+        PrimitiveType.LONGINT: 'long',
+        PrimitiveType.CHAR: 'char',
+        PrimitiveType.REAL: 'double'
+    }
+
+    template_values = {
+        PrimitiveType.VOID: '',
+        PrimitiveType.INT: '1',
+        PrimitiveType.LONGINT: '123456789123L',
+        PrimitiveType.CHAR: '\'f\'',
+        PrimitiveType.REAL: '123.456'
+    }
+
+    # Names used by the grader: a variable or a function of task.spec with
+    # one of these names (or with the name of the task) gets a trailing
+    # underscore.
+    reserved_names = {
+        "abstract", "assert", "boolean", "break", "byte", "case", "catch",
+        "char", "class", "const", "continue", "default", "do", "double",
+        "else", "enum", "extends", "final", "finally", "float", "for", "goto",
+        "if", "implements", "import", "instanceof", "int", "interface", "long",
+        "native", "new", "package", "private", "protected", "public",
+        "return", "short", "static", "strictfp", "super", "switch",
+        "synchronized", "this", "throw", "throws", "transient", "try", "void",
+        "volatile", "while", "true", "false", "null", "var", "yield", "record",
+        "main", "args", "grader", "fr", "fw", "reader", "writer", "Reader",
+        "FastReader", "FastWriter", "FAST_REAL_PRECISION", "System", "String",
+        "Character", "Integer", "Long", "Double", "Math", "Locale",
+        "BigDecimal", "RoundingMode", "StandardCharsets", "GRADERGEN_PROFILE", "GRADERGEN_CHECK_BOUNDS",
+    }
+
+    headers = """\
+import java.io.*;
+import java.math.BigDecimal;
+import java.math.RoundingMode;
+import java.nio.charset.StandardCharsets;
+"""
+
+    profile_imports = """\
+import java.util.Locale;
+"""
+
+    class_begin = """\
+
+class grader {
+	static PrintWriter fw;
+
+	// The reals are written as printf("%%.%(precision)sf") does in the C
+	// graders: the exact binary value is rounded half to even.
+	static String gradergen_real(double x) {
+		boolean minus = Double.doubleToRawLongBits(x) < 0;
+		if (Double.isNaN(x)) return minus ? "-nan" : "nan";
+		if (Double.isInfinite(x)) return minus ? "-inf" : "inf";
+		String res = new BigDecimal(x).setScale(%(precision)s, RoundingMode.HALF_EVEN).toPlainString();
+		// The zeros have no sign in BigDecimal
+		if (minus && res.charAt(0) != '-') res = "-" + res;
+		return res;
+	}
+"""
+
+    # Reads the input one line at a time, the values are separated by
+    # whitespaces (the chars can also be not separated at all).
+    reader_class = """\
+	static class Reader {
+		final BufferedReader stream;
+		String line = "";
+		int pos = 0;
+
+		Reader(InputStream stream) {
+			this.stream = new BufferedReader(new InputStreamReader(stream, StandardCharsets.ISO_8859_1));
+		}
+
+		// Skips the whitespaces, reading the next lines if needed.
+		void skip() throws IOException {
+			while (true) {
+				while (pos < line.length() && Character.isWhitespace(line.charAt(pos))) pos++;
+				if (pos < line.length()) return;
+				line = stream.readLine();
+				pos = 0;
+				if (line == null) throw new EOFException("The input is over.");
+			}
+		}
+
+		String token() throws IOException {
+			skip();
+			int start = pos;
+			while (pos < line.length() && !Character.isWhitespace(line.charAt(pos))) pos++;
+			return line.substring(start, pos);
+		}
+
+		int read_int() throws IOException {
+			return Integer.parseInt(token());
+		}
+
+		long read_longint() throws IOException {
+			return Long.parseLong(token());
+		}
+
+		double read_real() throws IOException {
+			return Double.parseDouble(token());
+		}
+
+		char read_char() throws IOException {
+			skip();
+			return line.charAt(pos++);
+		}
+
+		// A row of exactly row.length chars, without whitespaces.
+		void read_string(char[] row) throws IOException {
+			if (row.length == 0) return;
+			String token = token();
+			if (token.length() != row.length) throw new IOException("A string of the input is not made of " + row.length + " chars.");
+			token.getChars(0, row.length, row, 0);
+		}
+	}
+"""
+
+    # fw is a PrintWriter in both graders, as it can also be used by the
+    # functions of include_callable.
+    main_function = """\
+
+	public static void main(String[] args) throws IOException {
+		InputStream fr = %(input)s;
+		fw = new PrintWriter(new BufferedWriter(new OutputStreamWriter(%(output)s, StandardCharsets.ISO_8859_1), 1 << 16));
+		Reader reader = new Reader(fr);
+"""
+    main_function_fast_io = """\
+
+	public static void main(String[] args) throws IOException {
+		InputStream fr = %(input)s;
+		fw = new PrintWriter(new OutputStreamWriter(%(output)s, StandardCharsets.ISO_8859_1));
+		FastReader reader = new FastReader(fr);
+		FastWriter writer = new FastWriter(fw);
+"""
+
+    footers = """\
+
+		fr.close();
+		fw.close();
+"""
+    footers_fast_io = """\
+
+		writer.flush();
+		fr.close();
+		fw.close();
+"""
+
+    main_end = """\
+	}
+}
+"""
+
+    # Timers of the phases of the grader and of each call, they are printed
+    # to stderr only if the environment variable GRADERGEN_PROFILE is set.
+    profile_headers = """\
+
+	static final boolean GRADERGEN_PROFILE = System.getenv("GRADERGEN_PROFILE") != null;
+
+	static void gradergen_stop(long start, String phase) {
+		if (GRADERGEN_PROFILE) {
+			System.err.print(String.format(Locale.ROOT, "%s: %.6f s\\n", phase, (System.nanoTime() - start) * 1e-9));
+		}
+	}
+"""
+
+    # The bounds are checked unless the environment variable
+    # GRADERGEN_NO_CHECK_BOUNDS is set.
+    check_bounds_headers = """\
+
+	static final boolean GRADERGEN_CHECK_BOUNDS = System.getenv("GRADERGEN_NO_CHECK_BOUNDS") == null;
+"""
+
+    comments = {
+        "dec_var": "Declaring variables",
+        "include_grader": "Functions ad-hoc for this grader",
+        "include_callable": "Functions called by the contestant solution",
+        "input": "Reading input",
+        "call_fun": "Calling functions",
+        "output": "Writing output",
+    }
+
+    # The name used in java for a variable or a function of task.spec
+    def name(self, name):
+        if name in self.reserved_names or name == self.data["task_name"]:
+            return name + "_"
+        return name
+
+    # The name of a variable, array, element of an array or loop index
+    def variable(self, var):
+        if type(var) == LoopIndex:
+            return var.name
+        if type(var) == ArrayElement:
+            return self.name(var.array.name) + "".join("[" + index.name + "]" for index in var.indexes)
+        return self.name(var.name)
+
+    def expression(self, expr):
+        if expr.var is None:
+            return str(expr.const)
+        res = ""
+        if expr.coef == -1:
+            res += "-"
+        elif expr.coef != 1:
+            res += str(expr.coef) + "*"
+        res += self.name(expr.var.name)
+        if expr.const > 0:
+            res += "+" + str(expr.const)
+        elif expr.const < 0:
+            res += str(expr.const)
+        return res
+
+    # The sizes of the arrays are ints in java
+    def size(self, expr):
+        if expr.var is not None and expr.var.type == PrimitiveType.LONGINT:
+            return "(int)(" + self.expression(expr) + ")"
+        return self.expression(expr)
+
+    # array type
+    def at(self, type, dim):
+        return self.types_names[type] + "[]"*dim
+
+    # Print the string corresponding to a parameter, the parameters passed
+    # by reference that are not arrays are arrays of a single element.
+    def print_parameters(self, params):
+        parameters_string = []
+        for param in params:
+            dim = param.dim
+            if param.by_ref and dim == 0:
+                dim = 1
+            parameters_string.append(self.at(param.type, dim) + " " + self.name(param.name))
+        return ", ".join(parameters_string)
+
+    # write line
+    def write_line(self, line = "", tabulation = 0):
+        self.grader.write_line(line, tabulation)
+
+    # start and stop a timer (see profile_headers)
+    def start_timer(self, timer):
+        self.write_line("long gradergen_{0} = System.nanoTime();".format(timer), 2)
+
+    def stop_timer(self, timer, phase):
+        self.write_line("gradergen_stop(gradergen_{0}, \"{1}\");".format(timer, phase), 2)
+
+    # write comment
+    def write_comment(self, short_description, tabulation = 1):
+        if len(self.comments[short_description]) > 0:
+            self.grader.write("\n" + ("\t"*tabulation) + "// " + self.comments[short_description] +"\n")
+
+    def declare_variable(self, var):
+        self.write_line("static {0} {1};".format(self.types_names[var.type], self.name(var.name)), 1)
+
+    def declare_array(self, arr):
+        self.write_line("static {0} {1};".format(self.at(arr.type, arr.dim), self.name(arr.name)), 1)
+
+    # All the rows are allocated at once
+    def allocate_array(self, arr):
+        sizes = "".join("[" + self.size(size) + "]" for size in arr.sizes)
+        self.write_line("{0} = new {1}{2};".format(self.name(arr.name), self.types_names[arr.type], sizes), 2)
+
+    # Opens a loop for each of the given sizes, returns the depth reached.
+    def open_loops(self, sizes):
+        for i, size in enumerate(sizes):
+            self.write_line("for (int {0} = 0; {0} < {1}; {0}++) {{".format("i" + str(i), self.expression(size)), i+2)
+        return len(sizes)
+
+    def close_loops(self, depth):
+        for i in range(depth):
+            self.write_line("}", depth - i + 1)
+
+    def read_arrays(self, all_arrs):
+        depth = self.open_loops(all_arrs[0].sizes)
+        indexes = "".join("[i" + str(x) + "]" for x in range(depth))
+        for arr in all_arrs:
+            self.write_line("{0} = reader.read_{1}();".format(self.name(arr.name) + indexes, arr.type.value), depth+2)
+        for arr in all_arrs:
+            self.check_bounds(arr, self.name(arr.name) + indexes, depth+2)
+        self.close_loops(depth)
+
+    # Each row of chars is read at once, with read_string if the row is a
+    # string of the input ({string}), otherwise with read_chars.
+    def read_string_array(self, arr, method):
+        depth = self.open_loops(arr.sizes[:-1])
+        row = self.name(arr.name) + "".join("[i" + str(x) + "]" for x in range(depth))
+        self.write_line("reader.{0}({1});".format(method, row), depth+2)
+        self.close_loops(depth)
+
+    def read_variables(self, all_vars):
+        for var in all_vars:
+            self.write_line("{0} = reader.read_{1}();".format(self.name(var.name), var.type.value), 2)
+        for var in all_vars:
+            self.check_bounds(var, self.name(var.name), 2)
+
+    # The bounds given in task.spec are checked explicitly, as assert is
+    # executed only with assertions enabled (java -ea), while the other
+    # graders check them by default. The checks are skipped when
+    # GRADERGEN_CHECK_BOUNDS is false.
+    def check_bounds(self, var, value, tabulation):
+        bound_min, bound_max = checked_bounds(var)
+        suffix = "L" if var.type == PrimitiveType.LONGINT else ""
+        conditions = []
+        if bound_min is not None:
+            conditions.append("{0}{1} <= {2}".format(bound_min, suffix, value))
+        if bound_max is not None:
+            conditions.append("{0} <= {1}{2}".format(value, bound_max, suffix))
+        if conditions:
+            self.write_line("if (GRADERGEN_CHECK_BOUNDS && !({0})) throw new IllegalStateException(\"{1} is out of the bounds [{2}..{3}]\");".format(" && ".join(conditions), var.name, *var.bounds), tabulation)
+
+    # The parameters passed by reference that are not arrays are passed as
+    # arrays of a single element, each one with a different name.
+    def call_function(self, fun):
+        parameters = []
+        references = []
+        for var, by_ref in fun.parameters:
+            if by_ref and structures.dimension(var) == 0:
+                reference = "gradergen_ref" + str(self.references)
+                self.references += 1
+                references.append((reference, var))
+                parameters.append(reference)
+            else:
+                parameters.append(self.variable(var))
+
+        # A repeated call is nested in a loop for each repetition
+        depth = self.open_loops(fun.loops)
+
+        for reference, var in references:
+            self.write_line("{0}[] {1} = {{{2}}};".format(self.types_names[var.type], reference, self.variable(var)), depth+2)
+        if fun.prototype.location == Location.GRADER:
+            function = self.name(fun.name)
+        else:
+            function = self.data["task_name"] + "." + self.name(fun.name)
+        if fun.return_var is None:
+            self.write_line("{0}({1});".format(function, ", ".join(parameters)), depth+2)
+        else:
+            self.write_line("{2} = {0}({1});".format(function, ", ".join(parameters), self.variable(fun.return_var)), depth+2)
+        for reference, var in references:
+            self.write_line("{1} = {0}[0];".format(reference, self.variable(var)), depth+2)
+
+        self.close_loops(depth)
+
+    # A value converted to a string that can be concatenated
+    def to_string(self, type, value):
+        if type == PrimitiveType.REAL:
+            return "gradergen_real({0})".format(value)
+        return value
+
+    def write_value(self, type, value, tabulation):
+        if self.fast_io:
+            self.write_line("writer.write_{0}({1});".format(type.value, value), tabulation)
+        else:
+            self.write_line("fw.print({0});".format(self.to_string(type, value)), tabulation)
+
+    def write_separator(self, separator, tabulation):
+        if self.fast_io:
+            self.write_line("writer.write_char('{0}');".format(separator), tabulation)
+        else:
+            self.write_line("fw.print('{0}');".format(separator), tabulation)
+
+    def write_single_array(self, arr):
+        if arr.type == PrimitiveType.CHAR:
+            self.write_string_array(arr)
+            return
+
+        depth = self.open_loops(arr.sizes)
+        value = self.name(arr.name) + "".join("[i" + str(x) + "]" for x in range(depth))
+        self.write_value(arr.type, value, depth+2)
+        self.write_separator(" ", depth+2)
+        self.write_line("}", depth+1)
+        self.write_separator("\\n", depth+1)
+        self.close_loops(depth-1)
+
+    # Each row of chars is written at once
+    def write_string_array(self, arr):
+        depth = self.open_loops(arr.sizes[:-1])
+        row = self.name(arr.name) + "".join("[i" + str(x) + "]" for x in range(depth))
+        if self.fast_io:
+            self.write_line("writer.write_chars({0});".format(row), depth+2)
+        else:
+            self.write_line("fw.print({0});".format(row), depth+2)
+        self.write_separator("\\n", depth+2)
+        self.close_loops(depth)
+
+    def write_values(self, types_values, tabulation):
+        if self.fast_io:
+            for i, (type, value) in enumerate(types_values):
+                if i != 0:
+                    self.write_separator(" ", tabulation)
+                self.write_value(type, value, tabulation)
+            self.write_separator("\\n", tabulation)
+        else:
+            # A string literal is between any two values, so that they are
+            # concatenated and not summed.
+            strings = [self.to_string(type, value) for type, value in types_values]
+            self.write_line("fw.print({0} + \"\\n\");".format(" + \" \" + ".join(strings)), tabulation)
+
+    def write_many_arrays(self, all_arrs):
+        depth = self.open_loops(all_arrs[0].sizes)
+        indexes = "".join("[i" + str(x) + "]" for x in range(depth))
+        self.write_values([(arr.type, self.name(arr.name) + indexes) for arr in all_arrs], depth+2)
+        self.close_loops(depth)
+
+    def write_variables(self, all_vars):
+        self.write_values([(var.type, self.name(var.name)) for var in all_vars], 2)
+
+    def insert_headers(self):
+        self.grader.write(self.headers)
+        if self.data["profile"]:
+            self.grader.write(self.profile_imports)
+        self.grader.write(self.class_begin % {"precision": self.data["real_precision"]})
+        if self.data["profile"]:
+            self.grader.write(self.profile_headers)
+        if any(checked_bounds(var) != (None, None) for var in self.data["variables"]):
+            self.grader.write(self.check_bounds_headers)
+
+    def insert_main(self):
+        input_file, output_file = self.data["input_file"], self.data["output_file"]
+        streams = {
+            "input": "System.in" if input_file == "" else "new FileInputStream(\"" + input_file + "\")",
+            "output": "System.out" if output_file == "" else "new FileOutputStream(\"" + output_file + "\")",
+        }
+        if self.fast_io:
+            self.grader.write("\n\tstatic final int FAST_REAL_PRECISION = {0};\n".format(self.data["real_precision"]))
+            self.grader.write("\n" + read_runtime_file("fast_io." + self.extension))
+            self.grader.write(self.main_function_fast_io % streams)
+        else:
+            self.grader.write("\n" + self.reader_class)
+            self.grader.write(self.main_function % streams)
+
+    def insert_footers(self):
+        if self.fast_io:
+            self.grader.write(self.footers_fast_io)
+        else:
+            self.grader.write(self.footers)
+
+    def write_files(self, grader_name, template_name):
+        self.write_grader()
+        self.write(grader_name, self.grader.getvalue())
+
+        self.write_template()
+        self.write(template_name, self.template.getvalue())
+
+    def write_grader(self):
+        self.grader = Emitter()
+        # Names of the arrays already allocated.
+        self.allocated = set()
+        # Number of the arrays used to pass parameters by reference.
+        self.references = 0
+        self.insert_headers()
+
+        self.write_comment("dec_var")
+        for var in self.data["variables"]:
+            if type(var) == Variable:
+                self.declare_variable(var)
+            elif type(var) == Array:
+                self.declare_array(var)
+
+        if "include_grader" in self.data:
+            self.write_comment("include_grader")
+            self.grader.write(self.data["include_grader"])
+
+        if "include_callable" in self.data:
+            self.write_comment("include_callable")
+            self.grader.write(self.data["include_callable"])
+
+        self.insert_main()
+        self.write_comment("input", 2)
+        if self.data["profile"]:
+            self.start_timer("input")
+        for input_line in self.data["input"]:
+            if type(input_line) == IOArrays:
+                for arr in input_line.arrays:
+                    self.allocate_array(arr)
+                    self.allocated.add(arr.name)
+                if input_line.as_string:
+                    self.read_string_array(input_line.arrays[0], "read_string")
+                elif self.fast_io and is_single_char(input_line):
+                    self.read_string_array(input_line.arrays[0], "read_chars")
+                else:
+                    self.read_arrays(input_line.arrays)
+
+            elif type(input_line) == IOVariables:
+                self.read_variables(input_line.variables)
+
+        if self.data["profile"]:
+            self.stop_timer("input", self.comments["input"])
+
+        self.write_comment("call_fun", 2)
+        if self.data["profile"]:
+            self.start_timer("calls")
+        for call_number, fun in enumerate(self.data["calls"]):
+            for var in [var for (var, by_ref) in fun.parameters] + [fun.return_var]:
+                arr = structures.base_variable(var)
+                if type(arr) == Array and arr.name not in self.allocated:
+                    self.allocate_array(arr)
+                    self.allocated.add(arr.name)
+
+            if self.data["profile"]:
+                self.start_timer("call" + str(call_number))
+            self.call_function(fun)
+            if self.data["profile"]:
+                self.stop_timer("call" + str(call_number), "Call {0} ({1})".format(call_number + 1, fun.name))
+        if self.data["profile"]:
+            self.stop_timer("calls", self.comments["call_fun"])
+
+        self.write_comment("output", 2)
+        if self.data["profile"]:
+            self.start_timer("output")
+        for output_line in self.data["output"]:
+            if type(output_line) == IOArrays:
+                if output_line.as_string:
+                    self.write_string_array(output_line.arrays[0])
+                elif len(output_line.arrays) > 1:
+                    self.write_many_arrays(output_line.arrays)
+                else:
+                    self.write_single_array(output_line.arrays[0])
+            elif type(output_line) == IOVariables:
+                self.write_variables(output_line.variables)
+
+        # The output is timed until it is flushed and the files are closed
+        self.insert_footers()
+        if self.data["profile"]:
+            self.stop_timer("output", self.comments["output"])
+        self.grader.write(self.main_end)
+
+    # The class is not public, so that the template compiles with any file
+    # name (the solution is saved as task_name.java).
+    def write_template(self):
+        self.template = Emitter()
+        self.template.write("class {0} {{\n".format(self.data["task_name"]))
+        first = True
+        for fun in self.data["prototypes"]:
+            if fun.location == Location.GRADER: # Skipping prototypes defined in include_grader
+                continue
+            if not first:
+                self.template.write("\n")
+            first = False
+            printed_parameters = self.print_parameters(fun.parameters)
+            self.template.write("\tstatic {0} {1}({2}) {{\n".format(self.types_names[fun.type], self.name(fun.name), printed_parameters))
+
+            # Variables passed by ref are filled (the ones that are not arrays
+            # are arrays of a single element)
+            for param in fun.parameters:
+                if param.by_ref:
+                    self.template.write("\t\t{0}{1} = {2};\n".format(self.name(param.name), "[0]"*max(param.dim, 1), self.template_values[param.type]))
+            if fun.type != PrimitiveType.VOID:
+                self.template.write("\t\treturn {0};\n".format(self.template_values[fun.type]))
+
+            self.template.write("\t}\n")
+        self.template.write("}\n")
+
+    def write(self, filename, source):
+        # An unchanged file is not rewritten, so that its mtime is kept
+        try:
+            with open(filename, "r") as f:
+                if f.read() == source:
+                    return
+        except (OSError, UnicodeDecodeError):
+            pass
+
+        # Unlink is used to avoid following symlink
+        try:
+            unlink(filename)
+        except OSError:
+            pass
+
+        with open(filename, "w") as f:
+            f.write(source)
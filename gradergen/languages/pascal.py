@@ -1,15 +1,16 @@
-import pkg_resources
-from os import unlink
+from os import unlink, path
 from gradergen import structures
-from gradergen.structures import PrimitiveType, Location, Variable, Array, Parameter, Prototype, Call, IOVariables, IOArrays, Expression
+from gradergen.structures import PrimitiveType, Location, Variable, Array, Parameter, Prototype, Call, IOVariables, IOArrays, Expression, checked_bounds
+from gradergen.languages import read_runtime_file
+from gradergen.languages.emitter import Emitter
 
 
 class LanguagePascal(object):
     def __init__(self, fast_io, data):
         self.data = data
 
-        self.grader = ""
-        self.template = ""
+        self.grader = Emitter()
+        self.template = Emitter()
         if fast_io == 1:
             self.fast_io = True
         else:
@@ -32,7 +33,7 @@ class LanguagePascal(object):
     }
 
     headers = """\
-uses %(task_name)s;
+uses %(task_name)s%(units)s;
 
 var
     fr, fw : text;
@@ -50,12 +51,52 @@ begin
 
    read_char_skip_whitespaces := c;
 end;
+%(string_helpers)s
+var
+"""
+
+    string_helpers = """
+{ used to read a row of exactly len chars, which is the rest of its line }
+procedure read_string_row(var s : array of char; len : longint);
+var
+   line : ansistring;
+   i : longint;
+   ok : boolean;
+begin
+   if len <= 0 then
+       exit;
+   s[0] := read_char_skip_whitespaces();
+   read(fr, line);
+   ok := length(line) >= len-1;
+   if ok and (len > 1) then
+       move(line[1], s[1], len-1);
+   for i := 0 to len-1 do
+       if s[i] in [#9..#13, ' '] then
+           ok := false;
+   for i := len to length(line) do
+       if not (line[i] in [#9..#13, ' ']) then
+           ok := false;
+   if not ok then
+   begin
+       writeln(stderr, 'A string of the input is not made of ', len, ' chars.');
+       halt(1);
+   end;
+end;
 
+{ used to write a row of len chars at once }
+procedure write_string_row(const s : array of char; len : longint);
 var
+   line : ansistring;
+begin
+   line := '';
+   if len > 0 then
+       SetString(line, @s[0], len);
+   writeln(fw, line);
+end;
 """
 
     headers_fast_io1 = """\
-uses %(task_name)s, Classes, sysutils;
+uses %(task_name)s, sysutils;
 """
     headers_fast_io2 = """\
 var    \
@@ -71,21 +112,39 @@ begin
     main_function_fast_io = """\
 
 begin
-    init_fast_input('input.txt');
-    init_fast_output('output.txt');
+    init_fast_input('%(input)s');
+    init_fast_output('%(output)s');
 """
 
     footers = """\
 
     close(fr);
     close(fw);
-end.
 """
     footers_fast_io = """\
 
     close_fast_input();
     close_fast_output();
+"""
+    main_end = """\
 end.
+"""
+
+    # Timers of the phases of the grader and of each call, they are printed
+    # to stderr and compiled only if GRADERGEN_PROFILE is defined.
+    # GetTickCount64 (of sysutils) counts milliseconds on a monotonic clock.
+    profile_units = "{$ifdef GRADERGEN_PROFILE}, sysutils{$endif}"
+    profile_procedures = """\
+
+{$ifdef GRADERGEN_PROFILE}
+var
+    %(timers)s : qword;
+
+procedure gradergen_stop(start : qword; phase : string);
+begin
+    writeln(stderr, phase, ': ', (GetTickCount64() - start) / 1000 :0:6, ' s');
+end;
+{$endif}
 """
 
     comments = {
@@ -130,31 +189,50 @@ end.
     def at(self, type, dim):
         return "array of "*dim + self.types_names[type]
 
+    # argument of write/writeln used to write a value of the given type
+    def output_value(self, type, value):
+        if type == PrimitiveType.REAL:
+            return "{0}:0:{1}".format(value, self.data["real_precision"])
+        return value
+
     # write line
     def write_line(self, line = "", tabulation = 0):
-        self.grader += "\t"*tabulation + line + "\n"
+        self.grader.write_line(line, tabulation)
+
+    # start and stop a timer (see profile_procedures)
+    def start_timer(self, timer):
+        self.write_line("{{$ifdef GRADERGEN_PROFILE}} gradergen_{0} := GetTickCount64(); {{$endif}}".format(timer), 1)
+
+    def stop_timer(self, timer, phase):
+        self.write_line("{{$ifdef GRADERGEN_PROFILE}} gradergen_stop(gradergen_{0}, '{1}'); {{$endif}}".format(timer, phase), 1)
 
     # write comment
     def write_comment(self, short_description, tabulation = 0):
         if len(self.comments[short_description]) > 0:
-            self.grader += "\n" + ("\t"*tabulation) + "{ " + self.comments[short_description] +" }\n"
+            self.grader.write("\n" + ("\t"*tabulation) + "{ " + self.comments[short_description] +" }\n")
 
     def declare_variable(self, var):
         self.write_line("{0} : {1};".format(var.name, self.types_names[var.type]), 1)
-        if var.type == PrimitiveType.REAL and self.fast_io:
-            raise NotImplementedError("In pascal fast input of floating point "
-                                      "variables is not supported.")
+
+    # An array of a single constant size is static, as it can be passed to
+    # the open array parameters. The other arrays are dynamic, because of the
+    # types of the parameters of the matrices. Arrays of bounded size are
+    # dynamic too, as length(A) must be the actual size.
+    def is_static(self, arr):
+        return arr.dim == 1 and arr.sizes[0].var is None and arr.sizes[0].const > 0
 
     def declare_array(self, arr):
+        if self.is_static(arr):
+            self.write_line("{0} : array[0..{1}] of {2};".format(arr.name, arr.sizes[0].const - 1, self.types_names[arr.type]), 1)
+            return
         self.write_line("{0} : {1};".format(arr.name, self.at(arr.type, arr.dim)), 1)
-        if arr.type == PrimitiveType.REAL and self.fast_io:
-            raise NotImplementedError("In pascal fast output of floating point "
-                                      "variables is not supported.")
 
     def declare_prototype(self, fun):  # In pascal it is not needed to declare user functions in grader.pas
         pass
 
     def allocate_array(self, arr):
+        if self.is_static(arr):
+            return
         self.write_line("Setlength({0}, {1});".format(arr.name, ", ".join([expr.to_string() for expr in arr.sizes])), 1)
 
     def read_arrays(self, all_arrs):
@@ -176,10 +254,27 @@ end.
                     self.write_line("{0} := read_char_skip_whitespaces();".format(arr.name + indexes), all_dim+1)
                 else:
                     self.write_line("read(fr, {0});".format(arr.name + indexes), all_dim+1)
+        for arr in all_arrs:
+            self.check_bounds(arr, arr.name + indexes, all_dim+1)
 
         for i in range(all_dim):
             self.write_line("end;", all_dim - i)
 
+    def read_string_array(self, arr):
+        dim = arr.dim
+        for i in range(dim - 1):
+            self.write_line("for {0} := 0 to {1}-1 do".format("i" + str(i), arr.sizes[i].to_string()), i+1)
+            self.write_line("begin", i+1)
+
+        row = arr.name + "".join("[i" + str(x) + "]" for x in range(dim - 1))
+        if self.fast_io:
+            self.write_line("fast_read_string({0}, {1});".format(row, arr.sizes[-1].to_string()), dim)
+        else:
+            self.write_line("read_string_row({0}, {1});".format(row, arr.sizes[-1].to_string()), dim)
+
+        for i in range(dim - 1):
+            self.write_line("end;", dim - i - 1)
+
     def read_variables(self, all_vars):
         if self.fast_io:
             for var in all_vars:
@@ -192,14 +287,41 @@ end.
                     self.write_line("read(fr, {0});".format(var.name), 1)
             # pointers = ", ".join(var.name for var in all_vars)
             # self.write_line("readln(fr, {0});".format(pointers), 1)
+        for var in all_vars:
+            self.check_bounds(var, var.name, 1)
+
+    # The bounds given in task.spec are checked explicitly, as Assert is
+    # compiled only with assertions enabled (fpc -Sa), while the other graders
+    # check them by default. The checks are compiled out with
+    # -dGRADERGEN_NO_CHECK_BOUNDS.
+    def check_bounds(self, var, value, tabulation):
+        bound_min, bound_max = checked_bounds(var)
+        conditions = []
+        if bound_min is not None:
+            conditions.append("({0} <= {1})".format(bound_min, value))
+        if bound_max is not None:
+            conditions.append("({0} <= {1})".format(value, bound_max))
+        if conditions:
+            self.write_line("{$ifndef GRADERGEN_NO_CHECK_BOUNDS}", tabulation)
+            self.write_line("if not ({0}) then".format(" and ".join(conditions)), tabulation)
+            self.write_line("begin", tabulation)
+            self.write_line("writeln(stderr, '{0} is out of the bounds [{1}..{2}]');".format(var.name, *var.bounds), tabulation+1)
+            self.write_line("halt(1);", tabulation+1)
+            self.write_line("end;", tabulation)
+            self.write_line("{$endif}", tabulation)
 
     def call_function(self, fun):
         parameters = ', '.join([var.name for (var, by_ref) in fun.parameters])
 
+        # A repeated call is nested in a loop for each repetition
+        depth = len(fun.loops)
+        for i in range(depth):
+            self.write_line("for {0} := 0 to {1}-1 do".format("i" + str(i), fun.loops[i].to_string()), i+1)
+
         if fun.return_var is None:
-            self.write_line("{0}({1});".format(fun.name, parameters), 1)
+            self.write_line("{0}({1});".format(fun.name, parameters), depth+1)
         else:
-            self.write_line("{2} := {0}({1});".format(fun.name, parameters, fun.return_var.name), 1)
+            self.write_line("{2} := {0}({1});".format(fun.name, parameters, fun.return_var.name), depth+1)
 
     def write_single_array(self, arr):
         dim = arr.dim
@@ -216,7 +338,7 @@ end.
             self.write_line("end;", dim - i)
             self.write_line("fast_write_char(chr(10));", dim - i)
         else:
-            antipointers = arr.name + indexes
+            antipointers = self.output_value(arr.type, arr.name + indexes)
             if arr.type != PrimitiveType.CHAR:
                 self.write_line("write(fw, {0}, ' ');".format(antipointers), dim+1)
             else:
@@ -227,6 +349,22 @@ end.
         for i in range(1, dim):
             self.write_line("end;", dim - i)
     
+    def write_string_array(self, arr):
+        dim = arr.dim
+        for i in range(dim - 1):
+            self.write_line("for {0} := 0 to {1}-1 do".format("i" + str(i), arr.sizes[i].to_string()), i+1)
+            self.write_line("begin", i+1)
+
+        row = arr.name + "".join("[i" + str(x) + "]" for x in range(dim - 1))
+        if self.fast_io:
+            self.write_line("fast_write_string({0}, {1});".format(row, arr.sizes[-1].to_string()), dim)
+            self.write_line("fast_write_char(chr(10));", dim)
+        else:
+            self.write_line("write_string_row({0}, {1});".format(row, arr.sizes[-1].to_string()), dim)
+
+        for i in range(dim - 1):
+            self.write_line("end;", dim - i - 1)
+
     def write_many_arrays(self, all_arrs):
         all_dim = all_arrs[0].dim
         all_sizes = all_arrs[0].sizes
@@ -243,7 +381,7 @@ end.
                     self.write_line("fast_write_char(' ');", all_dim + 1)
             self.write_line("fast_write_char(chr(10));", all_dim + 1)
         else:
-            antipointers = ", ' ', ".join(arr.name + indexes for arr in all_arrs)
+            antipointers = ", ' ', ".join(self.output_value(arr.type, arr.name + indexes) for arr in all_arrs)
             self.write_line("writeln(fw, {0});".format(antipointers), all_dim+1)
 
         for i in range(all_dim):
@@ -257,49 +395,61 @@ end.
                     self.write_line("fast_write_char(' ');", 1)
             self.write_line("fast_write_char(chr(10));", 1)
         else:
-            antipointers = ", ' ', ".join(var.name for var in all_vars)
+            antipointers = ", ' ', ".join(self.output_value(var.type, var.name) for var in all_vars)
             self.write_line("writeln(fw, {0});".format(antipointers), 1)
 
+    # Whether some rows are read or written as strings ({string})
+    def uses_strings(self):
+        return any(type(line) == IOArrays and line.as_string for line in self.data["input"] + self.data["output"])
+
     def insert_headers(self):
         if self.fast_io:
-            self.grader += self.headers_fast_io1 % {"task_name": self.data["task_name"]}
-            fast_io_file = open(pkg_resources.resource_filename("gradergen.languages", "fast_input.pas"), "r")
-            self.grader += "\n" + fast_io_file.read()
-            fast_io_file.close()
-            fast_io_file = open(pkg_resources.resource_filename("gradergen.languages", "fast_output.pas"), "r")
-            self.grader += "\n" + fast_io_file.read()
-            fast_io_file.close()
-            self.grader += self.headers_fast_io2
+            self.grader.write(self.headers_fast_io1 % {"task_name": self.data["task_name"]})
+            self.grader.write("\n" + read_runtime_file("fast_input.pas"))
+            self.grader.write("\nconst FAST_REAL_PRECISION = {0};\n".format(self.data["real_precision"]))
+            self.grader.write("\n" + read_runtime_file("fast_output.pas"))
+            self.grader.write(self.headers_fast_io2)
         else:
-            self.grader += self.headers % {"task_name": self.data["task_name"]}
+            self.grader.write(self.headers % {
+                "task_name": self.data["task_name"],
+                # sysutils is already used by the fast graders
+                "units": self.profile_units if self.data["profile"] else "",
+                "string_helpers": self.string_helpers if self.uses_strings() else "",
+            })
 
     def insert_main(self):
         if self.fast_io:
-            self.grader += self.main_function_fast_io
+            # An empty file name means stdin (stdout)
+            self.grader.write(self.main_function_fast_io % {
+                "input": self.data["input_file"],
+                "output": self.data["output_file"],
+            })
         else:
-            self.grader += self.main_function % {
+            self.grader.write(self.main_function % {
                 "input": "fr := input;" if self.data["input_file"] == "" else "assign(fr, '" + self.data["input_file"] + "');",
                 "output": "fw := output;" if self.data["output_file"] == "" else "assign(fw, '" + self.data["output_file"] + "');",
-            }
+            })
 
     def insert_footers(self):
         if self.fast_io:
-            self.grader += self.footers_fast_io
+            self.grader.write(self.footers_fast_io)
         else:
-            self.grader += self.footers
+            self.grader.write(self.footers)
 
     def write_files(self, grader_name, template_name):
         self.write_grader()
-        self.write(grader_name, self.grader)
+        self.write(grader_name, self.grader.getvalue())
 
         self.write_template()
-        self.write(template_name, self.template)
+        self.write(template_name, self.template.getvalue())
 
         if "include_callable" in self.data:
-            self.write(self.data["task_name"] + "lib.pas", self.data["include_callable"])
+            self.write(path.join(self.data["base_dir"], self.data["task_name"] + "lib.pas"), self.data["include_callable"])
 
     def write_grader(self):
-        self.grader = ""
+        self.grader = Emitter()
+        # Names of the arrays already allocated.
+        self.allocated = set()
         self.insert_headers()
 
         self.write_comment("dec_var")
@@ -309,8 +459,10 @@ end.
             else:
                 self.declare_array(var)
 
-        # Declaring iterator used in for loops
-        max_dim = max(arr.dim for arr in self.data["variables"] if type(arr) == Array)
+        # Declaring iterator used in for loops (reading and writing arrays or
+        # repeating calls)
+        max_dim = max([arr.dim for arr in self.data["variables"] if type(arr) == Array]
+                      + [len(fun.loops) for fun in self.data["calls"]] + [0])
         if max_dim > 0:
             self.write_comment("loop_iters")
             self.write_line(", ".join("i" + str(x) for x in range(max_dim)) + ": longint;", 1)
@@ -321,45 +473,77 @@ end.
 
         if "include_grader" in self.data:
             self.write_comment("include_grader")
-            self.grader += self.data["include_grader"]
+            self.grader.write(self.data["include_grader"])
             self.write_line()
 
+        if self.data["profile"]:
+            timers = ["input", "calls", "output"] + ["call" + str(i) for i in range(len(self.data["calls"]))]
+            self.grader.write(self.profile_procedures % {
+                "timers": ", ".join("gradergen_" + timer for timer in timers),
+            })
+
         self.insert_main()
         self.write_comment("input", 1)
+        if self.data["profile"]:
+            self.start_timer("input")
         for input_line in self.data["input"]:
             if type(input_line) == IOArrays:
                 for arr in input_line.arrays:
                     self.allocate_array(arr)
-                    arr.allocated = True
-                self.read_arrays(input_line.arrays)
+                    self.allocated.add(arr.name)
+                if input_line.as_string:
+                    self.read_string_array(input_line.arrays[0])
+                else:
+                    self.read_arrays(input_line.arrays)
 
             elif type(input_line) == IOVariables:
                 self.read_variables(input_line.variables)
 
+        if self.data["profile"]:
+            self.stop_timer("input", self.comments["input"])
+
         self.write_comment("call_fun", 1)
-        for fun in self.data["calls"]:
-            for (var, by_ref) in fun.parameters:
-                if type(var) == Array and var.allocated == False:
-                    self.allocate_array(var)
-                    var.allocated = True
+        if self.data["profile"]:
+            self.start_timer("calls")
+        for call_number, fun in enumerate(self.data["calls"]):
+            for var in [var for (var, by_ref) in fun.parameters] + [fun.return_var]:
+                arr = structures.base_variable(var)
+                if type(arr) == Array and arr.name not in self.allocated:
+                    self.allocate_array(arr)
+                    self.allocated.add(arr.name)
 
+            if self.data["profile"]:
+                self.start_timer("call" + str(call_number))
             self.call_function(fun)
+            if self.data["profile"]:
+                self.stop_timer("call" + str(call_number), "Call {0} ({1})".format(call_number + 1, fun.name))
+        if self.data["profile"]:
+            self.stop_timer("calls", self.comments["call_fun"])
 
         self.write_comment("output", 1)
+        if self.data["profile"]:
+            self.start_timer("output")
         for output_line in self.data["output"]:
             if type(output_line) == IOArrays:
-                if len(output_line.arrays) > 1:
+                if output_line.as_string:
+                    self.write_string_array(output_line.arrays[0])
+                elif len(output_line.arrays) > 1:
                     self.write_many_arrays(output_line.arrays)
                 else:
                     self.write_single_array(output_line.arrays[0])
             elif type(output_line) == IOVariables:
                 self.write_variables(output_line.variables)
 
+        # The output is timed until it is flushed and the files are closed
         self.insert_footers()
+        if self.data["profile"]:
+            self.stop_timer("output", self.comments["output"])
+        self.grader.write(self.main_end)
 
     def write_template(self):
-        self.template = "unit {0};\n\n".format(self.data["task_name"])
-        self.template += "interface\n\n"
+        self.template = Emitter()
+        self.template.write("unit {0};\n\n".format(self.data["task_name"]))
+        self.template.write("interface\n\n")
 
         
         # Checking multidimensional arrays, as they have to be defined ad-hoc.
@@ -377,10 +561,10 @@ end.
 
         # Defining ad-hoc matrices
         if len(matrix_types) > 0:
-            self.template += "type\n"
+            self.template.write("type\n")
             for matrix_type in matrix_types:
-                self.template += "\t{0}matrix = array of array of {0};\n".format(self.types_names[matrix_type])
-            self.template += "\n"
+                self.template.write("\t{0}matrix = array of array of {0};\n".format(self.types_names[matrix_type]))
+            self.template.write("\n")
         
         # Declarations
         for fun in self.data["prototypes"]:
@@ -388,14 +572,14 @@ end.
                 continue
             printed_parameters = self.print_parameters(fun.parameters)
             if fun.type == PrimitiveType.VOID:
-                self.template += "procedure {0}({1});\n\n".format(fun.name, printed_parameters)
+                self.template.write("procedure {0}({1});\n\n".format(fun.name, printed_parameters))
             else:
-                self.template += "function {0}({1}): {2};\n\n".format(fun.name, printed_parameters, self.types_names[fun.type])
+                self.template.write("function {0}({1}): {2};\n\n".format(fun.name, printed_parameters, self.types_names[fun.type]))
 
-        self.template += "implementation\n\n"
+        self.template.write("implementation\n\n")
 
         if "include_callable" in self.data:
-            self.template += "uses {0}lib;\n\n".format(self.data["task_name"])
+            self.template.write("uses {0}lib;\n\n".format(self.data["task_name"]))
 
         # Definitions
         for fun in self.data["prototypes"]:
@@ -403,31 +587,39 @@ end.
                 continue
             printed_parameters = self.print_parameters(fun.parameters)
             if fun.type == PrimitiveType.VOID:
-                self.template += "procedure {0}({1});\n".format(fun.name, printed_parameters)
+                self.template.write("procedure {0}({1});\n".format(fun.name, printed_parameters))
             else:
-                self.template += "function {0}({1}): {2};\n".format(fun.name, printed_parameters, self.types_names[fun.type])
+                self.template.write("function {0}({1}): {2};\n".format(fun.name, printed_parameters, self.types_names[fun.type]))
 
-            self.template += "begin\n"
+            self.template.write("begin\n")
 
             # Variables passed by ref are filled in the template
             for param in fun.parameters:
                 if param.by_ref:
                     if param.dim == 0:
-                        self.template += "\t{0} := {1};\n".format(param.name, self.template_values[param.type])
+                        self.template.write("\t{0} := {1};\n".format(param.name, self.template_values[param.type]))
                     else:
-                        self.template += "\t{0}{1} := {2};\n".format(param.name, "[0]"*param.dim, self.template_values[param.type])
+                        self.template.write("\t{0}{1} := {2};\n".format(param.name, "[0]"*param.dim, self.template_values[param.type]))
 
             if fun.type == PrimitiveType.VOID:
-                self.template += "\t\n"
+                self.template.write("\t\n")
             else:
-                self.template += "\t{0} := {1};\n".format(fun.name, self.template_values[fun.type])
+                self.template.write("\t{0} := {1};\n".format(fun.name, self.template_values[fun.type]))
 
-            self.template += "end;\n\n"
+            self.template.write("end;\n\n")
 
 
-        self.template += "end.\n"
+        self.template.write("end.\n")
 
     def write(self, filename, source):
+        # An unchanged file is not rewritten, so that its mtime is kept
+        try:
+            with open(filename, "r") as f:
+                if f.read() == source:
+                    return
+        except (OSError, UnicodeDecodeError):
+            pass
+
         # Unlink is used to avoid following symlink
         try:
             unlink(filename)
@@ -0,0 +1,551 @@
+import ast
+import builtins
+import keyword
+import re
+from os import unlink
+from gradergen import structures
+from gradergen.structures import PrimitiveType, Location, Variable, Array, IOVariables, IOArrays, LoopIndex, ArrayElement, checked_bounds
+from gradergen.languages import read_runtime_file
+from gradergen.languages.emitter import Emitter
+
+
+class LanguagePython(object):
+    def __init__(self, fast_io, data):
+        self.data = data
+
+        self.grader = Emitter()
+        self.template = Emitter()
+        if fast_io == 1:
+            self.fast_io = True
+        else:
+            self.fast_io = False
+
+    extension = "py"
+
+    template_values = {
+        PrimitiveType.VOID: '',
+        PrimitiveType.INT: '1',
+        PrimitiveType.LONGINT: '123456789123',
+        PrimitiveType.CHAR: '\'f\'',
+        PrimitiveType.REAL: '123.456'
+    }
+
+    # Values of the arrays allocated before the calls.
+    zero_values = {
+        PrimitiveType.INT: '0',
+        PrimitiveType.LONGINT: '0',
+        PrimitiveType.CHAR: '"\\0"',
+        PrimitiveType.REAL: '0.0'
+    }
+
+    array_codes = {
+        PrimitiveType.INT: 'i',
+        PrimitiveType.LONGINT: 'q',
+        PrimitiveType.REAL: 'd'
+    }
+
+    stdio_types = {
+        PrimitiveType.INT: 'd',
+        PrimitiveType.LONGINT: 'd',
+        PrimitiveType.CHAR: 'c',
+        PrimitiveType.REAL: 'f'
+    }
+
+    # Names used by the grader: a variable or a function of task.spec with
+    # one of these names, or named as the indexes of the loops (i0, i1, ...)
+    # or as the helpers of the grader (gradergen_...), gets a trailing
+    # underscore, since the grader runs at module level.
+    reserved_names = set(keyword.kwlist) | set(dir(builtins)) | {
+        "sys", "os", "time", "re", "array", "fr", "fw", "reader", "writer",
+        "Reader", "FastReader", "FastWriter", "FAST_REAL_PRECISION",
+    }
+    reserved_pattern = re.compile(r"i[0-9]+|gradergen_.*")
+
+    headers = """\
+import sys
+import re
+"""
+
+    # Reads the input one line at a time, the values are separated by
+    # whitespaces (the chars can also be not separated at all).
+    reader_class = """\
+class Reader:
+	token = re.compile(r"\\S+")
+	char = re.compile(r"\\S")
+
+	def __init__(self, stream):
+		self.stream = stream
+		self.line = ""
+		self.pos = 0
+
+	def search(self, pattern):
+		match = pattern.search(self.line, self.pos)
+		while match is None:
+			self.line = self.stream.readline()
+			if self.line == "":
+				raise EOFError("The input is over.")
+			match = pattern.search(self.line)
+		self.pos = match.end()
+		return match.group()
+
+	def read_int(self):
+		return int(self.search(self.token))
+
+	read_longint = read_int
+
+	def read_real(self):
+		return float(self.search(self.token))
+
+	def read_char(self):
+		return self.search(self.char)
+
+	# A row of exactly count chars, without whitespaces.
+	def read_string(self, count):
+		if count == 0:
+			return []
+		token = self.search(self.token)
+		if len(token) != count:
+			raise ValueError("A string of the input is not made of %d chars." % count)
+		return list(token)
+"""
+
+    headers_fast_io = """\
+import sys
+from array import array
+"""
+
+    main_function = """\
+
+%(input)s
+%(output)s
+reader = Reader(fr)
+"""
+    main_function_fast_io = """\
+
+%(input)s
+%(output)s
+reader = FastReader(fr)
+writer = FastWriter(fw)
+"""
+
+    footers = """\
+
+fr.close()
+fw.close()
+"""
+    footers_fast_io = """\
+
+writer.flush()
+fr.close()
+fw.close()
+"""
+
+    # Timers of the phases of the grader and of each call, they are printed
+    # to stderr only if the environment variable GRADERGEN_PROFILE is set.
+    profile_headers = """\
+
+import os, time
+
+GRADERGEN_PROFILE = "GRADERGEN_PROFILE" in os.environ
+
+def gradergen_stop(start, phase):
+	if GRADERGEN_PROFILE:
+		sys.stderr.write("%s: %.6f s\\n" % (phase, time.perf_counter() - start))
+"""
+
+    comments = {
+        "dec_var": "Declaring variables",
+        "prototypes": "Functions of the contestant solution",
+        "include_grader": "Functions ad-hoc for this grader",
+        "include_callable": "Functions called by the contestant solution",
+        "input": "Reading input",
+        "call_fun": "Calling functions",
+        "output": "Writing output",
+    }
+
+    # The name used in python for a variable or a function of task.spec
+    def name(self, name):
+        if name in self.reserved_names or self.reserved_pattern.fullmatch(name):
+            return name + "_"
+        return name
+
+    # The name of a variable, array, element of an array or loop index
+    def variable(self, var):
+        if type(var) == LoopIndex:
+            return var.name
+        if type(var) == ArrayElement:
+            return self.name(var.array.name) + "".join("[" + index.name + "]" for index in var.indexes)
+        return self.name(var.name)
+
+    def expression(self, expr):
+        if expr.var is None:
+            return str(expr.const)
+        res = ""
+        if expr.coef == -1:
+            res += "-"
+        elif expr.coef != 1:
+            res += str(expr.coef) + "*"
+        res += self.name(expr.var.name)
+        if expr.const > 0:
+            res += "+" + str(expr.const)
+        elif expr.const < 0:
+            res += str(expr.const)
+        return res
+
+    # Print the string corresponding to a parameter
+    def print_parameters(self, params):
+        return ", ".join(self.name(param.name) for param in params)
+
+    # printf-style format used to write a value of the given type
+    def output_format(self, type):
+        if type == PrimitiveType.REAL:
+            return "%.{0}f".format(self.data["real_precision"])
+        return "%" + self.stdio_types[type]
+
+    # write line
+    def write_line(self, line = "", tabulation = 0):
+        self.grader.write_line(line, tabulation)
+
+    # start and stop a timer (see profile_headers)
+    def start_timer(self, timer):
+        self.write_line("gradergen_{0} = time.perf_counter()".format(timer))
+
+    def stop_timer(self, timer, phase):
+        self.write_line("gradergen_stop(gradergen_{0}, \"{1}\")".format(timer, phase))
+
+    # write comment
+    def write_comment(self, short_description, tabulation = 0):
+        if len(self.comments[short_description]) > 0:
+            self.grader.write("\n" + ("\t"*tabulation) + "# " + self.comments[short_description] +"\n")
+
+    def declare_variable(self, var):
+        self.write_line("{0} = 0".format(self.name(var.name)))
+
+    def declare_array(self, arr):
+        self.write_line("{0} = None".format(self.name(arr.name)))
+
+    # The prototypes defined by the contestant are imported from the solution
+    def declare_prototypes(self, prototypes):
+        names = [self.name(fun.name) for fun in prototypes if fun.location == Location.SOLUTION]
+        if len(names) > 0:
+            self.write_line("from {0} import {1}".format(self.data["task_name"], ", ".join(names)))
+
+    # Nested lists with the given sizes, each element being a new row.
+    def nested_lists(self, sizes, row):
+        res = row
+        for i in reversed(range(len(sizes))):
+            res = "[{0} for {1} in range({2})]".format(res, "i" + str(i), self.expression(sizes[i]))
+        return res
+
+    def allocate_array(self, arr):
+        size = self.expression(arr.sizes[-1])
+        if self.fast_io and arr.type != PrimitiveType.CHAR:
+            row = "array(\"{0}\", [{1}]) * ({2})".format(self.array_codes[arr.type], self.zero_values[arr.type], size)
+        else:
+            row = "[{0}] * ({1})".format(self.zero_values[arr.type], size)
+        self.write_line("{0} = {1}".format(self.name(arr.name), self.nested_lists(arr.sizes[:-1], row)))
+
+    # Only the lists containing the rows, which are read at once.
+    def allocate_rows(self, arr):
+        if arr.dim > 1:
+            row = "[None] * ({0})".format(self.expression(arr.sizes[-2]))
+            self.write_line("{0} = {1}".format(self.name(arr.name), self.nested_lists(arr.sizes[:-2], row)))
+
+    # Opens a loop for each of the given sizes, returns the depth reached.
+    def open_loops(self, sizes):
+        for i, size in enumerate(sizes):
+            self.write_line("for {0} in range({1}):".format("i" + str(i), self.expression(size)), i)
+        return len(sizes)
+
+    def read_arrays(self, all_arrs):
+        all_dim = all_arrs[0].dim
+        all_sizes = all_arrs[0].sizes
+        if self.fast_io:
+            # A row of all the arrays at a time
+            depth = self.open_loops(all_sizes[:-1])
+            indexes = "".join("[i" + str(x) + "]" for x in range(depth))
+            rows = ", ".join(self.name(arr.name) + indexes for arr in all_arrs)
+            if len(all_arrs) == 1:
+                self.write_line("{0} = reader.read_row(\"{1}\", {2})".format(rows, all_arrs[0].type.value, self.expression(all_sizes[-1])), depth)
+            else:
+                types = ", ".join("\"" + arr.type.value + "\"" for arr in all_arrs)
+                self.write_line("{0} = reader.read_columns(({1}), {2})".format(rows, types, self.expression(all_sizes[-1])), depth)
+            # The bounds of a whole row are checked with min and max, an empty
+            # row is given the bounds themselves
+            for arr in all_arrs:
+                row = self.name(arr.name) + indexes
+                bound_min, bound_max = checked_bounds(arr)
+                self.check_bounds(arr, "min({0}, default = {1})".format(row, bound_min), "max({0}, default = {1})".format(row, bound_max), depth)
+            return
+
+        depth = self.open_loops(all_sizes)
+        indexes = "".join("[i" + str(x) + "]" for x in range(all_dim))
+        for arr in all_arrs:
+            self.write_line("{0} = reader.read_{1}()".format(self.name(arr.name) + indexes, arr.type.value), depth)
+        for arr in all_arrs:
+            self.check_bounds(arr, self.name(arr.name) + indexes, self.name(arr.name) + indexes, depth)
+
+    # Each row of chars is read at once, as a single token
+    def read_string_array(self, arr):
+        depth = self.open_loops(arr.sizes[:-1])
+        row = self.name(arr.name) + "".join("[i" + str(x) + "]" for x in range(depth))
+        self.write_line("{0} = reader.read_string({1})".format(row, self.expression(arr.sizes[-1])), depth)
+
+    def read_variables(self, all_vars):
+        for var in all_vars:
+            self.write_line("{0} = reader.read_{1}()".format(self.name(var.name), var.type.value))
+        for var in all_vars:
+            self.check_bounds(var, self.name(var.name), self.name(var.name), 0)
+
+    # The bounds given in task.spec are checked with assert, which is skipped
+    # running python with -O. The minimum and the maximum of the values
+    # checked are given.
+    def check_bounds(self, var, minimum, maximum, tabulation):
+        bound_min, bound_max = checked_bounds(var)
+        conditions = []
+        if bound_min is not None:
+            conditions.append("{0} <= {1}".format(bound_min, minimum))
+        if bound_max is not None:
+            conditions.append("{0} <= {1}".format(maximum, bound_max))
+        if conditions:
+            self.write_line("assert {0}".format(" and ".join(conditions)), tabulation)
+
+    # The grader reads and writes strings, the parameters passed by reference
+    # that are not arrays are passed as lists of a single element.
+    def call_function(self, fun):
+        parameters = []
+        references = []
+        for var, by_ref in fun.parameters:
+            if by_ref and structures.dimension(var) == 0:
+                reference = "gradergen_ref" + str(len(references))
+                references.append((reference, self.variable(var)))
+                parameters.append(reference)
+            else:
+                parameters.append(self.variable(var))
+
+        # A repeated call is nested in a loop for each repetition
+        depth = self.open_loops(fun.loops)
+
+        for reference, name in references:
+            self.write_line("{0} = [{1}]".format(reference, name), depth)
+        if fun.return_var is None:
+            self.write_line("{0}({1})".format(self.name(fun.name), ", ".join(parameters)), depth)
+        else:
+            self.write_line("{2} = {0}({1})".format(self.name(fun.name), ", ".join(parameters), self.variable(fun.return_var)), depth)
+        for reference, name in references:
+            self.write_line("{1} = {0}[0]".format(reference, name), depth)
+
+    def write_single_array(self, arr):
+        if self.fast_io:
+            depth = self.open_loops(arr.sizes[:-1])
+            row = self.name(arr.name) + "".join("[i" + str(x) + "]" for x in range(depth))
+            self.write_line("writer.write_row(\"{0}\", {1})".format(arr.type.value, row), depth)
+            return
+
+        depth = self.open_loops(arr.sizes)
+        value = self.name(arr.name) + "".join("[i" + str(x) + "]" for x in range(depth))
+        if arr.type != PrimitiveType.CHAR:
+            self.write_line("fw.write(\"{0} \" % {1})".format(self.output_format(arr.type), value), depth)
+        else:
+            self.write_line("fw.write({0})".format(value), depth)
+        self.write_line("fw.write(\"\\n\")", depth - 1)
+
+    # Rows of chars are written as strings anyway
+    write_string_array = write_single_array
+
+    def write_many_arrays(self, all_arrs):
+        all_sizes = all_arrs[0].sizes
+        if self.fast_io:
+            depth = self.open_loops(all_sizes[:-1])
+            indexes = "".join("[i" + str(x) + "]" for x in range(depth))
+            types = ", ".join("\"" + arr.type.value + "\"" for arr in all_arrs)
+            rows = ", ".join(self.name(arr.name) + indexes for arr in all_arrs)
+            self.write_line("writer.write_columns(({0}), ({1}))".format(types, rows), depth)
+            return
+
+        depth = self.open_loops(all_sizes)
+        indexes = "".join("[i" + str(x) + "]" for x in range(depth))
+        format_string = " ".join(self.output_format(arr.type) for arr in all_arrs)
+        values = ", ".join(self.name(arr.name) + indexes for arr in all_arrs)
+        self.write_line("fw.write(\"{0}\\n\" % ({1},))".format(format_string, values), depth)
+
+    def write_variables(self, all_vars):
+        values = ", ".join(self.name(var.name) for var in all_vars)
+        if self.fast_io:
+            types = ", ".join("\"" + var.type.value + "\"" for var in all_vars)
+            self.write_line("writer.write_values(({0},), ({1},))".format(types, values))
+        else:
+            format_string = " ".join(self.output_format(var.type) for var in all_vars)
+            self.write_line("fw.write(\"{0}\\n\" % ({1},))".format(format_string, values))
+
+    def insert_headers(self):
+        if self.fast_io:
+            self.grader.write(self.headers_fast_io)
+        else:
+            self.grader.write(self.headers)
+        if self.data["profile"]:
+            self.grader.write(self.profile_headers)
+
+    def insert_main(self):
+        input_file, output_file = self.data["input_file"], self.data["output_file"]
+        if self.fast_io:
+            # The input is read as bytes, the output is written as latin-1 so
+            # that the chars are kept as they are.
+            self.grader.write("\nFAST_REAL_PRECISION = {0}\n".format(self.data["real_precision"]))
+            self.grader.write("\n" + read_runtime_file("fast_io." + self.extension))
+            self.grader.write(self.main_function_fast_io % {
+                "input": "fr = sys.stdin.buffer" if input_file == "" else "fr = open(\"" + input_file + "\", \"rb\")",
+                "output": "fw = open(sys.stdout.fileno(), \"w\", encoding = \"latin-1\", closefd = False)" if output_file == "" else "fw = open(\"" + output_file + "\", \"w\", encoding = \"latin-1\")",
+            })
+        else:
+            self.grader.write("\n" + self.reader_class)
+            self.grader.write(self.main_function % {
+                "input": "fr = sys.stdin" if input_file == "" else "fr = open(\"" + input_file + "\", \"r\")",
+                "output": "fw = sys.stdout" if output_file == "" else "fw = open(\"" + output_file + "\", \"w\")",
+            })
+
+    def insert_footers(self):
+        if self.fast_io:
+            self.grader.write(self.footers_fast_io)
+        else:
+            self.grader.write(self.footers)
+
+    def write_files(self, grader_name, template_name):
+        self.write_grader()
+        self.write(grader_name, self.grader.getvalue())
+
+        self.write_template()
+        self.write(template_name, self.template.getvalue())
+
+    def write_grader(self):
+        self.grader = Emitter()
+        # Names of the arrays already allocated.
+        self.allocated = set()
+        self.insert_headers()
+
+        self.write_comment("prototypes")
+        self.declare_prototypes(self.data["prototypes"])
+
+        self.write_comment("dec_var")
+        for var in self.data["variables"]:
+            if type(var) == Variable:
+                self.declare_variable(var)
+            elif type(var) == Array:
+                self.declare_array(var)
+
+        if "include_grader" in self.data:
+            self.write_comment("include_grader")
+            self.grader.write(self.data["include_grader"])
+            self.write_line()
+
+        if "include_callable" in self.data:
+            self.write_comment("include_callable")
+            self.grader.write(self.data["include_callable"])
+            self.write_line()
+            # The functions are added to the module of the solution, so that
+            # they are found there and they use the variables of the grader.
+            self.write_line("import {0}".format(self.data["task_name"]))
+            for function in ast.parse(self.data["include_callable"]).body:
+                if type(function) == ast.FunctionDef:
+                    self.write_line("{0}.{1} = {1}".format(self.data["task_name"], function.name))
+
+        self.insert_main()
+        self.write_comment("input")
+        if self.data["profile"]:
+            self.start_timer("input")
+        for input_line in self.data["input"]:
+            if type(input_line) == IOArrays:
+                for arr in input_line.arrays:
+                    if self.fast_io or input_line.as_string:
+                        self.allocate_rows(arr)
+                    else:
+                        self.allocate_array(arr)
+                    self.allocated.add(arr.name)
+                if input_line.as_string:
+                    self.read_string_array(input_line.arrays[0])
+                else:
+                    self.read_arrays(input_line.arrays)
+
+            elif type(input_line) == IOVariables:
+                self.read_variables(input_line.variables)
+
+        if self.data["profile"]:
+            self.stop_timer("input", self.comments["input"])
+
+        self.write_comment("call_fun")
+        if self.data["profile"]:
+            self.start_timer("calls")
+        for call_number, fun in enumerate(self.data["calls"]):
+            for var in [var for (var, by_ref) in fun.parameters] + [fun.return_var]:
+                arr = structures.base_variable(var)
+                if type(arr) == Array and arr.name not in self.allocated:
+                    self.allocate_array(arr)
+                    self.allocated.add(arr.name)
+
+            if self.data["profile"]:
+                self.start_timer("call" + str(call_number))
+            self.call_function(fun)
+            if self.data["profile"]:
+                self.stop_timer("call" + str(call_number), "Call {0} ({1})".format(call_number + 1, fun.name))
+        if self.data["profile"]:
+            self.stop_timer("calls", self.comments["call_fun"])
+
+        self.write_comment("output")
+        if self.data["profile"]:
+            self.start_timer("output")
+        for output_line in self.data["output"]:
+            if type(output_line) == IOArrays:
+                if output_line.as_string:
+                    self.write_string_array(output_line.arrays[0])
+                elif len(output_line.arrays) > 1:
+                    self.write_many_arrays(output_line.arrays)
+                else:
+                    self.write_single_array(output_line.arrays[0])
+            elif type(output_line) == IOVariables:
+                self.write_variables(output_line.variables)
+
+        # The output is timed until it is flushed and the files are closed
+        self.insert_footers()
+        if self.data["profile"]:
+            self.stop_timer("output", self.comments["output"])
+
+    def write_template(self):
+        self.template = Emitter()
+        for fun in self.data["prototypes"]:
+            if fun.location == Location.GRADER: # Skipping prototypes defined in include_grader
+                continue
+            printed_parameters = self.print_parameters(fun.parameters)
+            self.template.write("def {0}({1}):\n".format(self.name(fun.name), printed_parameters))
+
+            # Variables passed by ref are filled (the ones that are not arrays
+            # are lists of a single element)
+            body = []
+            for param in fun.parameters:
+                if param.by_ref:
+                    body.append("{0}{1} = {2}".format(self.name(param.name), "[0]"*max(param.dim, 1), self.template_values[param.type]))
+            if fun.type != PrimitiveType.VOID:
+                body.append("return {0}".format(self.template_values[fun.type]))
+            if len(body) == 0:
+                body.append("pass")
+            for line in body:
+                self.template.write("    " + line + "\n")
+
+            self.template.write("\n\n")
+
+    def write(self, filename, source):
+        # An unchanged file is not rewritten, so that its mtime is kept
+        try:
+            with open(filename, "r") as f:
+                if f.read() == source:
+                    return
+        except (OSError, UnicodeDecodeError):
+            pass
+
+        # Unlink is used to avoid following symlink
+        try:
+            unlink(filename)
+        except OSError:
+            pass
+
+        with open(filename, "w") as f:
+            f.write(source)
@@ -0,0 +1,165 @@
+// Begin validator library
+
+#include <limits.h>
+#include <string.h>
+
+// It relies on fast_read_next_char defined by the chosen I/O primitives.
+// The input is consumed one char at a time: validator_next is the first char
+// not consumed yet, validator_line and validator_column its position.
+
+static int validator_next;
+static long long validator_line = 1, validator_column = 1;
+
+static void validator_fail(const char* message) {
+	fprintf(stderr, "Line %lld, column %lld: %s\n", validator_line, validator_column, message);
+	exit(1);
+}
+
+static inline void validator_advance() {
+	if (validator_next == '\n') validator_line++, validator_column = 1;
+	else validator_column++;
+	validator_next = fast_read_next_char();
+}
+
+static inline int validator_is_digit(int c) {
+	return '0' <= c && c <= '9';
+}
+
+static void validator_open() {
+	validator_next = fast_read_next_char();
+}
+
+static inline void validator_read_space() {
+	if (validator_next != ' ') validator_fail("expected a single space");
+	validator_advance();
+}
+
+static inline void validator_read_newline() {
+	if (validator_next == '\r') validator_fail("expected the end of the line, found \\r (Windows line ending?)");
+	if (validator_next != '\n') validator_fail("expected the end of the line");
+	validator_advance();
+}
+
+static void validator_read_eof() {
+	if (validator_next != EOF) validator_fail("expected the end of the file");
+}
+
+// The size of an array, described by expression, must not be negative.
+static void validator_check_size(long long size, const char* expression) {
+	if (size < 0) {
+		fprintf(stderr, "Line %lld: %s is negative (%lld)\n", validator_line, expression, size);
+		exit(1);
+	}
+}
+
+// An integer between min and max, without leading zeros nor a sign on zero.
+static inline long long validator_read_integer(long long min, long long max) {
+	int minus = 0;
+	if (validator_next == '-') minus = 1, validator_advance();
+	if (!validator_is_digit(validator_next)) validator_fail("expected an integer");
+	if (validator_next == '0') {
+		validator_advance();
+		if (validator_is_digit(validator_next)) validator_fail("integer with leading zeros");
+		if (minus) validator_fail("negative zero");
+		return 0;
+	}
+
+	// The absolute value is accumulated as unsigned, where 19 digits always
+	// fit, so that the limits are checked only at the end.
+	unsigned long long limit = minus ? (unsigned long long)(-(min + 1)) + 1 : (unsigned long long)max;
+	unsigned long long value = 0;
+	int digits = 0;
+	while (validator_is_digit(validator_next)) {
+		value = value * 10 + (validator_next - '0');
+		digits++;
+		if (digits > 19) validator_fail("integer out of range");
+		validator_advance();
+	}
+	if (value > limit) validator_fail("integer out of range");
+	if (minus) return (long long)(0 - value);
+	return (long long)value;
+}
+
+// The bounds given in task.spec of an integer just read.
+static inline long long validator_check_bounds(long long value, long long min, long long max) {
+	if (value < min || value > max) {
+		fprintf(stderr, "Line %lld: %lld is out of the bounds [%lld..%lld]\n", validator_line, value, min, max);
+		exit(1);
+	}
+	return value;
+}
+
+static inline int validator_read_int() {
+	return (int)validator_read_integer(INT_MIN, INT_MAX);
+}
+
+static inline long long int validator_read_longint() {
+	return validator_read_integer(LLONG_MIN, LLONG_MAX);
+}
+
+// A printable char, other than the space.
+static inline char validator_read_char() {
+	if (validator_next <= ' ' || validator_next >= 127) validator_fail("expected a printable char");
+	char c = validator_next;
+	validator_advance();
+	return c;
+}
+
+// The chars of the real being read. The buffer grows with the token, as the
+// graders read reals of any length.
+static char validator_real_local[64];
+static char* validator_real_token = validator_real_local;
+static size_t validator_real_capacity = sizeof(validator_real_local);
+
+static inline void validator_take(size_t* len) {
+	if (*len + 1 == validator_real_capacity) {
+		char* token = malloc(2 * validator_real_capacity);
+		if (token == NULL) validator_fail("real number too long");
+		memcpy(token, validator_real_token, validator_real_capacity);
+		if (validator_real_token != validator_real_local) free(validator_real_token);
+		validator_real_token = token;
+		validator_real_capacity *= 2;
+	}
+	validator_real_token[(*len)++] = validator_next;
+	validator_advance();
+}
+
+// Takes the digits that follow, returns how many they are.
+static inline size_t validator_take_digits(size_t* len) {
+	size_t digits = 0;
+	for (; validator_is_digit(validator_next); digits++) validator_take(len);
+	return digits;
+}
+
+// A number with optional sign, fractional part and exponent, as strtod reads
+// it: -12, +3.25, 7., .5, 1e-05. At least a digit is needed before the
+// exponent.
+static inline double validator_read_real() {
+	size_t len = 0;
+	if (validator_next == '-' || validator_next == '+') validator_take(&len);
+	size_t digits = validator_take_digits(&len);
+	if (validator_next == '.') {
+		validator_take(&len);
+		digits += validator_take_digits(&len);
+	}
+	if (digits == 0) validator_fail("expected a real number");
+	if (validator_next == 'e' || validator_next == 'E') {
+		validator_take(&len);
+		if (validator_next == '-' || validator_next == '+') validator_take(&len);
+		if (validator_take_digits(&len) == 0) validator_fail("expected a real number");
+	}
+	validator_real_token[len] = '\0';
+	return strtod(validator_real_token, NULL);
+}
+
+// A row of exactly len printable chars, without spaces.
+static inline void validator_read_string(long long len) {
+	for (long long i = 0; i < len; i++) {
+		if (validator_next <= ' ' || validator_next >= 127) {
+			validator_fail(validator_next == '\n' || validator_next == EOF ? "string too short" : "expected a printable char");
+		}
+		validator_advance();
+	}
+}
+
+// End validator library
@@ -0,0 +1,143 @@
+from gradergen.structures import IOVariables, is_single_char
+from gradergen.languages import read_runtime_file
+from gradergen.languages.emitter import Emitter
+from gradergen.languages.C import LanguageC
+
+
+# A standalone C program checking that an input file follows exactly the input
+# section of task.spec: the variables of a line on a single line, a line for
+# each row of an array (the values separated by a single space, the chars of a
+# single char array not separated at all) and a line for each element of
+# arrays on the same line. This is the layout written by gradergen convert --to text.
+# It reads the file given as argument (or stdin) with the fast I/O primitives,
+# on the first error it prints the position to stderr and exits with 1.
+# The bounds of the values given in task.spec are checked too.
+class ValidatorC(LanguageC):
+    def __init__(self, data):
+        super().__init__(1, data)
+
+    headers = """\
+#include <stdio.h>
+#include <stdlib.h>
+
+static FILE *fr, *fw;
+"""
+
+    main_function = """\
+
+int main(int argc, char** argv) {
+    fr = argc > 1 ? fopen(argv[1], "rb") : stdin;
+    if (fr == NULL) {
+        perror(argv[1]);
+        return 2;
+    }
+    validator_open();
+"""
+
+    footers = """\
+
+    validator_read_eof();
+"""
+
+    comments = {
+        "dec_var": "Declaring variables",
+        "input": "Checking input",
+    }
+
+    # The call reading a value of the variable (or of an element of the
+    # array), checking its bounds if they are given.
+    def read_value(self, var):
+        call = "validator_read_{0}()".format(var.type.value)
+        if var.bounds is None:
+            return call
+        # -2^63 cannot be written as a literal
+        bounds = ["LLONG_MIN" if bound == -2**63 else str(bound) + "LL" for bound in var.bounds]
+        return "validator_check_bounds({0}, {1}, {2})".format(call, *bounds)
+
+    # Checks the values separated by spaces, each one saved in the given
+    # place (or discarded if it is None).
+    def check_values(self, vars_places, tabulation):
+        for i, (var, place) in enumerate(vars_places):
+            if i != 0:
+                self.write_line("validator_read_space();", tabulation)
+            if place is None:
+                self.write_line("{0};".format(self.read_value(var)), tabulation)
+            else:
+                self.write_line("{0} = {1};".format(place, self.read_value(var)), tabulation)
+
+    def check_variables(self, all_vars):
+        self.check_values([(var, var.name) for var in all_vars], 1)
+        self.write_line("validator_read_newline();", 1)
+
+    # Opens a loop for each of the given sizes, returns the depth reached.
+    def open_loops(self, sizes):
+        for i, size in enumerate(sizes):
+            self.write_line("for (long long {0} = 0; {0} < {1}; {0}++) {{".format("i" + str(i), size.to_string()), i+1)
+        return len(sizes)
+
+    def close_loops(self, depth):
+        for i in range(depth):
+            self.write_line("}", depth - i)
+
+    def check_string_array(self, arr):
+        depth = self.open_loops(arr.sizes[:-1])
+        self.write_line("validator_read_string({0});".format(arr.sizes[-1].to_string()), depth+1)
+        self.write_line("validator_read_newline();", depth+1)
+        self.close_loops(depth)
+
+    def check_single_array(self, arr):
+        depth = self.open_loops(arr.sizes[:-1])
+        last = "i" + str(depth)
+        self.write_line("for (long long {0} = 0; {0} < {1}; {0}++) {{".format(last, arr.sizes[-1].to_string()), depth+1)
+        self.write_line("if ({0} != 0) validator_read_space();".format(last), depth+2)
+        self.write_line("{0};".format(self.read_value(arr)), depth+2)
+        self.write_line("}", depth+1)
+        self.write_line("validator_read_newline();", depth+1)
+        self.close_loops(depth)
+
+    def check_many_arrays(self, all_arrs):
+        depth = self.open_loops(all_arrs[0].sizes)
+        self.check_values([(arr, None) for arr in all_arrs], depth+1)
+        self.write_line("validator_read_newline();", depth+1)
+        self.close_loops(depth)
+
+    def insert_main(self):
+        runtime_name = "fast_io_" + self.data["fast_io_runtime"] + "." + self.extension
+        for file_name in [runtime_name, "validator." + self.extension]:
+            self.grader.write("\n" + read_runtime_file(file_name))
+        self.grader.write(self.main_function)
+
+    def write_files(self, validator_name):
+        self.write_validator()
+        self.write(validator_name, self.grader.getvalue())
+
+    def write_validator(self):
+        self.grader = Emitter()
+        self.grader.write(self.headers)
+
+        # Only the variables read are needed, to know the sizes of the arrays.
+        self.write_comment("dec_var")
+        for input_line in self.data["input"]:
+            if type(input_line) == IOVariables:
+                for var in input_line.variables:
+                    self.declare_variable(var)
+
+        self.insert_main()
+        self.write_comment("input", 1)
+        for input_line in self.data["input"]:
+            if type(input_line) == IOVariables:
+                self.check_variables(input_line.variables)
+                continue
+
+            names = ", ".join(arr.name for arr in input_line.arrays)
+            for size in sorted(set(size.to_string() for size in input_line.sizes if size.var is not None)):
+                self.write_line("validator_check_size({0}, \"{0} (size of {1})\");".format(size, names), 1)
+            if is_single_char(input_line):
+                self.check_string_array(input_line.arrays[0])
+            elif len(input_line.arrays) > 1:
+                self.check_many_arrays(input_line.arrays)
+            else:
+                self.check_single_array(input_line.arrays[0])
+
+        self.grader.write(self.footers)
+        self.grader.write(self.main_end)
@@ -1,16 +1,20 @@
 import enum
 import sys
 
-# Here the lines matched by regex (defined as property of RegexParser) are 
-# transformed in objects. 
+# Here the lines parsed by SpecParser (or matched by the regexes of
+# RegexParser) are transformed in objects. 
 # Lots of compilation-like checks are done before creating the objects as: an 
 # array must be allocated before being written, the size of an array must be
 # an integer, etc...
 # Moreover, the constructors does not receive as parameters only the match_tree
-# generated by RegexParser.MatchTree, but can receive also the data_manager (the
+# generated by SpecParser.parse_line, but can receive also the data_manager (the
 # class containing all the data already parsed and exposing utility methods). 
 # The data_manager instance passed by parameter is not modified here and can 
 # be considered as if it had a const identifier.
+# The objects are immutable, so that all the language classes can share them:
+# what is known while parsing (as the variables already read) is tracked by
+# the data_manager, what is done while emitting (as the arrays already
+# allocated) by each language class.
 
 class PrimitiveType(enum.Enum):
     VOID = ""
@@ -23,25 +27,101 @@ class Location(enum.Enum):
     SOLUTION = "solution"
     GRADER = "grader"
 
-class Variable:
+# Each attribute can be assigned only once, in the constructor.
+class Immutable:
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError("The attribute {0} of {1} cannot be changed."
+                                     .format(name, type(self).__name__))
+        object.__setattr__(self, name, value)
+
+# The values allowed by each integer type.
+TYPES_RANGES = {
+    PrimitiveType.INT: (-2**31, 2**31 - 1),
+    PrimitiveType.LONGINT: (-2**63, 2**63 - 1),
+}
+
+# The bytes of a value of each type, in the graders.
+TYPES_SIZES = {
+    PrimitiveType.INT: 4,
+    PrimitiveType.LONGINT: 8,
+    PrimitiveType.CHAR: 1,
+    PrimitiveType.REAL: 8,
+}
+
+# The bounds [min..max] of the values of a variable (or of the elements of an
+# array) given in task.spec, None if they are not given.
+def parse_bounds(match_tree, type, name):
+    if "min" not in match_tree:
+        return None
+    if type not in TYPES_RANGES:
+        raise ValueError("Only the values of int and longint variables can be "
+                         "bounded, {0} is not.".format(name))
+    bounds = (int(match_tree["min"].replace(" ", "")), int(match_tree["max"].replace(" ", "")))
+    if bounds[0] > bounds[1]:
+        raise ValueError("The lower bound of {0} is greater than the upper one."
+                             .format(name))
+    if bounds[0] < TYPES_RANGES[type][0] or bounds[1] > TYPES_RANGES[type][1]:
+        raise ValueError("The bounds of {0} exceed the range of {1}."
+                             .format(name, type.value))
+    return bounds
+
+# The bounds of a variable (or of the elements of an array) that have to be
+# checked, as a pair (min, max). A bound equal to the limit of the type always
+# holds, so it is None (and so are both if the variable is not bounded).
+def checked_bounds(var):
+    if var.bounds is None:
+        return None, None
+    type_min, type_max = TYPES_RANGES[var.type]
+    return (var.bounds[0] if var.bounds[0] != type_min else None,
+            var.bounds[1] if var.bounds[1] != type_max else None)
+
+class Variable(Immutable):
+    __slots__ = ("name", "type", "bounds")
+
     def __init__(self, match_tree):
         self.name = match_tree["name"]
         self.type = PrimitiveType(match_tree["type"])
-        self.known = False # This is not used in any single language class, but only in the main parser.
+        self.bounds = parse_bounds(match_tree, self.type, self.name)
+
+class Array(Immutable):
+    __slots__ = ("name", "type", "dim", "sizes", "bounds")
 
-class Array:
     def __init__(self, match_tree, data_manager):
         self.name = match_tree["name"]
         self.type = PrimitiveType(match_tree["type"])
         self.dim = len(match_tree["sizes"])
-        self.sizes = [Expression(size, data_manager) for size in match_tree["sizes"]]
-        self.allocated = False # Handled only by single language classes. It is used to know when to allocate an array.
-        self.known = False # This is not used in any single language class, but only in the main parser.
+        self.sizes = tuple(Expression(size, data_manager) for size in match_tree["sizes"])
+        # The bounds of the elements
+        self.bounds = parse_bounds(match_tree, self.type, self.name)
     
-    def is_allocable(self):
-        return all(size.is_known() for size in self.sizes)
+    def is_allocable(self, data_manager):
+        return all(size.is_known(data_manager) for size in self.sizes)
+
+    # The maximum sizes allowed by the bounds of the variables, None if one
+    # of them is not bounded.
+    def maximum_sizes(self):
+        sizes = tuple(size.maximum() for size in self.sizes)
+        return None if None in sizes else sizes
+
+    # The maximum memory taken by the values and by the pointers to the rows
+    # (8 bytes each, at every level but the last), None if it is not bounded.
+    def maximum_bytes(self):
+        sizes = self.maximum_sizes()
+        if sizes is None:
+            return None
+        res = 0
+        count = 1
+        for size in sizes[:-1]:
+            count *= max(size, 0)
+            res += 8 * count
+        return res + TYPES_SIZES[self.type] * count * max(sizes[-1], 0)
         
-class Parameter:
+class Parameter(Immutable):
+    __slots__ = ("name", "type", "dim", "by_ref")
+
     def __init__(self, match_tree):
         self.name = match_tree["name"]
         self.type = PrimitiveType(match_tree["type"])
@@ -51,11 +131,13 @@ class Parameter:
         # match_tree["by_ref"] can be ' ', ' &', '& '.
         self.by_ref = "&" in match_tree["by_ref"]
         
-class Prototype:
+class Prototype(Immutable):
+    __slots__ = ("name", "type", "parameters", "location")
+
     def __init__(self, match_tree, using_include_grader):
         self.name = match_tree["name"]
         self.type = PrimitiveType(match_tree["return_type"]) # One of the primitive types (array not supported)
-        self.parameters = [Parameter(param) for param in match_tree["params"]]
+        self.parameters = tuple(Parameter(param) for param in match_tree["params"])
         # Where this prototype should be defined. 
         # Can be SOLUTION, if this prototype has to be defined by the contestant
         # in his solution, or GRADER if this prototype should be defined in
@@ -67,15 +149,70 @@ class Prototype:
             raise ValueError("The location of a prototype cannot be 'grader' if"
                              "you are not providing the include_grader file.")
 
-class Call:
+# The index of the k-th loop (counting from the outermost one) of a repeated
+# call, named ik.
+class LoopIndex(Immutable):
+    __slots__ = ("name", "type", "depth")
+
+    def __init__(self, depth):
+        self.name = "i" + str(depth)
+        self.type = PrimitiveType.INT
+        self.depth = depth
+
+# An element (or a row, if not all the indexes are given) of an array,
+# indexed by the indexes of the loops of a repeated call.
+class ArrayElement(Immutable):
+    __slots__ = ("name", "type", "dim", "array", "indexes")
+
+    def __init__(self, array, indexes, loops):
+        if len(indexes) > array.dim:
+            raise ValueError("The array {0} has only {1} dimensions."
+                                 .format(array.name, array.dim))
+        for size, index in zip(array.sizes, indexes):
+            if loops[index.depth] != size:
+                raise ValueError("The index {0} of the array {1} has to go "
+                                 "from 0 to {2}-1, as its size."
+                                     .format(index.name, array.name, size.to_string()))
+        self.name = array.name + "".join("[" + index.name + "]" for index in indexes)
+        self.type = array.type
+        self.dim = array.dim - len(indexes)
+        self.array = array
+        self.indexes = tuple(indexes)
+
+# Number of dimensions of a parameter of a call, 0 if it is a single value.
+def dimension(var):
+    return var.dim if type(var) in [Array, ArrayElement] else 0
+
+# The variable or array a parameter of a call belongs to.
+def base_variable(var):
+    return var.array if type(var) == ArrayElement else var
+
+class Call(Immutable):
+    __slots__ = ("name", "loops", "return_var", "prototype", "parameters")
+
     def __init__(self, match_tree, data_manager):
         self.name = match_tree["name"]
-        self.return_var = data_manager.get_variable(match_tree["return_var"]) if "return_var" in match_tree else None
         
-        # Cannot be an Array, must be a simple Variable.
-        if self.return_var is not None and type(self.return_var) == Array:
+        # The number of iterations of each loop around the call, starting
+        # from the outermost one (the call is repeated only if there are).
+        self.loops = tuple(Expression(size, data_manager) for size in match_tree.get("loops", []))
+        if not all(size.is_known(data_manager) for size in self.loops):
+            raise ValueError("The number of repetitions of a call must be known.")
+        for depth in range(len(self.loops)):
+            if "i" + str(depth) in data_manager.variables:
+                raise NameError("The variable i{0} cannot be used in a call "
+                                "repeated {1} times, as it is the name of the "
+                                "index of a loop.".format(depth, len(self.loops)))
+        
+        self.return_var = self.get_parameter(match_tree["return_var"], data_manager) if "return_var" in match_tree else None
+        
+        # Cannot be an Array, must be a simple Variable (or an element).
+        if self.return_var is not None and dimension(self.return_var) != 0:
             raise ValueError("The variable assigned to the return value of a "
                              "call cannot be an array.")
+        if type(self.return_var) == LoopIndex:
+            raise ValueError("The return value of a call cannot be assigned "
+                             "to the index of a loop.")
         
         # Finding the prototype with the same name as this call.
         self.prototype = data_manager.get_prototype(self.name)
@@ -87,11 +224,11 @@ class Call:
             if self.prototype.type != self.return_var.type:
                 self.prototype_not_matched()
         elif self.return_var is not None:
-            return False
+            self.prototype_not_matched()
         
-        # List of pairs (Variable/Array, by_ref). 
+        # List of pairs (Variable/Array/ArrayElement/LoopIndex, by_ref). 
         # by_ref is not parsed but deduced from the matched prototype.
-        self.parameters = []
+        parameters = []
         
         # Checking the matching of all parameters.
         # If everything matched the parameters are inserted in self.parameters.
@@ -100,45 +237,69 @@ class Call:
         
         for i in range(len(match_tree["params"])):
             proto_param = self.prototype.parameters[i]
-            call_param = data_manager.get_variable(match_tree["params"][i])
+            call_param = self.get_parameter(match_tree["params"][i], data_manager)
             
             if call_param.type != proto_param.type:
                 self.prototype_not_matched()
                 
-            if type(call_param) == Array:
-                if proto_param.dim != call_param.dim:
-                    self.prototype_not_matched()
-            elif proto_param.dim != 0:
+            if proto_param.dim != dimension(call_param):
                 self.prototype_not_matched()
             
-            if type(call_param) == Array and not call_param.is_allocable():
+            if type(call_param) in [Array, ArrayElement] and \
+                    not base_variable(call_param).is_allocable(data_manager):
                 raise ValueError("The sizes of the array passed by parameter "
                                  "must be known.")
-            if not proto_param.by_ref and not call_param.known:
+            if proto_param.by_ref and type(call_param) == LoopIndex:
+                raise ValueError("The index of a loop cannot be passed by "
+                                 "reference.")
+            if not proto_param.by_ref and not data_manager.is_known(call_param):
                 raise ValueError("The parameters not passed by reference must "
                                  "be known.")
                 
-            self.parameters.append((call_param, proto_param.by_ref))
+            parameters.append((call_param, proto_param.by_ref))
+        self.parameters = tuple(parameters)
+    
+    # A parameter is either a name or, in a repeated call, a dictionary with
+    # the name of an array and the names of its indexes.
+    def get_parameter(self, match_tree, data_manager):
+        loop_indexes = {"i" + str(depth): LoopIndex(depth) for depth in range(len(self.loops))}
+        if type(match_tree) == str:
+            if match_tree in loop_indexes:
+                return loop_indexes[match_tree]
+            return data_manager.get_variable(match_tree)
+
+        array = data_manager.get_variable(match_tree["name"])
+        if type(array) != Array:
+            raise ValueError("Only arrays can be indexed.")
+        for index in match_tree["indexes"]:
+            if index not in loop_indexes:
+                raise NameError("Arrays can be indexed only by the indexes of "
+                                "the loops ({0}).".format(", ".join(sorted(loop_indexes)) or "none"))
+        return ArrayElement(array, [loop_indexes[index] for index in match_tree["indexes"]], self.loops)
         
-    def prototype_not_matched():
+    def prototype_not_matched(self):
         raise NameError("One of the calls does not match any prototype.")
 
-class IOVariables:
+class IOVariables(Immutable):
+    __slots__ = ("variables",)
+
     def __init__(self, match_tree, data_manager, is_input_or_output):
-        self.variables = [data_manager.get_variable(var) for var in match_tree['variables']]
+        self.variables = tuple(data_manager.get_variable(var) for var in match_tree['variables'])
         if not all(type(var) == Variable for var in self.variables):
             raise SyntaxError("It is not possible to have both arrays and "
                               "variables on the same IO line. Furthermore, "
                               "arrays have to be denoted using the square "
                               "bracket notation.")
         
-        if is_input_or_output == "output" and not all(var.known for var in self.variables):
+        if is_input_or_output == "output" and not all(data_manager.is_known(var) for var in self.variables):
             raise ValueError("Before writing a variable to output it must "
                              "have been assigned a value.")
 
-class IOArrays:
+class IOArrays(Immutable):
+    __slots__ = ("arrays", "sizes", "as_string")
+
     def __init__(self, match_tree, data_manager, is_input_or_output):
-        self.arrays = [data_manager.get_variable(arr["name"]) for arr in match_tree['arrays']]
+        self.arrays = tuple(data_manager.get_variable(arr["name"]) for arr in match_tree['arrays'])
         if not all(type(arr) == Array for arr in self.arrays):
             raise SyntaxError("It is not possible to have both arrays and "
                               "variables on the same IO line. Furthermore, "
@@ -151,17 +312,31 @@ class IOArrays:
             raise ValueError("Arrays read on the same line must have the same "
                              "type.")
             
-        if not all(expr.is_known() for expr in self.sizes):
+        if not all(expr.is_known(data_manager) for expr in self.sizes):
             raise ValueError("Before reading/writing an arrays, theirs sizes "
                              "must be known.")
             
-        if is_input_or_output == "output" and not all(arr.known for arr in self.arrays):
+        if is_input_or_output == "output" and not all(data_manager.is_known(arr) for arr in self.arrays):
             raise ValueError("Before writing an array to output it must have "
                              "been filled with values.")
 
+        # A single char array can be read (and written) a whole row at a time,
+        # each row being a string without whitespaces. In the output a single
+        # char array is always written this way.
+        self.as_string = "format" in match_tree or (is_input_or_output == "output" and is_single_char(self))
+        if self.as_string and not is_single_char(self):
+            raise ValueError("Only a single char array on its own line can be "
+                             "read/written as strings.")
+
+# Whether a line of arrays contains a single char array, whose rows are
+# strings.
+def is_single_char(io_arrays):
+    return len(io_arrays.arrays) == 1 and io_arrays.arrays[0].type == PrimitiveType.CHAR
 
 # coef * var + const
-class Expression:
+class Expression(Immutable):
+    __slots__ = ("coef", "var", "const")
+
     def __init__(self, match_tree, data_manager):
         if "const1" in match_tree: # Constant expression, just a number
             self.coef = 0
@@ -195,8 +370,18 @@ class Expression:
                 res+=str(self.const)
         return res
     
-    def is_known(self):
-        return self.var is None or self.var.known
+    def is_known(self, data_manager):
+        return self.var is None or data_manager.is_known(self.var)
+
+    # The maximum value allowed by the bounds of the variable, None if it is
+    # not bounded.
+    def maximum(self):
+        if self.var is None:
+            return self.const
+        bounds = getattr(self.var, "bounds", None)
+        if bounds is None:
+            return None
+        return max(self.coef * bounds[0], self.coef * bounds[1]) + self.const
     
     def __eq__(self, expr2):
         return (self.coef == expr2.coef and self.const == expr2.const and self.var == expr2.var)
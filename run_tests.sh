@@ -18,8 +18,8 @@ NC="\033[0m" # No Color
 OK="$GREEN✓\033[0m"
 NOTOK="$RED✗\033[0m"
 
-LANGUAGES=(C fast_C CPP fast_CPP pascal fast_pascal)
-FILES=(c fast_c cpp fast_cpp pascal fast_pascal)
+LANGUAGES=(C fast_C CPP fast_CPP pascal fast_pascal python fast_python java fast_java)
+FILES=(c fast_c cpp fast_cpp pascal fast_pascal python fast_python java fast_java)
 
 CHECK() {
     (chronic "$@" && echo -e $OK) || (echo -e $NOTOK && exit 1)
@@ -87,8 +87,49 @@ compile_stuff() {
         chronic fpc -dEVAL fast_grader.pas -otemplate_fast_pascal || touch template_fast_pascal.errors
         rm *.o *.ppu # Otherwise fpc seems to be non-deterministic.
     fi
+    # The python graders import the solution as a module named as the task,
+    # which is kept for running them.
+    if [ -f grader.py ]; then
+        echo -n "Preparing python "
+        CHECK python3 -m py_compile grader.py soluzione.py
+        printf '#!/bin/sh\nexec python3 grader.py\n' > python
+        chmod +x python
+        chronic python3 -m py_compile template_python.py || touch template_python.errors
+    fi
+    if [ -f fast_grader.py ]; then
+        echo -n "Preparing fast_python "
+        CHECK python3 -m py_compile fast_grader.py soluzione.py
+        printf '#!/bin/sh\nexec python3 fast_grader.py\n' > fast_python
+        chmod +x fast_python
+        chronic python3 -m py_compile template_fast_python.py || touch template_fast_python.errors
+    fi
+    if [ -f soluzione.py ]; then
+        cp soluzione.py $taskname.py
+    fi
+    # The class of each java grader is named grader, so each one is compiled
+    # (with the solution) in a folder of its own.
+    if [ -f grader.java ]; then
+        echo -n "Compiling java "
+        cp soluzione.java $taskname.java
+        CHECK javac -d java_classes grader.java $taskname.java
+        printf '#!/bin/sh\nexec java -cp java_classes grader\n' > java
+        chmod +x java
+
+        cp template_java.java $taskname.java
+        chronic javac -d template_java_classes grader.java $taskname.java || touch template_java.errors
+    fi
+    if [ -f fast_grader.java ]; then
+        echo -n "Compiling fast_java "
+        cp soluzione.java $taskname.java
+        CHECK javac -d fast_java_classes fast_grader.java $taskname.java
+        printf '#!/bin/sh\nexec java -cp fast_java_classes grader\n' > fast_java
+        chmod +x fast_java
+
+        cp template_fast_java.java $taskname.java
+        chronic javac -d template_fast_java_classes fast_grader.java $taskname.java || touch template_fast_java.errors
+    fi
     
-    rm -f $taskname.pas
+    rm -f $taskname.pas $taskname.java
 }
 
 run_test() {
@@ -103,7 +144,7 @@ run_test() {
     outfile=$(grep "outfile" task.yaml | cut -d":" -f2)
     outfile=${outfile:1}
 
-    for index in {0..5}
+    for index in ${!LANGUAGES[@]}
     do
         language=${LANGUAGES[$index]}
         name=${FILES[$index]}
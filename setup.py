@@ -1,12 +1,14 @@
 from setuptools import setup, find_packages
 
+from gradergen.languages import RUNTIME_FILES
+
 setup(
     name='gradergen',
     version='0.4',
     description='Grader generator',
     packages=find_packages(exclude=['testing']),
     package_data={
-        'gradergen.languages': ['fast_io.c', 'fast_io.cpp', 'fast_input.pas', 'fast_output.pas'],
+        'gradergen.languages': RUNTIME_FILES,
     },
     entry_points={
         'console_scripts': [
@@ -0,0 +1,2 @@
+class nome_sorgente_contestant {
+}
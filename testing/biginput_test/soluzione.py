@@ -0,0 +1,4 @@
+def cerca(N, mat):
+    for i in range(N):
+        for j in range(N):
+            mat[i][j] = '1' if mat[i][j] == '0' else '0'
@@ -0,0 +1,11 @@
+class nome_sorgente_contestant {
+	static long somma(int N, int M, long[] B, int[][] C, int[] D) {
+		long s = 0;
+		for (int i = 0; i < N; i++) {
+			s += B[i];
+			for (int j = 0; j < M; j++) s += C[i][j];
+		}
+		for (int j = 0; j < M; j++) s += D[j];
+		return s;
+	}
+}
@@ -0,0 +1,29 @@
+unit nome_sorgente_contestant;
+
+interface
+
+type
+	longintmatrix = array of array of longint;
+
+function somma(N, M: longint; B: array of int64; C: longintmatrix; D: array of longint): int64;
+
+implementation
+
+function somma(N, M: longint; B: array of int64; C: longintmatrix; D: array of longint): int64;
+var
+	i, j : longint;
+	s : int64;
+begin
+	s := 0;
+	for i := 0 to N-1 do
+	begin
+		s := s + B[i];
+		for j := 0 to M-1 do
+			s := s + C[i][j];
+	end;
+	for j := 0 to M-1 do
+		s := s + D[j];
+	somma := s;
+end;
+
+end.
@@ -0,0 +1,5 @@
+def somma(N, M, B, C, D):
+	s = 0
+	for i in range(N):
+		s += B[i] + sum(C[i][:M])
+	return s + sum(D[:M])
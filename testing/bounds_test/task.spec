@@ -0,0 +1,29 @@
+# Le righe che iniziano con # sono commenti.
+# La stringa ***sezione*** indica l'inizio di una nuova sezione.
+# Le sezioni devono essere sempre presenti tutte, l'ordine non conta ma è
+# meglio se sono nell'ordine: variables, functions, input, output
+
+# Gli array B e C sono vuoti (N = 0) e i loro limiti escludono lo 0
+
+***variables***
+int N [0..1000]
+int M [1..10]
+longint B[N] [1..5]
+int C[N][M] [-3..-1]
+int D[M] [1..9]
+longint S
+
+***prototypes***
+longint somma(int N, int M, longint B[], int C[][], int D[])
+
+***input***
+N M
+B[]
+C[][]
+D[]
+
+***calls***
+S = somma(N, M, B, C, D)
+
+***output***
+S
@@ -0,0 +1,5 @@
+class nome_sorgente_contestant {
+	static void moltiplica(int N, int[] A, int[] B, int[] C) {
+		for (int i = 0; i < 3*N-5; i++) C[i] = A[i]*B[i];
+	}
+}
@@ -0,0 +1,3 @@
+def moltiplica(N, A, B, C):
+    for i in range(3*N-5):
+        C[i] = A[i]*B[i]
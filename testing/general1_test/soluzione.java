@@ -0,0 +1,14 @@
+class nome_sorgente_contestant {
+	static int contapersone(int M, int[] from, int[] too) {
+		int xxx = from[M-2] + from[M-1] + too[1];
+		if (xxx > 10000) return 10000;
+		return xxx;
+	}
+
+	static void sceglicolori(int res, int[] scelti, double[] colore) {
+		for (int i = 0; i < res; i++) {
+			scelti[i] = i;
+			colore[i] = 23.0;
+		}
+	}
+}
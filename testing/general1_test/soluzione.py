@@ -0,0 +1,11 @@
+def contapersone(M, da, too):
+    xxx = da[M-2] + da[M-1] + too[1]
+    if xxx > 10000:
+        return 10000
+    return xxx
+
+
+def sceglicolori(res, scelti, colore):
+    for i in range(res):
+        scelti[i] = i
+        colore[i] = 23.0
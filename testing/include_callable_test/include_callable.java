@@ -0,0 +1,3 @@
+	static void Abbatti(int indice, int direzione) {
+		fw.print(indice + " " + direzione + "\n");
+	}
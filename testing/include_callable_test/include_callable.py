@@ -0,0 +1,2 @@
+def Abbatti(indice, direzione):
+    fw.write("%d %d\n" % (indice, direzione))
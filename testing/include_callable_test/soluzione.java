@@ -0,0 +1,11 @@
+class nome_sorgente_contestant {
+	static void Pianifica(int N, int[] H) {
+		for (int i = 0; i < N/2; i++) {
+			if (H[i] > 10) {
+				grader.Abbatti(i, 0);
+			} else {
+				grader.Abbatti(N - i, 1);
+			}
+		}
+	}
+}
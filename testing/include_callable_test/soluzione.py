@@ -0,0 +1,6 @@
+def Pianifica(N, H):
+    for i in range(N//2):
+        if H[i] > 10:
+            Abbatti(i, 0)
+        else:
+            Abbatti(N - i, 1)
@@ -0,0 +1,4 @@
+	static void AggiungiTutti(int N, long[] X) {
+		for (int i = 0; i < N; i++)
+			nome_sorgente_contestant.aggiungi(X[i]);
+	}
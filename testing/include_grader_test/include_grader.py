@@ -0,0 +1,3 @@
+def AggiungiTutti(N, X):
+    for i in range(N):
+    	aggiungi(X[i])
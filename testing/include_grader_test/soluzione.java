@@ -0,0 +1,15 @@
+class nome_sorgente_contestant {
+	static long S;
+
+	static void inizializza(long s) {
+		S = s;
+	}
+
+	static void aggiungi(long X) {
+		S += X;
+	}
+
+	static long risultato() {
+		return S;
+	}
+}
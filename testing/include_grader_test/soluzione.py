@@ -0,0 +1,15 @@
+S = 0
+
+
+def inizializza(s):
+    global S
+    S = s
+
+
+def aggiungi(X):
+    global S
+    S += X
+
+
+def risultato():
+    return S
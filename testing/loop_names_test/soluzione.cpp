@@ -0,0 +1,5 @@
+int somma(int N, int* A) {
+	int s = 0;
+	for (int i = 0; i < N; i++) s += A[i];
+	return s;
+}
@@ -0,0 +1,7 @@
+class nome_sorgente_contestant {
+	static int somma(int N, int[] A) {
+		int s = 0;
+		for (int i = 0; i < N; i++) s += A[i];
+		return s;
+	}
+}
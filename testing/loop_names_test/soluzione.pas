@@ -0,0 +1,19 @@
+unit nome_sorgente_contestant;
+
+interface
+
+function somma(N: longint; A: array of longint): longint;
+
+implementation
+
+function somma(N: longint; A: array of longint): longint;
+var
+    i, s : longint;
+begin
+    s := 0;
+    for i := 0 to N-1 do
+        s := s + A[i];
+    somma := s;
+end;
+
+end.
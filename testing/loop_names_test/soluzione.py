@@ -0,0 +1,2 @@
+def somma(N, A):
+	return sum(A[:N])
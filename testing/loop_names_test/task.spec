@@ -0,0 +1,25 @@
+# Le righe che iniziano con # sono commenti.
+# La stringa ***sezione*** indica l'inizio di una nuova sezione.
+# Le sezioni devono essere sempre presenti tutte, l'ordine non conta ma è
+# meglio se sono nell'ordine: variables, functions, input, output
+
+# Una variabile si chiama come gli indici dei cicli del grader
+
+***variables***
+int N
+int i0
+int A[N]
+int S
+
+***prototypes***
+int somma(int N, int A[])
+
+***input***
+N i0
+A[]
+
+***calls***
+S = somma(N, A)
+
+***output***
+S i0
@@ -0,0 +1,15 @@
+class nome_sorgente_contestant {
+	static long S;
+
+	static void inizializza(long s) {
+		S = s;
+	}
+
+	static void aggiungi(int N, long[] X) {
+		for (int i = 0; i < N; i++) S += X[i];
+	}
+
+	static long risultato() {
+		return S;
+	}
+}
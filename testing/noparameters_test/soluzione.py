@@ -0,0 +1,16 @@
+S = 0
+
+
+def inizializza(s):
+    global S
+    S = s
+
+
+def aggiungi(N, X):
+    global S
+    for i in range(N):
+        S += X[i]
+
+
+def risultato():
+    return S
@@ -0,0 +1,30 @@
+from random import randint, uniform, choice, seed
+
+# Numbers in many different formats, together with some values lying exactly
+# halfway between two representable outputs (to check the rounding).
+def run(N):
+    special = ["0", "-0.0", "0.5", "2.5", "0.0000005", "0.0000025", "-1.5e-7",
+               "123456789.123456789", "9007199254740993", "1e22", "1E-5",
+               "4503599627370495.5", "100000000000000000000", "+3.25", "7."]
+    values = []
+    for i in range(N - len(special)):
+        kind = randint(0, 3)
+        if kind == 0:
+            values.append(repr(uniform(-1e6, 1e6)))
+        elif kind == 1:
+            values.append("%.*f" % (randint(0, 9), uniform(-1e4, 1e4)))
+        elif kind == 2:
+            values.append("%.*e" % (randint(0, 17), uniform(-1, 1) * 10 ** randint(-12, 12)))
+        else:
+            values.append(str(randint(-10 ** 15, 10 ** 15)))
+    values += special
+
+    print(N)
+    print(" ".join(values))
+
+if __name__ == "__main__":
+    N, S = 20000, 42
+
+    seed(S)
+
+    run(N)
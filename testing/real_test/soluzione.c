@@ -0,0 +1,8 @@
+double dividi(int N, double* A, double* B) {
+	double S = 0;
+	for (int i = 0; i < N; i++) {
+		B[i] = A[i] / 7;
+		S += B[i];
+	}
+	return S;
+}
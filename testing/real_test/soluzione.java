@@ -0,0 +1,10 @@
+class nome_sorgente_contestant {
+	static double dividi(int N, double[] A, double[] B) {
+		double S = 0;
+		for (int i = 0; i < N; i++) {
+			B[i] = A[i] / 7;
+			S += B[i];
+		}
+		return S;
+	}
+}
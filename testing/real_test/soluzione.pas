@@ -0,0 +1,20 @@
+unit nome_sorgente_contestant;
+
+interface
+function dividi(N: longint; A: array of double; var B: array of double): double;
+
+implementation
+function dividi(N: longint; A: array of double; var B: array of double): double;
+var i : longint;
+    S : double;
+begin
+	S := 0;
+	for i:=0 to N-1 do
+	begin
+		B[i] := A[i] / 7;
+		S := S + B[i];
+	end;
+	dividi := S;
+end;
+
+end.
@@ -0,0 +1,6 @@
+def dividi(N, A, B):
+    S = 0
+    for i in range(N):
+        B[i] = A[i] / 7
+        S += B[i]
+    return S
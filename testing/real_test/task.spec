@@ -0,0 +1,25 @@
+# Le righe che iniziano con # sono commenti.
+# La stringa ***sezione*** indica l'inizio di una nuova sezione.
+# Le sezioni devono essere sempre presenti tutte, l'ordine non conta ma è
+# meglio se sono nell'ordine: variables, functions, input, output
+
+
+***variables***
+int N
+real A[N]
+real B[N]
+real S
+
+***prototypes***
+real dividi(int N, real A[], real &B[])
+
+***input***
+N
+A[]
+
+***calls***
+S = dividi(N, A, B)
+
+***output***
+S
+A[] B[]
@@ -0,0 +1,17 @@
+class nome_sorgente_contestant {
+	static void cerca(int N, char[][] mat, int[] A, int[] B, int[] C) {
+		for (int i = 0; i < N; i++)
+			for (int j = i+1; j < N; j++)
+				for (int k = j+1; k < N; k++) {
+					boolean cor = mat[i][j] == '1' && mat[j][k] == '1' && mat[k][i] == '1';
+					cor |= mat[i][k] == '1' && mat[k][j] == '1' && mat[j][i] == '1';
+					if (cor) {
+						A[0] = i+1;
+						B[0] = j+1;
+						C[0] = k+1;
+						return;
+					}
+				}
+		A[0] = B[0] = C[0] = -1;
+	}
+}
@@ -0,0 +1,13 @@
+def cerca(N, mat, A, B, C):
+    mat = [[int(c) for c in row] for row in mat]
+    for i in range(N):
+        for j in range(i+1, N):
+            for k in range(j+1, N):
+                cor = mat[i][j] and mat[j][k] and mat[k][i]
+                cor |= mat[i][k] and mat[k][j] and mat[j][i]
+                if cor:
+                    A[0] = i+1
+                    B[0] = j+1
+                    C[0] = k+1
+                    return
+    A[0] = B[0] = C[0] = -1
@@ -0,0 +1,9 @@
+long long somma_riga(int M, int* R) {
+	long long somma = 0;
+	for (int i = 0; i < M; i++) somma += R[i];
+	return somma;
+}
+
+void trasforma(int x, int i, int j, int* y) {
+	*y = x*(i+1)+j;
+}
@@ -0,0 +1,11 @@
+class nome_sorgente_contestant {
+	static long somma_riga(int M, int[] R) {
+		long somma = 0;
+		for (int i = 0; i < M; i++) somma += R[i];
+		return somma;
+	}
+
+	static void trasforma(int x, int i, int j, int[] y) {
+		y[0] = x*(i+1)+j;
+	}
+}
@@ -0,0 +1,23 @@
+unit nome_sorgente_contestant;
+
+interface
+
+function somma_riga(M: Longint; R: array of Longint): Int64;
+procedure trasforma(x, i, j: Longint; var y: Longint);
+
+implementation
+function somma_riga(M: Longint; R: array of Longint): Int64;
+var
+    i: Longint;
+begin
+    somma_riga := 0;
+    for i := 0 to M-1 do
+        somma_riga := somma_riga + R[i];
+end;
+
+procedure trasforma(x, i, j: Longint; var y: Longint);
+begin
+    y := x*(i+1)+j;
+end;
+
+end.
@@ -0,0 +1,6 @@
+def somma_riga(M, R):
+    return sum(R[:M])
+
+
+def trasforma(x, i, j, y):
+    y[0] = x*(i+1)+j
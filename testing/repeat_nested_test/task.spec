@@ -0,0 +1,27 @@
+# Chiamate ripetute annidate, con righe di matrici come parametri e elementi
+# di matrici passati per riferimento.
+
+***variables***
+int N
+int M
+int A[N][M]
+longint S[N]
+int T[N][M]
+
+
+***prototypes***
+longint somma_riga(int M, int R[])
+trasforma(int x, int i, int j, int &y)
+
+***input***
+N M
+A[][]
+
+***calls***
+repeat N: S[i0] = somma_riga(M, A[i0])
+repeat N: repeat M: trasforma(A[i0][i1], i0, i1, T[i0][i1])
+
+
+***output***
+S[]
+T[][]
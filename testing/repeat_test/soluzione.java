@@ -0,0 +1,5 @@
+class nome_sorgente_contestant {
+	static int moltiplica(int A, int B) {
+		return A*B;
+	}
+}
@@ -0,0 +1,2 @@
+def moltiplica(A, B):
+    return A*B
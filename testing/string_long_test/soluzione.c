@@ -0,0 +1,15 @@
+int ruota(int N, int M, char** S, char T[]) {
+	int K = 0;
+	for (int i = 0; i < N; i++) {
+		for (int j = 0; j < M - 1 - j; j++) {
+			char c = S[i][j];
+			S[i][j] = S[i][M - 1 - j];
+			S[i][M - 1 - j] = c;
+		}
+		if ('0' <= S[i][0] && S[i][0] <= '9') K++;
+	}
+	char first = T[0];
+	for (int j = 0; j < M - 1; j++) T[j] = T[j + 1];
+	T[M - 1] = first;
+	return K;
+}
@@ -0,0 +1,8 @@
+def ruota(N, M, S, T):
+    K = 0
+    for i in range(N):
+        S[i].reverse()
+        if '0' <= S[i][0] <= '9':
+            K += 1
+    T[:] = T[1:] + T[:1]
+    return K
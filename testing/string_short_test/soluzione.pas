@@ -0,0 +1,38 @@
+unit nome_sorgente_contestant;
+
+interface
+
+type
+    charmatrix = array of array of char;
+
+function ruota(N, M: longint; var S: charmatrix; var T: array of char): longint;
+
+implementation
+
+function ruota(N, M: longint; var S: charmatrix; var T: array of char): longint;
+var
+    i, j, K : longint;
+    c : char;
+begin
+    K := 0;
+    for i := 0 to N-1 do
+    begin
+        j := 0;
+        while j < M - 1 - j do
+        begin
+            c := S[i][j];
+            S[i][j] := S[i][M - 1 - j];
+            S[i][M - 1 - j] := c;
+            inc(j);
+        end;
+        if (S[i][0] >= '0') and (S[i][0] <= '9') then
+            inc(K);
+    end;
+    c := T[0];
+    for j := 0 to M-2 do
+        T[j] := T[j + 1];
+    T[M - 1] := c;
+    ruota := K;
+end;
+
+end.
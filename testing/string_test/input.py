@@ -0,0 +1,16 @@
+from random import choice, seed
+
+# Rows of letters and digits, which the graders read a whole row at a time.
+def run(N, M):
+    chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    print(N, M)
+    for i in range(N):
+        print("".join(choice(chars) for j in range(M)))
+    print("".join(choice(chars) for j in range(M)))
+
+if __name__ == "__main__":
+    N, M, S = 300, 1000, 42
+
+    seed(S)
+
+    run(N, M)
@@ -0,0 +1,27 @@
+# Le righe che iniziano con # sono commenti.
+# Le righe di caratteri annotate con {string} vengono lette e scritte
+# una riga alla volta.
+
+
+***variables***
+int N
+int M
+char S[N][M]
+char T[M]
+int K
+
+***prototypes***
+int ruota(int N, int M, char &S[][], char &T[])
+
+***input***
+N M
+S[][] {string}
+T[] {string}
+
+***calls***
+K = ruota(N, M, S, T)
+
+***output***
+K
+S[][] {string}
+T[] {string}